@@ -0,0 +1,216 @@
+# Name: animation.py
+# Purpose: Data-driven animation clips and the animators that play them; every animator in the game is advanced in
+#   one vectorized step per frame from the game's frame clock
+# Version: 1.0
+# Date: 18 October 2026
+# Dependencies: numpy, atlas modules
+
+
+import numpy as np
+from atlas import atlas, ANIMATIONS
+
+clips = {}  # (name, loop) -> Clip shared by every sprite playing that animation
+
+
+def clip(name, loop=True):
+    """
+    Get the clip of an animation from the atlas, built once per animation and shared
+    :param name: key of atlas.ANIMATIONS
+    :param loop: False for clips that play once and then stay on their last frame
+    :return: Clip
+    """
+    key = (name, loop)
+    result = clips.get(key)
+    if result is None:
+        mirrored = atlas.frames(name, flip=True) if ANIMATIONS[name].get("mirror") else None
+        result = Clip(atlas.frames(name), atlas.delay(name), loop, mirrored)
+        clips[key] = result
+    return result
+
+
+class Clip:
+    def __init__(self, frames, delay, loop=True, mirrored=None):
+        """
+        Frames of an animation and how they are played; only holds data, so one clip is shared by many animators
+        :param frames: list of surfaces
+        :param delay: ms between frames (before Game.animation_scale)
+        :param loop: False to play once and stay on the last frame
+        :param mirrored: frames flipped horizontally; None to use frames when flipped too
+        """
+        self.frames = tuple(frames)
+        self.mirrored = tuple(mirrored) if mirrored else self.frames
+        self.delay = delay
+        self.loop = loop
+
+
+class Animations:
+    def __init__(self, capacity=64):
+        """
+        Frame state of every animator, stored as arrays (one slot per animator) so that advance() steps them all at
+        once instead of each sprite checking the time on its own
+        :param capacity: slots to start with; doubled whenever they run out
+        """
+        self.now = 0  # Time of the current frame in ms (set by advance())
+        self.animators = [None] * capacity
+        self.free = list(range(capacity - 1, -1, -1))
+        self.index = np.zeros(capacity, np.int32)  # Current frame of the clip
+        self.last_update = np.zeros(capacity, np.int64)  # When the current frame was shown
+        self.delay = np.zeros(capacity, np.float64)
+        self.length = np.ones(capacity, np.int32)
+        self.loop = np.zeros(capacity, bool)
+        self.playing = np.zeros(capacity, bool)  # False for free slots and finished clips
+        # Stats
+        self.peak = 0
+        self.advances = 0
+        self.frame_steps = 0
+        self.completed = 0
+
+    def grow(self):
+        """
+        Double the number of slots
+        :return: None
+        """
+        capacity = len(self.animators)
+        self.animators += [None] * capacity
+        self.free = list(range(capacity * 2 - 1, capacity - 1, -1))
+        self.index = np.concatenate((self.index, np.zeros(capacity, np.int32)))
+        self.last_update = np.concatenate((self.last_update, np.zeros(capacity, np.int64)))
+        self.delay = np.concatenate((self.delay, np.zeros(capacity, np.float64)))
+        self.length = np.concatenate((self.length, np.ones(capacity, np.int32)))
+        self.loop = np.concatenate((self.loop, np.zeros(capacity, bool)))
+        self.playing = np.concatenate((self.playing, np.zeros(capacity, bool)))
+
+    def acquire(self, animator):
+        """
+        :param animator: Animator that needs a slot
+        :return: slot index
+        """
+        if not self.free:
+            self.grow()
+        slot = self.free.pop()
+        self.animators[slot] = animator
+        self.peak = max(self.peak, len(self.animators) - len(self.free))
+        return slot
+
+    def release(self, slot):
+        """
+        Free a slot so that a new animator can take it
+        :param slot: slot index
+        :return: None
+        """
+        self.animators[slot] = None
+        self.playing[slot] = False
+        self.free.append(slot)
+
+    def start(self, slot, clip):
+        """
+        Start playing a clip from its first frame at the current frame time
+        :param slot: slot index
+        :param clip: Clip
+        :return: None
+        """
+        self.index[slot] = 0
+        self.last_update[slot] = self.now
+        self.delay[slot] = clip.delay
+        self.length[slot] = len(clip.frames)
+        self.loop[slot] = clip.loop
+        self.playing[slot] = True
+
+    def advance(self, now, scale=1):
+        """
+        Move every playing animator whose frame has been shown long enough to its next frame, then call the
+        on_complete callbacks of clips that finished
+        :param now: time of this frame in ms (every animation uses this same value for the whole frame)
+        :param scale: multiplies the delay between frames (Game.animation_scale)
+        :return: None
+        """
+        self.now = now
+        self.advances += 1
+        due = self.playing & (now - self.last_update > self.delay * scale)
+        if not due.any():
+            return
+        self.last_update[due] = now
+        self.index[due] += 1
+        ended = due & (self.index >= self.length)
+        self.index[ended & self.loop] = 0
+        finished = ended & ~self.loop
+        self.index[finished] -= 1  # Clips played once stay on their last frame
+        self.playing[finished] = False
+        self.frame_steps += int(np.count_nonzero(due))
+        # Callbacks can kill sprites and start other clips, so collect the finished animators first
+        for animator in [self.animators[slot] for slot in np.flatnonzero(finished)]:
+            self.completed += 1
+            if animator.on_complete:
+                animator.on_complete()
+
+    def report(self):
+        """
+        :return: string with animation stats
+        """
+        return "Animations: {} animators playing, {} at most, {} frame steps and {} clips completed over {} frames"\
+            .format(int(np.count_nonzero(self.playing)), self.peak, self.frame_steps, self.completed, self.advances)
+
+
+class Animator:
+    def __init__(self, animations, clip=None, on_complete=None):
+        """
+        Plays clips for one sprite; its frame state is kept in the game's Animations arrays
+        :param animations: Game.animations
+        :param clip: Clip to start playing; None to start with play()
+        :param on_complete: called when a clip played once finishes
+        """
+        self.animations = animations
+        self.slot = None
+        self.clip = None
+        self.on_complete = None
+        self.flip = False  # True to show the mirrored frames of the clip
+        if clip:
+            self.play(clip, on_complete)
+
+    @property
+    def frame(self):
+        """
+        :return: index of the current frame of the clip
+        """
+        return 0 if self.slot is None else int(self.animations.index[self.slot])
+
+    @property
+    def image(self):
+        """
+        :return: surface of the current frame
+        """
+        frames = self.clip.mirrored if self.flip else self.clip.frames
+        return frames[self.frame]
+
+    @property
+    def is_playing(self):
+        """
+        :return: False once a clip played once has finished
+        """
+        return self.slot is not None and bool(self.animations.playing[self.slot])
+
+    def play(self, clip, on_complete=None, restart=False):
+        """
+        Switch to a clip; playing the clip that is already playing keeps it going, so this can be called every frame
+        :param clip: Clip
+        :param on_complete: called when the clip finishes (only for clips played once)
+        :param restart: True to start over even if the clip is already playing
+        :return: None
+        """
+        if self.slot is None:
+            self.slot = self.animations.acquire(self)
+        elif clip is self.clip and self.is_playing and not restart:
+            return
+        self.clip = clip
+        self.on_complete = on_complete
+        self.animations.start(self.slot, clip)
+
+    def release(self):
+        """
+        Stop playing and give the slot back; call this when the sprite is killed (play() takes a new slot)
+        :return: None
+        """
+        if self.slot is not None:
+            self.animations.release(self.slot)
+            self.slot = None
+        self.on_complete = None
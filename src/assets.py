@@ -0,0 +1,350 @@
+# Name: assets.py
+# Purpose: Process-wide cache of loaded and transformed images so that sprites share their frames instead of
+#   decoding and transforming image files every time one is created
+# Version: 1.0
+# Date: 18 October 2026
+# Dependencies: pygame, hashlib, mmap, os, struct, threading, time, paths, and settings modules
+
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+import pygame as pg
+from paths import asset_cache_dir
+from settings import ASSET_DISK_CACHE, BLIT_COST_REPEAT
+
+# Alpha modes used when loading an image
+ALPHA = "alpha"        # Per-pixel alpha (convert_alpha)
+OPAQUE = "opaque"      # No alpha at all (convert)
+COLORKEY = "colorkey"  # Copied onto an opaque surface with a black colorkey (same as SpriteSheet.get_sprite)
+AUTO = "auto"          # Fastest of the above that looks the same as per-pixel alpha (see optimize())
+
+# Colorkeys tried (in order) when turning an image with only fully opaque/transparent pixels into a colorkey image
+KEY_COLORS = ((255, 0, 255), (0, 255, 0), (0, 0, 0))
+
+
+def optimize(surface):
+    """
+    Pick the fastest format that draws a per-pixel alpha image exactly the same: opaque if every pixel is opaque,
+    colorkey with RLE acceleration if every pixel is either fully opaque or fully transparent (most pixel art),
+    else keep per-pixel alpha
+    :param surface: per-pixel alpha surface that owns its pixels (not a subsurface or a surface with subsurfaces)
+    :return: (surface in chosen format, OPAQUE/COLORKEY/ALPHA)
+    """
+    if not surface.get_flags() & pg.SRCALPHA:
+        return surface, COLORKEY if surface.get_colorkey() else OPAQUE
+    if surface.get_colorkey():
+        return surface, ALPHA  # Colorkey and per-pixel alpha together (ex: icons with a white background)
+    w, h = surface.get_size()
+    visible = pg.mask.from_surface(surface, 0).count()  # Alpha > 0
+    solid = pg.mask.from_surface(surface, 254).count()  # Alpha = 255
+    if solid == w * h:
+        return surface.convert(), OPAQUE
+    if visible == solid:
+        for key in KEY_COLORS:
+            image = pg.Surface((w, h))
+            image.fill(key)
+            image.blit(surface, (0, 0))
+            # Only usable if no visible pixel has the colorkey's color
+            if pg.mask.from_threshold(image, key, (1, 1, 1, 255)).count() == w * h - visible:
+                image.set_colorkey(key, pg.RLEACCEL)
+                return image, COLORKEY
+    return surface, ALPHA
+
+
+def blit_cost(surface):
+    """
+    Measure how long blitting a surface onto a display format surface takes
+    NOTE: Never measure a surface whose subsurfaces get blitted; if it is RLE accelerated this encodes it and every
+    blit of a subsurface then has to decode and encode the whole surface again
+    :param surface: pygame Surface (not a subsurface)
+    :return: microseconds per blit
+    """
+    target = pg.Surface(surface.get_size())
+    target.blit(surface, (0, 0))  # First blit of an RLE surface encodes it
+    start = time.perf_counter()
+    for _ in range(BLIT_COST_REPEAT):
+        target.blit(surface, (0, 0))
+    return (time.perf_counter() - start) / BLIT_COST_REPEAT * 1000000
+
+
+class DiskCache:
+    # magic, version, flags, width, height, pitch, RGBA masks, colorkey RGB, mode, sha1 of source file
+    HEADER = struct.Struct("<4sHHIII4I4B20s4x")
+    MAGIC = b"RRAC"
+    VERSION = 2
+    HAS_ALPHA = 1
+    HAS_COLORKEY = 2
+    MODES = (None, OPAQUE, COLORKEY, ALPHA)  # Format optimize() chose for an AUTO image, stored as its index
+    # Byte order BGRA is the only 32-bit layout that pygame.image.frombuffer can wrap in display order
+    MASKS = (0xff0000, 0xff00, 0xff)
+
+    def __init__(self, directory):
+        """
+        Cache of final pixel buffers on disk so that images don't have to be decoded and transformed every launch;
+        files are memory-mapped and wrapped as surfaces without copying (opaque ones are converted once)
+        :param directory: folder to keep cache files in
+        """
+        self.directory = directory
+        self.mapped = []        # Mapped files have to stay open while surfaces use them
+        self.source_hashes = {}  # path -> sha1 of file, hashed once per launch
+        self.display_masks = None
+
+    def filename(self, key):
+        """
+        :param key: asset cache key
+        :return: path of cache file
+        """
+        return os.path.join(self.directory, hashlib.sha1(repr(key).encode()).hexdigest() + ".raw")
+
+    def source_hash(self, path):
+        """
+        Hashing the source file is much cheaper than decoding it and tells us when a cache file is stale
+        :param path: source image path
+        :return: sha1 digest
+        """
+        digest = self.source_hashes.get(path)
+        if digest is None:
+            with open(path, "rb") as file:
+                digest = hashlib.sha1(file.read()).digest()
+            self.source_hashes[path] = digest
+        return digest
+
+    def is_usable(self):
+        """
+        :return: True if the display's alpha format is one that can be wrapped straight from a buffer
+        """
+        if self.display_masks is None:
+            self.display_masks = pg.Surface((1, 1), pg.SRCALPHA).convert_alpha().get_masks()
+        return self.display_masks[:3] == self.MASKS
+
+    def load(self, key, path):
+        """
+        Map a cache file and wrap it as a surface
+        :param key: asset cache key
+        :param path: source image path
+        :return: (pygame Surface, format chosen by optimize() or None); None if there is no cache file or it is stale
+            or damaged
+        """
+        filename = self.filename(key)
+        if not os.path.exists(filename) or not self.is_usable():
+            return None
+        with open(filename, "rb") as file:
+            try:
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # Empty file
+                return None
+        try:
+            magic, version, flags, w, h, pitch, r, g, b, a, ck_r, ck_g, ck_b, mode, digest = \
+                self.HEADER.unpack_from(mapped)
+        except struct.error:  # Shorter than the header (ex: the game crashed while writing it)
+            mapped.close()
+            return None
+        # A file whose pixels are cut short is stale too; the caller rebuilds the image and overwrites it
+        if magic != self.MAGIC or version != self.VERSION or (r, g, b) != self.MASKS or pitch != w * 4 \
+                or len(mapped) != self.HEADER.size + pitch * h or mode >= len(self.MODES) \
+                or digest != self.source_hash(path):
+            mapped.close()
+            return None
+        surface = pg.image.frombuffer(memoryview(mapped)[self.HEADER.size:], (w, h), "BGRA")
+        if flags & self.HAS_ALPHA:
+            self.mapped.append(mapped)
+        else:
+            surface = surface.convert()  # Drop the alpha byte; makes a copy so the file can be closed
+            mapped.close()
+        if flags & self.HAS_COLORKEY:
+            surface.set_colorkey((ck_r, ck_g, ck_b), pg.RLEACCEL)
+        return surface, self.MODES[mode]
+
+    def store(self, key, path, surface, mode=None):
+        """
+        Write the pixels of a surface to its cache file
+        :param key: asset cache key
+        :param path: source image path
+        :param surface: final surface
+        :param mode: format optimize() chose for an AUTO image (kept so that it doesn't run again); None for others
+        :return: None
+        """
+        masks = surface.get_masks()
+        if surface.get_bitsize() != 32 or masks[:3] != self.MASKS or not self.is_usable():
+            return
+        w, h = surface.get_size()
+        pixels = surface.get_view("2").raw if surface.get_pitch() == w * 4 else pg.image.tobytes(surface, "BGRA")
+        flags = self.HAS_ALPHA if surface.get_flags() & pg.SRCALPHA else 0
+        colorkey = surface.get_colorkey()
+        if colorkey:
+            flags |= self.HAS_COLORKEY
+        header = self.HEADER.pack(self.MAGIC, self.VERSION, flags, w, h, w * 4, *masks,
+                                  *(colorkey[:3] if colorkey else (0, 0, 0)), self.MODES.index(mode),
+                                  self.source_hash(path))
+        os.makedirs(self.directory, exist_ok=True)
+        filename = self.filename(key)
+        temp_filename = "{}.{}.tmp".format(filename, threading.get_ident())
+        with open(temp_filename, "wb") as file:
+            file.write(header)
+            file.write(pixels)
+        os.replace(temp_filename, filename)  # Never leave a half written cache file behind
+
+
+class AssetCache:
+    def __init__(self, disk_cache=None):
+        """
+        Cache of final (already cut out, scaled, flipped and rotated) surfaces; safe to use from loader threads
+        NOTE: Surfaces are shared between every sprite that asks for them, so never draw onto them
+        :param disk_cache: DiskCache to look in before decoding images; None to always decode
+        """
+        self.surfaces = {}
+        self.disk_cache = disk_cache
+        self.lock = threading.Lock()
+        self.pending = {}  # key -> threading.Event for images that another thread is loading right now
+        self.formats = {}  # key -> (format chosen by optimize(), us per blit with per-pixel alpha, us per blit)
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+    def load(self, path, area=None, size=None, scale2x=False, flip=(False, False), rotation=0, alpha=ALPHA,
+             colorkey=None):
+        """
+        Get an image from the cache or load and transform it if it is not in the cache yet
+        Transforms are applied in this order: cut out area, scale2x, scale to size, flip, rotate
+        :param path: file path of image or sprite sheet
+        :param area: (x, y, w, h) of the part of the image to use; None for the whole image
+        :param size: (w, h) to scale the image to; None to keep the size
+        :param scale2x: True to use pg.transform.scale2x before scaling to size
+        :param flip: (flip x, flip y)
+        :param rotation: degrees to rotate (counterclockwise)
+        :param alpha: ALPHA, OPAQUE, COLORKEY or AUTO
+        :param colorkey: extra colorkey to set on final image (ex: white background of icons)
+        :return: shared pygame Surface
+        """
+        key = (path, tuple(area) if area else None, tuple(size) if size else None, scale2x,
+               tuple(flip), rotation, alpha, colorkey)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            with self.lock:  # Counters are shared with loader threads too
+                self.hits += 1
+            return surface
+        with self.lock:
+            surface = self.surfaces.get(key)
+            loading = self.pending.get(key)
+            if surface is not None:
+                self.hits += 1
+            elif loading is None:
+                self.pending[key] = threading.Event()
+                self.misses += 1
+        if surface is not None:
+            return surface
+        if loading is not None:
+            # Another thread is loading this image; wait for it instead of decoding it twice
+            loading.wait()
+            return self.load(path, area, size, scale2x, flip, rotation, alpha, colorkey)
+
+        try:
+            cached = self.disk_cache.load(key, path) if self.disk_cache else None
+            if cached is not None:
+                surface, mode = cached
+                with self.lock:
+                    self.disk_hits += 1
+                if alpha == AUTO:
+                    self.formats[key] = (mode, None, None)
+            else:
+                surface = self.build(path, area, size, scale2x, flip, rotation, alpha, colorkey)
+                mode = None
+                if alpha == AUTO:
+                    # Disk cache stores the optimized image and its format, so this only runs the first time
+                    optimized, mode = optimize(surface)
+                    self.formats[key] = (mode, blit_cost(surface), blit_cost(optimized))
+                    surface = optimized
+                if self.disk_cache:
+                    self.disk_cache.store(key, path, surface, mode)
+            self.surfaces[key] = surface
+        finally:
+            with self.lock:
+                self.pending.pop(key).set()
+        return surface
+
+    def build(self, path, area, size, scale2x, flip, rotation, alpha, colorkey):
+        """
+        Create the surface for a cache miss; source images are decoded once through load() as well
+        :return: new pygame Surface
+        """
+        if not area and not size and not scale2x and not any(flip) and not rotation \
+                and alpha != COLORKEY and colorkey is None:
+            # Plain decoded image
+            image = pg.image.load(path)
+            return image.convert() if alpha == OPAQUE else image.convert_alpha()
+
+        image = self.load(path, alpha=OPAQUE if alpha == OPAQUE else ALPHA)
+        if alpha == COLORKEY:
+            # Grab the sprite onto an opaque surface; transparent pixels turn black and become the colorkey
+            rect = pg.Rect(area) if area else image.get_rect()
+            sprite = pg.Surface(rect.size)
+            sprite.blit(image, (0, 0), rect)
+            image = sprite
+        elif area:
+            # Copied so that the image owns its pixels; optimize() may give it an RLE colorkey and blitting a
+            # subsurface of an RLE surface re-encodes the whole parent every time
+            image = image.subsurface(area).copy()
+        if scale2x:
+            image = pg.transform.scale2x(image)
+        if size:
+            image = pg.transform.scale(image, size)
+        if any(flip):
+            image = pg.transform.flip(image, flip[0], flip[1])
+        if rotation:
+            image = pg.transform.rotate(image, rotation)
+        # Colorkey is set once on the final image; RLE makes blitting mostly transparent sprites much faster
+        if alpha == COLORKEY:
+            image.set_colorkey((0, 0, 0), pg.RLEACCEL)
+        if colorkey is not None:
+            image.set_colorkey(colorkey, pg.RLEACCEL)
+        return image
+
+    def load_frames(self, paths, **kwargs):
+        """
+        Load one frame per file path (used by animations that are stored as separate files)
+        :param paths: iterable of file paths
+        :param kwargs: same keyword arguments as load()
+        :return: list of shared surfaces
+        """
+        return [self.load(path, **kwargs) for path in paths]
+
+    def clear(self):
+        """
+        Empty the cache (ex: when display format changes); counters are kept
+        :return: None
+        """
+        self.surfaces.clear()
+
+    def report(self):
+        """
+        :return: string with size of cache and hit/miss counters
+        """
+        total = self.hits + self.misses
+        rate = self.hits / total * 100 if total else 0
+        return "AssetCache: {} surfaces, {} hits, {} misses ({:.1f}% hit rate), {} misses read from disk".format(
+            len(self.surfaces), self.hits, self.misses, rate, self.disk_hits)
+
+    def format_report(self):
+        """
+        :return: string with the format optimize() chose for each AUTO image and the blit costs it measured
+            (images read from the disk cache were measured on an earlier launch)
+        """
+        lines = ["AssetCache formats: {} images".format(len(self.formats))]
+        for key, (mode, alpha_cost, cost) in sorted(self.formats.items(), key=lambda item: repr(item[0])):
+            path, area, size, _, flip = key[:5]
+            name = os.path.basename(path) + (" {}".format(area) if area else "") + (" {}".format(size) if size else "")
+            if any(flip):
+                name += " flipped"
+            if cost is None:
+                lines.append("  {}: {} (from disk cache)".format(name, mode))
+            else:
+                lines.append("  {}: {}, {:.1f} us per blit ({:.1f} us with per-pixel alpha)".format(
+                    name, mode, cost, alpha_cost))
+        return "\n".join(lines)
+
+
+# Shared by the whole game
+asset_cache = AssetCache(DiskCache(asset_cache_dir) if ASSET_DISK_CACHE else None)
@@ -0,0 +1,302 @@
+# Name: atlas.py
+# Purpose: Describes every animation in the game (frame slicing, delay, pivot) and packs all of their frames into a
+#   few texture atlas sheets with a manifest; at runtime sprites get their frames copied out of those sheets
+# Version: 1.0
+# Date: 18 October 2026
+# Dependencies: pygame, json, os, sys, tempfile, threading, time, paths, utils, and assets modules
+
+
+""" RUN THIS MODULE TO REBUILD THE ATLAS: python atlas.py (add --check to also time frame blits) """
+# The game still runs without a built atlas (or with a stale one); frames are then loaded from the source files
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import pygame as pg
+from paths import *
+from utils import get_sheet
+from assets import *
+
+# Every animation used by sprites
+# Sprite sheets: "sheet" path, "frame" (w, h) on the sheet, "count" frames starting at frame "start"
+#   (frames get scale2x'd with a black colorkey by SpriteSheet.get_strip)
+# Separate files: "files" tuple of paths
+# Optional: "size", "flip", "rotation", "scale2x", "alpha" (same as AssetCache.load), "delay" in ms,
+#   "pivot" (point of frame rect the sprite is positioned by), "mirror" (also pack frames flipped horizontally)
+ANIMATIONS = {
+    # Player
+    "player_idle": dict(sheet=player_idle_path, frame=(32, 28), count=8, pivot="midbottom", mirror=True),
+    "player_walk": dict(sheet=player_walk_path, frame=(32, 32), count=8, pivot="midbottom", mirror=True),
+    "player_jump": dict(sheet=player_jump_path, frame=(28, 28), count=6, pivot="midbottom", mirror=True),
+    "player_fall": dict(sheet=player_fall_path, frame=(32, 28), count=2, pivot="midbottom", mirror=True),
+    "player_land": dict(sheet=player_land_no_dust_path, frame=(44, 32), count=4, pivot="midbottom", mirror=True),
+    "player_hurt": dict(sheet=player_hurt_path, frame=(32, 28), count=9, delay=50, pivot="midbottom", mirror=True),
+    "player_jump_fx": dict(sheet=player_jump_fx_path, frame=(28, 28), count=6, delay=50, pivot="midbottom"),
+    "player_land_fx": dict(sheet=player_land_fx_path, frame=(44, 32), count=4, pivot="midbottom"),
+    # Boss
+    "boss_flight": dict(sheet=flyeye_flight, frame=(150, 150), count=8, mirror=True),
+    "boss_attack1": dict(sheet=flyeye_attack1, frame=(150, 150), count=8, delay=50, mirror=True),
+    "boss_attack2": dict(sheet=flyeye_attack2, frame=(150, 150), count=8, delay=50, mirror=True),
+    "boss_takehit": dict(sheet=flyeye_takehit, frame=(150, 150), count=4, mirror=True),
+    "boss_death": dict(sheet=flyeye_death, frame=(150, 150), start=1, count=1),
+    "boss_land": dict(sheet=flyeye_death, frame=(150, 150), start=2, count=2),
+    "boss_blood": dict(files=bloodsplat, size=(100, 100)),
+    # Slime
+    "slime_move": dict(files=slime_move, size=(64, 64), pivot="midbottom", mirror=True),
+    "slime_hurt": dict(files=slime_hurt, size=(64, 64), pivot="midbottom", mirror=True),
+    "slime_die": dict(files=slime_die, size=(64, 64), pivot="midbottom", mirror=True),
+    "slime_attack": dict(files=slime_attack[:4], size=(64, 64), pivot="midbottom", mirror=True),
+    # Gun
+    "gun": dict(files=bullet_path, size=(30, 30)),
+    "gun_fx": dict(files=fire, size=(40, 40), delay=50, pivot="midbottom"),
+    # Projectiles
+    "bullet": dict(files=bullet_path, size=(20, 20)),
+    "bullet_impact": dict(sheet=bulletimpact, frame=(48, 48), count=8, size=(40, 40), delay=50),
+    "bullet_bounce": dict(files=bulletbounce, size=(40, 40), mirror=True),
+    "fireball": dict(files=fireball, scale2x=True, rotation=-90, alpha=OPAQUE, pivot="midtop"),
+    "fireball_fx": dict(sheet=fireballfx, frame=(128, 128), count=12, size=(80, 80), flip=(False, True), delay=50,
+                        pivot="midtop"),
+    "fireball_impact": dict(sheet=fireballimpact, frame=(64, 64), count=8, size=(80, 80)),
+    "iceshard": dict(files=(iceshard,), size=(96, 96), rotation=-90),
+    "iceshard_fx": dict(files=iceshardfx, size=(96, 96), rotation=-90),
+    "iceshard_impact": dict(files=iceshardimpact, size=(96, 96), rotation=-90, delay=200),
+}
+
+DEFAULT_DELAY = 100  # ms between frames
+ATLAS_SIZE = 2048    # Width and height of each atlas sheet
+PADDING = 1          # Empty pixels between frames so that scaled blits don't bleed into neighbours
+
+
+def load_source_frames(name, flip=False):
+    """
+    Load the frames of an animation from its source files (through the asset cache)
+    :param name: key of ANIMATIONS
+    :param flip: True for frames flipped horizontally
+    :return: list of surfaces
+    """
+    anim = ANIMATIONS[name]
+    flip_x, flip_y = anim.get("flip", (False, False))
+    flip = (flip_x != flip, flip_y)
+    if "sheet" in anim:
+        w, h = anim["frame"]
+        return get_sheet(anim["sheet"]).get_strip(anim["count"], w, h, x=anim.get("start", 0) * w,
+                                                  size=anim.get("size"), flip=flip)
+    return asset_cache.load_frames(anim["files"], size=anim.get("size"), scale2x=anim.get("scale2x", False),
+                                   flip=flip, rotation=anim.get("rotation", 0), alpha=anim.get("alpha", AUTO))
+
+
+def signature(name):
+    """
+    Used to tell if the manifest entry of an animation is stale (description or source files changed)
+    :param name: key of ANIMATIONS
+    :return: string
+    """
+    anim = ANIMATIONS[name]
+    sources = (anim["sheet"],) if "sheet" in anim else anim["files"]
+    options = sorted((key, value) for key, value in anim.items() if key not in ("sheet", "files"))
+    files = [(os.path.relpath(path, parent_path), int(os.path.getmtime(path))) for path in sources]
+    return repr((options, files))
+
+
+class Atlas:
+    def __init__(self, cache=None):
+        """
+        Runtime side of the atlas; loads the manifest once, on first use
+        :param cache: AssetCache to load frames through; None for the shared asset_cache
+        """
+        self.asset_cache = cache or asset_cache
+        self.manifest = None
+        self.sheets = []  # Paths of atlas sheets
+        self.cache = {}  # (name, flip) -> list of frames
+        self.is_loaded = False
+        self.lock = threading.Lock()  # Frames can be requested from loader threads
+        self.pending = {}  # (name, flip) -> threading.Event for animations that another thread is loading right now
+
+    def load(self):
+        """
+        Load manifest if the atlas has been built; sheets are only decoded when a frame isn't in the asset cache
+        :return: None
+        """
+        with self.lock:
+            if self.is_loaded:
+                return
+            if os.path.exists(atlas_manifest_path):
+                with open(atlas_manifest_path, "r") as file:
+                    manifest = json.load(file)
+                self.sheets = [os.path.join(atlas_dir, sheet) for sheet in manifest["sheets"]]
+                self.manifest = manifest
+            self.is_loaded = True
+
+    def entry(self, name):
+        """
+        :param name: key of ANIMATIONS
+        :return: manifest entry of animation; None if the atlas isn't built or the entry is stale
+        """
+        if not self.is_loaded:
+            self.load()
+        entry = self.manifest["animations"].get(name) if self.manifest else None
+        return entry if entry and entry["signature"] == signature(name) else None
+
+    def frames(self, name, flip=False):
+        """
+        Get the frames of an animation
+        :param name: key of ANIMATIONS
+        :param flip: True for frames flipped horizontally (animation must have "mirror" set)
+        :return: list of surfaces (shared, so never draw onto them)
+        """
+        key = (name, flip)
+        frames = self.cache.get(key)
+        if frames is not None:
+            return list(frames)
+        with self.lock:
+            frames = self.cache.get(key)
+            loading = self.pending.get(key)
+            if frames is None and loading is None:
+                self.pending[key] = threading.Event()
+        if frames is not None:
+            return list(frames)
+        if loading is not None:
+            # Another thread is loading this animation; wait for it instead of slicing and optimizing it twice
+            loading.wait()
+            return self.frames(name, flip)
+
+        try:
+            entry = self.entry(name)
+            if entry:
+                rects = entry["frames_flipped"] if flip else entry["frames"]
+                # Each frame is copied out of its (per-pixel alpha) sheet and gets its own format; a subsurface of an
+                # RLE sheet would make SDL decode and encode the whole sheet on every blit
+                frames = [self.asset_cache.load(self.sheets[sheet], area=rect, alpha=AUTO) for sheet, *rect in rects]
+            else:
+                frames = load_source_frames(name, flip)
+            self.cache[key] = frames
+        finally:
+            with self.lock:
+                self.pending.pop(key).set()
+        return list(frames)
+
+    def delay(self, name):
+        """
+        :param name: key of ANIMATIONS
+        :return: ms between frames of animation (from the manifest; from ANIMATIONS if the atlas isn't built)
+        """
+        entry = self.entry(name)
+        return entry["delay"] if entry else ANIMATIONS[name].get("delay", DEFAULT_DELAY)
+
+    def pivot(self, name, flip=False):
+        """
+        :param name: key of ANIMATIONS
+        :param flip: True for the point on frames flipped horizontally
+        :return: (x, y) on the frame the animation is positioned by (from the manifest; from ANIMATIONS if the atlas
+            isn't built)
+        """
+        entry = self.entry(name)
+        if entry:
+            x, y = entry["pivot"]
+            w = entry["frames"][0][3]
+        else:
+            w, h = self.frames(name)[0].get_size()
+            x, y = getattr(pg.Rect(0, 0, w, h), ANIMATIONS[name].get("pivot", "center"))
+        return (w - x, y) if flip else (x, y)
+
+
+def pack():
+    """
+    Pack every frame of every animation into atlas sheets (shelf packing, tallest frames first) and write the
+    manifest; the display mode must be set before calling
+    :return: number of sheets written
+    """
+    # Gather frames as per-pixel alpha surfaces (colorkeys turn into transparent pixels)
+    entries = []  # (animation name, flipped, index, surface)
+    for name, anim in ANIMATIONS.items():
+        for flip in (False, True) if anim.get("mirror") else (False,):
+            for i, frame in enumerate(load_source_frames(name, flip)):
+                entries.append((name, flip, i, frame.convert_alpha()))
+    entries.sort(key=lambda entry: entry[3].get_height(), reverse=True)
+
+    # Shelf packing
+    placements = {}
+    sheet_sizes = [[0, 0]]
+    x = y = shelf_h = 0
+    for name, flip, i, frame in entries:
+        w, h = frame.get_size()
+        if x + w > ATLAS_SIZE:
+            x, y, shelf_h = 0, y + shelf_h + PADDING, 0
+        if y + h > ATLAS_SIZE:
+            sheet_sizes.append([0, 0])
+            x = y = shelf_h = 0
+        placements[(name, flip, i)] = (len(sheet_sizes) - 1, x, y, w, h)
+        sheet_sizes[-1] = [max(sheet_sizes[-1][0], x + w), max(sheet_sizes[-1][1], y + h)]
+        x += w + PADDING
+        shelf_h = max(shelf_h, h)
+
+    # Draw sheets; BLEND_RGBA_MAX onto transparent black copies the pixels without blending them
+    sheets = [pg.Surface(size, pg.SRCALPHA) for size in sheet_sizes]
+    for name, flip, i, frame in entries:
+        sheet, x, y, w, h = placements[(name, flip, i)]
+        sheets[sheet].blit(frame, (x, y), special_flags=pg.BLEND_RGBA_MAX)
+
+    os.makedirs(atlas_dir, exist_ok=True)
+    manifest = {"version": 1, "sheets": [], "animations": {}}
+    for index, sheet in enumerate(sheets):
+        filename = "atlas_{}.png".format(index)
+        pg.image.save(sheet, os.path.join(atlas_dir, filename))
+        manifest["sheets"].append(filename)
+    for name, anim in ANIMATIONS.items():
+        count = len([key for key in placements if key[0] == name and not key[1]])
+        w, h = placements[(name, False, 0)][3:]
+        pivot = getattr(pg.Rect(0, 0, w, h), anim.get("pivot", "center"))
+        manifest["animations"][name] = {
+            "signature": signature(name),
+            "delay": anim.get("delay", DEFAULT_DELAY),
+            "pivot": list(pivot),
+            "frames": [placements[(name, False, i)] for i in range(count)],
+            "frames_flipped": [placements[(name, True, i)] for i in range(count)] if anim.get("mirror") else [],
+        }
+    with open(atlas_manifest_path, "w") as file:
+        json.dump(manifest, file, indent=1)
+    return len(sheets)
+
+
+def check_blit_cost(names=("boss_flight", "player_idle", "bullet"), repeat=20):
+    """
+    Regression check: frames loaded on a cold asset cache (optimize() picks their format) have to blit about as fast
+    as the same frames read back from the disk cache on a later launch; the atlas must be built
+    :param names: keys of ANIMATIONS to time
+    :param repeat: times every frame is blitted
+    :return: (us per blit cold, us per blit warm)
+    """
+    def cost(atlas_):
+        frames = [frame for name in names for frame in atlas_.frames(name)]
+        target = pg.Surface((ATLAS_SIZE, ATLAS_SIZE))
+        for frame in frames:
+            target.blit(frame, (0, 0))  # First blit of an RLE surface encodes it
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for frame in frames:
+                target.blit(frame, (0, 0))
+        return (time.perf_counter() - start) / repeat / len(frames) * 1000000
+
+    with tempfile.TemporaryDirectory() as directory:
+        disk_cache = DiskCache(directory)
+        cold = cost(Atlas(AssetCache(disk_cache)))  # Decodes the sheets and writes the frames to the disk cache
+        warm = cost(Atlas(AssetCache(disk_cache)))
+    return cold, warm
+
+
+# Shared by the whole game
+atlas = Atlas()
+
+
+if __name__ == "__main__":
+    pg.init()
+    pg.display.set_mode((1, 1), pg.HIDDEN)
+    print("Packed {} animations into {} atlas sheets".format(len(ANIMATIONS), pack()))
+    if "--check" in sys.argv:
+        cold_cost, warm_cost = check_blit_cost()
+        print("Atlas frame blit: {:.1f} us cold cache, {:.1f} us warm cache".format(cold_cost, warm_cost))
+        if cold_cost > warm_cost * 2 + 10:
+            sys.exit("Frames blit much slower on a cold cache")
+    pg.quit()
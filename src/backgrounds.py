@@ -1,17 +1,22 @@
 # Name: backgrounds.py
 # Purpose: Defines class structures and related methods/attributes for the backgrounds of the game
-# Version: 1.1
+# Version: 1.2
 # Date: 5 June 2020
 # Author(s): Khoa Hoang, Adrienne Lhuc Estrella, Pratham Kwatra
-# Dependencies: pygame, paths, settings, and random modules
+# Dependencies: pygame, paths, settings, assets, and random modules
 
 import pygame
 from paths import *
 from settings import *
+from assets import *
 from random import randint
 
 
 class GlacialBackground:
+    # sky < glacial_mountains < clouds_bg = clouds_lonely < clouds_mg_3 < clouds_mg_2 < clouds_mg_1
+    LAYER_PATHS = (glacial_sky_path, glacial_mountains_path, glacial_clouds_bg_path, glacial_clouds_lonely_path,
+                   glacial_clouds_mg_3_path, glacial_clouds_mg_2_path, glacial_clouds_mg_1_path)
+
     def __init__(self, game):
         """
         Initalize layers and their corresponding positions on the screen
@@ -20,36 +25,91 @@ class GlacialBackground:
         self.game = game
         self.layers = []
         self.layer_pos = []  # Position to blit
+        self.layer_bounds = []  # Rect of the visible part of each layer image
+        self.layer_alpha = []  # True for layers with transparent pixels (see load_layer())
+        self.drawn_pos = None  # Integer layer positions of the last draw_dirty()
+        self.scale = game.render_scale  # Size of the surface drawn on relative to the screen
         self.load_images()
+        self.layer_count = len(self.layers)  # Number of bottom layers drawn (lowered by the quality governor)
+
+        # Composite of the bottom layers that are not moving (or only move within a small area)
+        self.cache = None
+        self.cached_count = 0  # Number of bottom layers in cache
+        self.cached_pos = []  # Integer positions the cached layers were drawn at
+        self.positions = []  # Integer positions of all layers this frame (scaled)
+        self.still_frames = [BACKGROUND_STABLE_FRAMES] * len(self.layers)  # Frames since each layer last moved
+        self.create_cache()
+        # Stats
+        self.frames = 0
+        self.blits = 0  # Layer and cache blits onto the screen
+        self.pixels = 0  # Pixels blitted onto the screen
 
     def load_images(self):
         """
         Load all background layers images into layers list
         :return: None
         """
-        image = pygame.image.load(glacial_sky_path).convert_alpha()
-        self.layers.append(image)
-        image = pygame.image.load(glacial_mountains_path).convert_alpha()
-        self.layers.append(image)
-        image = pygame.image.load(glacial_clouds_bg_path).convert_alpha()
-        self.layers.append(image)
-        image = pygame.image.load(glacial_clouds_lonely_path).convert_alpha()
-        self.layers.append(image)
-        image = pygame.image.load(glacial_clouds_mg_3_path).convert_alpha()
-        self.layers.append(image)
-        image = pygame.image.load(glacial_clouds_mg_2_path).convert_alpha()
-        self.layers.append(image)
-        image = pygame.image.load(glacial_clouds_mg_1_path).convert_alpha()
-        self.layers.append(image)
-        for i in range(0, len(self.layers)):
+        for i in range(0, len(self.LAYER_PATHS)):
+            layer = self.load_layer(i, self.scale)
+            self.layers.append(layer)
+            self.layer_bounds.append(layer.get_bounding_rect())
+            self.layer_alpha.append(bool(layer.get_flags() & pygame.SRCALPHA or layer.get_colorkey()))
             if i == 2 or 4 <= i <= 6:
-                self.layers[i] = pygame.transform.scale(self.layers[i], (int(SCREEN_WIDTH * 1.3),
-                                                                         int(SCREEN_HEIGHT * 1.3)))
                 self.layer_pos.append(pygame.Vector2((SCREEN_WIDTH * 1.3 - SCREEN_WIDTH) // -2, 0))
             else:
-                self.layers[i] = pygame.transform.scale(self.layers[i], (SCREEN_WIDTH, SCREEN_HEIGHT))
                 self.layer_pos.append(pygame.Vector2(0, 0))
 
+    @staticmethod
+    def load_layer(i, scale=1):
+        """
+        Load (or get from the asset cache) a scaled layer image; also used by the preloader
+        Opaque layers are converted to the display format without alpha and layers with only fully opaque or fully
+        transparent pixels get an RLE colorkey (see assets.optimize())
+        :param i: index of layer
+        :param scale: size of the surface the layer is drawn on relative to the screen
+        :return: pygame Surface
+        """
+        if i == 2 or 4 <= i <= 6:
+            size = (int(SCREEN_WIDTH * 1.3 * scale), int(SCREEN_HEIGHT * 1.3 * scale))
+        else:
+            size = (int(SCREEN_WIDTH * scale), int(SCREEN_HEIGHT * scale))
+        return asset_cache.load(GlacialBackground.LAYER_PATHS[i], size=size, alpha=AUTO)
+
+    def create_cache(self):
+        """
+        Create an empty cache the size of the surface the background is drawn on
+        :return: None
+        """
+        self.cache = pygame.Surface((int(SCREEN_WIDTH * self.scale), int(SCREEN_HEIGHT * self.scale))).convert()
+        self.drawn_pos = None
+        self.cached_count = 0
+        self.positions = []
+
+    def set_scale(self, scale):
+        """
+        Reload the layers to draw the background on a surface of a different size (see Game.set_resolution())
+        :param scale: size of the surface drawn on relative to the screen
+        :return: None
+        """
+        if scale == self.scale:
+            return
+        self.scale = scale
+        for i in range(len(self.layers)):
+            self.layers[i] = self.load_layer(i, scale)
+            self.layer_bounds[i] = self.layers[i].get_bounding_rect()
+        self.create_cache()
+
+    def set_layer_count(self, count):
+        """
+        Only draw the bottom layers; the top ones are the fastest moving and cover most of the screen
+        :param count: number of layers to draw; None for all of them
+        :return: None
+        """
+        count = len(self.layers) if count is None else min(count, len(self.layers))
+        if count != self.layer_count:
+            self.layer_count = count
+            self.create_cache()
+
     def update(self):
         """
         Update certain layers so that they move
@@ -68,7 +128,8 @@ class GlacialBackground:
             self.game.true_scroll[0] = 0
         elif self.game.true_scroll[0] + SCREEN_WIDTH * 1.3 < SCREEN_WIDTH:
             self.game.true_scroll[0] = SCREEN_WIDTH - SCREEN_WIDTH * 1.3
-        self.game.true_scroll[1] += int((self.game.player.pos.y-self.game.true_scroll[1]-14-600)/40)
+        player_y = self.game.player.pos.y - self.game.camera.rect.top  # On the screen
+        self.game.true_scroll[1] += int((player_y-self.game.true_scroll[1]-14-600)/40)
 
         self.layer_pos[1].x = self.game.true_scroll[0] * 0.0625
         self.layer_pos[2].x = self.game.true_scroll[0] * 0.125
@@ -81,13 +142,157 @@ class GlacialBackground:
         self.layer_pos[5].y = self.game.true_scroll[1] * 0.5 - 75
         self.layer_pos[6].y = self.game.true_scroll[1]
 
-    def draw(self):
+    def moved_rects(self, i, old, new):
+        """
+        :param i: index of layer
+        :param old: old integer position of layer
+        :param new: new integer position of layer
+        :return: list of screen rects the layer covered at its old position and covers at its new position
+        """
+        screen_rect = self.cache.get_rect()
+        rects = [self.layer_bounds[i].move(old).clip(screen_rect), self.layer_bounds[i].move(new).clip(screen_rect)]
+        return [rect for rect in rects if rect]
+
+    def blit_layer(self, surface, i, pos, clip):
+        """
+        Blit only the part of a layer that has visible pixels and lands inside clip (area argument of blit), which
+        skips the off-screen parts of the oversized layers and their empty rows
+        :param surface: surface to blit onto
+        :param i: index of layer
+        :param pos: integer position of layer
+        :param clip: rect of surface to draw in
+        :return: number of pixels blitted
+        """
+        rect = self.layer_bounds[i].move(pos).clip(clip)
+        if rect:
+            surface.blit(self.layers[i], rect, rect.move(-pos[0], -pos[1]))
+        return rect.w * rect.h
+
+    def bottom_layer(self, start, end, clip):
+        """
+        Layers under an opaque layer that covers the whole clip rect can't be seen, so drawing starts at that layer
+        :param start: index of lowest layer to draw
+        :param end: index after the highest layer to draw
+        :param clip: rect being drawn
+        :return: index of the lowest layer that needs drawing
+        """
+        for i in range(end - 1, start - 1, -1):
+            if not self.layer_alpha[i] and self.layer_bounds[i].move(self.positions[i]).contains(clip):
+                return i
+        return start
+
+    def update_cache(self):
         """
-        Blit all layers onto game screen in correct order at updated positions
+        Bring the cached composite up to date with the current layer positions; the cache holds the bottom layers
+        that have been still for a few frames, and layers that only move within a small area (the lonely cloud) are
+        redrawn into it in place; layers above the cached ones are blitted onto the screen every frame
         :return: None
         """
-        for i in range(len(self.layers)):
-            self.game.screen.blit(self.layers[i], self.layer_pos[i])
+        # Blit positions are truncated like this
+        positions = [(int(pos.x * self.scale), int(pos.y * self.scale)) for pos in self.layer_pos[:self.layer_count]]
+        previous = self.positions or positions
+        for i, pos in enumerate(positions):
+            if pos != previous[i]:
+                self.still_frames[i] = 0
+            else:
+                self.still_frames[i] += 1
+        self.positions = positions
+
+        # Find how many bottom layers can be kept in the cache
+        max_area = self.cache.get_width() * self.cache.get_height() * BACKGROUND_REGION_FRACTION
+        rects = []  # Parts of cache to redraw
+        count = 0
+        for i, pos in enumerate(positions):
+            if i < self.cached_count:
+                if pos != self.cached_pos[i]:
+                    moved = self.moved_rects(i, self.cached_pos[i], pos)
+                    if sum(rect.w * rect.h for rect in moved) > max_area:
+                        break
+                    rects += moved
+            elif self.still_frames[i] < BACKGROUND_STABLE_FRAMES:
+                # Moving layers can only be added if they move within a small area
+                if self.still_frames[i] or \
+                        sum(rect.w * rect.h for rect in self.moved_rects(i, previous[i], pos)) > max_area:
+                    break
+            count += 1
+
+        screen_rect = self.cache.get_rect()
+        if count < self.cached_count:
+            # A cached layer started moving a lot; rebuild cache without it
+            for i in range(self.bottom_layer(0, count, screen_rect), count):
+                self.blit_layer(self.cache, i, positions[i], screen_rect)
+        else:
+            for rect in rects:
+                for i in range(self.bottom_layer(0, self.cached_count, rect), self.cached_count):
+                    self.blit_layer(self.cache, i, positions[i], rect)
+            # Add layers that stopped moving
+            for i in range(self.cached_count, count):
+                self.blit_layer(self.cache, i, positions[i], screen_rect)
+        self.cached_count = count
+        self.cached_pos = positions[:count]
+
+    def compose(self, surface, rect=None):
+        """
+        Draw the background (cache and the layers above it) onto a surface
+        :param surface: surface the size of the cache
+        :param rect: part of surface to draw; None for all of it
+        :return: None
+        """
+        clip = pygame.Rect(rect) if rect else surface.get_rect()
+        start = self.bottom_layer(self.cached_count, self.layer_count, clip)
+        if self.cached_count and start == self.cached_count:
+            surface.blit(self.cache, clip, clip)
+            self.pixels += clip.w * clip.h
+            self.blits += 1
+        for i in range(start, self.layer_count):
+            self.pixels += self.blit_layer(surface, i, self.positions[i], clip)
+            self.blits += 1
+
+    def draw(self, surface):
+        """
+        Blit all layers onto a surface in correct order at updated positions
+        :param surface: game screen, or the smaller surface the world is drawn on (see Game.set_resolution())
+        :return: None
+        """
+        self.update_cache()
+        self.compose(surface)
+        self.frames += 1
+
+    def draw_dirty(self, surface):
+        """
+        Bring a surface holding the background of the last call up to date, redrawing only the parts that changed
+        (old and new position of each moved layer); used by the dirty renderer
+        :param surface: screen sized surface
+        :return: list of redrawn rects (just the whole surface if most of it changed)
+        """
+        self.update_cache()
+        positions = self.positions
+        screen_rect = surface.get_rect()
+        if self.drawn_pos is None:
+            rects = [screen_rect]
+        else:
+            rects = []
+            for i, (old, new) in enumerate(zip(self.drawn_pos, positions)):
+                if old != new:
+                    rects += self.moved_rects(i, old, new)
+            # Parallax scrolled; one full redraw is cheaper than redrawing lots of overlapping rects
+            if sum(rect.w * rect.h for rect in rects) > screen_rect.w * screen_rect.h * FULL_REDRAW_FRACTION:
+                rects = [screen_rect]
+        self.drawn_pos = positions
+
+        for rect in rects:
+            self.compose(surface, rect)
+        self.frames += 1
+        return rects
+
+    def report(self):
+        """
+        :return: string with number of layers cached and blits per frame
+        """
+        if not self.frames:
+            return "GlacialBackground: not drawn"
+        return "GlacialBackground: {} of {} layers cached, {:.2f} blits and {:.0f} pixels per frame".format(
+            self.cached_count, self.layer_count, self.blits / self.frames, self.pixels / self.frames)
 
     def reset(self):
         """
@@ -99,6 +304,10 @@ class GlacialBackground:
                 self.layer_pos[i] = pygame.Vector2((SCREEN_WIDTH * 1.3 - SCREEN_WIDTH) // -2, 0)
             else:
                 self.layer_pos[i] = pygame.Vector2(0, 0)
+        self.drawn_pos = None
+        self.cached_count = 0
+        self.positions = []
+        self.still_frames = [BACKGROUND_STABLE_FRAMES] * len(self.layers)
 
 
 """
@@ -3,39 +3,20 @@
 # Version: 2.1
 # Date: 5 June 2020
 # Author(s): Khoa Hoang, Matt Innaurato, Adrienne Lhuc Estrella
-# Dependencies: pygame, settings, projectiles, paths, utils, and random modules
+# Dependencies: pygame, settings, projectiles, paths, utils, animation, and random modules
 
 import pygame as pg
 from settings import *
 from projectiles import *
 from paths import *
 from utils import *
+from animation import Animator, clip
 from random import choice, randint
 
 
-class BossBloodFX(FX):
-    def __init__(self, game, x, y):
-        """
-        Blood effects that spawn when boss dies
-        Initialize position of fx
-        :param game: reference to game instance
-        :param x: x-position
-        :param y: y-position
-        """
-        super().__init__(game, x, y)
-
-        self.image = self.frames[0]
-        self.rect = self.image.get_rect(center=(x, y))
+class Boss(pg.sprite.DirtySprite):
+    _layer = LAYER_CHARACTERS
 
-    def load_frames(self):
-        # Blood splat
-        for file in bloodsplat:
-            bloodimg = pg.image.load(file).convert_alpha()
-            bloodimg = pg.transform.scale(bloodimg, (100, 100))
-            self.frames.append(bloodimg)
-
-
-class Boss(pg.sprite.Sprite):
     def __init__(self, game):
         """
         Main boss character sprite that flies above and tries to hit player with fireballs and ice shards
@@ -43,27 +24,26 @@ class Boss(pg.sprite.Sprite):
         :param game: reference to game instance
         """
         super().__init__()
+        self.dirty = 2
         self.game = game
 
         # Add to sprite groups
         self.game.char_sprites.add(self)
         self.game.all_sprites.add(self)
-
-        # Frame lists
-        self.flight_frames_r = []
-        self.flight_frames_l = []
-        self.attack1_frames_r = []
-        self.attack1_frames_l = []
-        self.attack2_frames_r = []
-        self.attack2_frames_l = []
-        self.takehit_frames_r = []
-        self.takehit_frames_l = []
-        self.death_frames = []
-        self.land_frames = []
+        self.game.render_sprites.add(self)
+
+        # Clips
+        self.flight_clip = None
+        self.attack1_clip = None
+        self.attack2_clip = None
+        self.takehit_clip = None
+        self.death_clip = None
+        self.land_clip = None
         self.load_sprite_sheets()
+        self.animator = Animator(self.game.animations, self.flight_clip)
 
         # Initialize pygame elements
-        self.image = self.flight_frames_r[0]
+        self.image = self.animator.image
         self.rect = self.image.get_rect(center=(SCREEN_WIDTH / 2, 36))
         hitbox_size = (80, 60)
         self.hitbox = pg.Rect(
@@ -80,14 +60,9 @@ class Boss(pg.sprite.Sprite):
         self.FRICTION = -0.08
 
         # Animations
-        self.last_frame_update = 0
-        self.current_frame = -1
-        self.current_attack_frame = -1
-        self.current_takehit_frame = -1
-        self.current_land_frame = -1
         self.is_facing_right = True
         self.is_attacking = True
-        self.attack_choice = None
+        self.attack_choice = None  # Attack clip to play
         self.is_hit = False
         self.is_landing = False
 
@@ -106,109 +81,70 @@ class Boss(pg.sprite.Sprite):
 
     def load_sprite_sheets(self):
         """
-        Load spritesheet images into sprite frames for animation
+        Load animation clips of the sprite sheets in the atlas (frames face right; flipped when facing left)
         :return: None
         """
         # Flight
-        flight_sheet = SpriteSheet(flyeye_flight)
+        self.flight_clip = clip("boss_flight")
         # Attack
-        attack1_sheet = SpriteSheet(flyeye_attack1)
-        attack2_sheet = SpriteSheet(flyeye_attack2)
-        for i in range(0, 8):
-            # Flight
-            self.flight_frames_r.append(
-                flight_sheet.get_sprite(i * 150, 0, 150, 150))
-            self.flight_frames_l.append(pg.transform.flip(
-                self.flight_frames_r[i], True, False))
-            # Attack
-            self.attack1_frames_r.append(
-                attack1_sheet.get_sprite(i * 150, 0, 150, 150))
-            self.attack1_frames_l.append(pg.transform.flip(
-                self.attack1_frames_r[i], True, False))
-            self.attack2_frames_r.append(
-                attack2_sheet.get_sprite(i * 150, 0, 150, 150))
-            self.attack2_frames_l.append(pg.transform.flip(
-                self.attack2_frames_r[i], True, False))
+        self.attack1_clip = clip("boss_attack1", loop=False)
+        self.attack2_clip = clip("boss_attack2", loop=False)
         # Take hit
-        takehit_sheet = SpriteSheet(flyeye_takehit)
-        for i in range(0, 4):
-            # Take hit
-            self.takehit_frames_r.append(
-                takehit_sheet.get_sprite(i * 150, 0, 150, 150))
-            self.takehit_frames_l.append(pg.transform.flip(
-                self.takehit_frames_r[i], True, False))
-
+        self.takehit_clip = clip("boss_takehit", loop=False)
         # Death
-        death_sheet = SpriteSheet(flyeye_death)
-        for i in range(1, 4):
-            if i == 1:
-                self.death_frames.append(
-                    death_sheet.get_sprite(i * 150, 0, 150, 150))
-            elif i > 1:
-                self.land_frames.append(
-                    death_sheet.get_sprite(i * 150, 0, 150, 150))
+        self.death_clip = clip("boss_death")
+        self.land_clip = clip("boss_land", loop=False)
 
     def animate(self):
         """
-        Animate boss based on state variables initialized in constructor
+        Animate boss based on state variables initialized in constructor; attack, take hit and land clips play once
         :return: None
         """
-        current_time = pg.time.get_ticks()
         if self.is_alive:
-            if current_time - self.last_frame_update > 100:
-                # Flight
-                if self.is_facing_right and not self.is_attacking and not self.is_hit:
-                    self.last_frame_update = current_time
-                    self.current_frame = (
-                        self.current_frame + 1) % len(self.flight_frames_r)
-                    self.image = self.flight_frames_r[self.current_frame]
-                elif not self.is_facing_right and not self.is_attacking and not self.is_hit:
-                    self.last_frame_update = current_time
-                    self.current_frame = (
-                        self.current_frame + 1) % len(self.flight_frames_l)
-                    self.image = self.flight_frames_l[self.current_frame]
-
-                # Take hit
-                if self.is_facing_right and self.is_hit:
-                    self.last_frame_update = current_time
-                    self.current_takehit_frame = (
-                        self.current_takehit_frame + 1) % len(self.takehit_frames_r)
-                    self.image = self.takehit_frames_r[self.current_takehit_frame]
-                elif not self.is_facing_right and self.is_hit:
-                    self.last_frame_update = current_time
-                    self.current_takehit_frame = (
-                        self.current_takehit_frame + 1) % len(self.takehit_frames_l)
-                    self.image = self.takehit_frames_l[self.current_takehit_frame]
-                if self.current_takehit_frame >= len(self.takehit_frames_r) - 1:
-                    self.is_hit = False
-                    self.current_takehit_frame = 0
-
-            if current_time - self.last_frame_update > 50 and self.attack_choice:
-                # Attack
-                if self.is_attacking:
-                    self.last_frame_update = current_time
-                    self.current_attack_frame = (
-                        self.current_attack_frame + 1) % len(self.attack_choice)
-                    self.image = self.attack_choice[self.current_attack_frame]
-                if self.current_attack_frame >= len(self.attack_choice) - 1:
-                    self.last_frame_update = current_time
-                    self.is_attacking = False
-                    self.current_attack_frame = 0
-
-        if current_time - self.last_frame_update > 100 and not self.is_alive and self.is_dying:
+            if self.is_attacking and self.attack_choice:
+                self.animator.play(self.attack_choice, self.end_attack)
+            elif self.is_hit:
+                self.animator.play(self.takehit_clip, self.end_hit)
+            else:
+                self.animator.play(self.flight_clip)
+        elif self.is_dying:
             # Death
-            if not self.is_landing:
-                self.last_frame_update = current_time
-                self.image = self.death_frames[0]
+            if self.is_landing:
+                self.animator.play(self.land_clip, self.end_death)
             else:
-                self.last_frame_update = current_time
-                self.current_land_frame += 1
-                self.image = self.land_frames[self.current_land_frame]
-            if self.current_land_frame >= len(self.land_frames) - 1:
-                self.last_frame_update = current_time
-                self.is_landing = False
-                self.is_dying = False
-                self.current_land_frame = 0
+                self.animator.play(self.death_clip)
+        self.animator.flip = not self.is_facing_right
+        self.image = self.animator.image
+
+    def end_attack(self):
+        """
+        Called when the attack clip has played
+        :return: None
+        """
+        self.is_attacking = False
+
+    def end_hit(self):
+        """
+        Called when the take hit clip has played
+        :return: None
+        """
+        self.is_hit = False
+
+    def end_death(self):
+        """
+        Called when the boss has landed; stays on the last land frame until it respawns
+        :return: None
+        """
+        self.is_landing = False
+        self.is_dying = False
+
+    def kill(self):
+        """
+        Remove from all groups and stop the animation
+        :return: None
+        """
+        self.animator.release()
+        super().kill()
 
     def track_player(self):
         """
@@ -230,30 +166,24 @@ class Boss(pg.sprite.Sprite):
         Randomly shoot fireball or ice shard every 2 seconds vertically downwards
         :return: None
         """
-        now = pg.time.get_ticks()
+        now = self.game.now
         if now - self.last_shot_time > 2000:
             self.last_shot_time = now
             # Shoot fireblast or iceshard depending on random
             attack = choice(("attack1", "attack2"))
             if attack == "attack1":
-                pg.mixer.Sound(fireball_sound).play().set_volume(0.5)
-                FireBall(self.game, self.pos, (0, 5))
+                self.game.sounds.play("fireball")
+                self.game.projectiles.acquire(FIREBALL, self.pos, (0, 5))
             elif attack == "attack2":
-                pg.mixer.Sound(iceshard_sound).play().set_volume(0.75)
-                IceShard(self.game, self.pos, (0, 10))
+                self.game.sounds.play("iceshard")
+                self.game.projectiles.acquire(ICESHARD, self.pos, (0, 10))
 
             # Choose animation depending on attack
             self.is_attacking = True
-            if self.is_facing_right:
-                if attack == "attack1":
-                    self.attack_choice = self.attack1_frames_r
-                elif attack == "attack2":
-                    self.attack_choice = self.attack2_frames_r
-            elif not self.is_facing_right:
-                if attack == "attack1":
-                    self.attack_choice = self.attack1_frames_l
-                elif attack == "attack2":
-                    self.attack_choice = self.attack2_frames_l
+            if attack == "attack1":
+                self.attack_choice = self.attack1_clip
+            elif attack == "attack2":
+                self.attack_choice = self.attack2_clip
 
     def scroll_with_screen(self):
         """
@@ -262,9 +192,9 @@ class Boss(pg.sprite.Sprite):
         """
         if self.is_alive:
             # Boss moves up screen if it is below certain threshold
-            if self.pos.y > 60:
+            if self.pos.y - self.game.camera.rect.top > 60:
                 self.acc.y -= self.BASE_ACC / 3
-            if self.pos.y < 30:
+            if self.pos.y - self.game.camera.rect.top < 30:
                 self.acc.y = self.BASE_ACC / 2
 
     def take_hit(self):
@@ -273,19 +203,19 @@ class Boss(pg.sprite.Sprite):
         :return: None
         """
         # Plays hurt animation and updates health if player bullets collide with boss's hitbox
-        for proj in self.game.player_proj_sprites:
-            if self.hitbox.colliderect(proj.hitbox):
-                self.is_hit = True
-                BulletImpact(self.game, proj.pos.x, proj.pos.y)
-                proj.kill()
-                pg.mixer.Sound(fireball_hit_sound).play()
-                self.health -= .5
-                if self.health < 1:
-                    self.is_alive = False
-                    self.is_dying = True
-                    self.game.score += 1000
-                    self.deathtime = pg.time.get_ticks()
-                    BossBloodFX(self.game, self.pos.x, self.pos.y)
+        projectiles = self.game.projectiles
+        for proj in projectiles.hits(self.hitbox, LAYER_PLAYER_PROJECTILES):
+            self.is_hit = True
+            self.game.particles.emit("bullet_impact", projectiles.x[proj], projectiles.y[proj])
+            projectiles.release(proj)
+            self.game.sounds.play("boss_hit")
+            self.health -= .5
+            if self.health < 1:
+                self.is_alive = False
+                self.is_dying = True
+                self.game.score += 1000
+                self.deathtime = self.game.now
+                self.game.particles.emit("boss_blood", self.pos.x, self.pos.y)  # Blood splat
 
     def collide_platform(self):
         """
@@ -310,9 +240,9 @@ class Boss(pg.sprite.Sprite):
             self.acc = pg.Vector2(0, GRAVITY_ACC)
             self.collide_platform()
 
-            now = pg.time.get_ticks()
+            now = self.game.now
             # If the boss is below the screen and the time since its death is greater than respawntime
-            if self.pos.y > SCREEN_HEIGHT + self.rect.h // 2 and now - self.deathtime > self.respawntime:
+            if self.pos.y > self.game.camera.rect.bottom + self.rect.h // 2 and now - self.deathtime > self.respawntime:
                 # Respawn
                 self.respawn()
 
@@ -331,7 +261,7 @@ class Boss(pg.sprite.Sprite):
                             (-200, spawn_y),                  # Spawns from left
                             (SCREEN_WIDTH + 200, spawn_y),    # Spawns from right
                             (spawn_x, SCREEN_HEIGHT + 200)))  # Spawns from bottom
-        self.pos = pg.Vector2(spawn_loc)
+        self.pos = pg.Vector2(spawn_loc[0], spawn_loc[1] + self.game.camera.rect.top)
 
     def update(self):
         """
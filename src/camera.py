@@ -0,0 +1,35 @@
+# Name: camera.py
+# Purpose: Keeps track of the part of the world shown on the screen; sprites stay in world coordinates and the camera's
+#   offset is only applied when they are drawn or checked against the edges of the screen
+# Version: 1.0
+# Date: 18 October 2026
+# Dependencies: pygame and settings modules
+
+import pygame as pg
+from settings import *
+
+
+class Camera:
+    def __init__(self):
+        """
+        Camera that only scrolls vertically (x-coordinates are the same in the world and on the screen)
+        """
+        self.y = 0  # World y-coordinate of the top of the screen
+        self.rect = pg.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)  # Part of the world on the screen
+
+    def scroll(self, dy):
+        """
+        Move the camera; scrolling costs the same however many sprites there are
+        :param dy: distance to move in pixels (negative is up)
+        :return: None
+        """
+        self.y += dy
+        self.rect.y = int(self.y)
+
+    def reset(self):
+        """
+        Move the camera back to where the game starts
+        :return: None
+        """
+        self.y = 0
+        self.rect.y = 0
@@ -3,13 +3,13 @@
 # Version: 3.0
 # Date: 5 June 2020
 # Author(s): Khoa Hoang
-# Dependencies: pygame, settings, random, paths, and projectiles modules
+# Dependencies: pygame, settings, random, paths, and animation modules
 
 import pygame as pg
 from settings import *
 from random import randint, choice
 from paths import *
-from projectiles import BulletImpact
+from animation import Animator, clip
 
 
 class EnemySpawner:
@@ -30,7 +30,8 @@ class EnemySpawner:
 
 
 # Slime enemy
-class Enemy(pg.sprite.Sprite):
+class Enemy(pg.sprite.DirtySprite):
+    _layer = LAYER_CHARACTERS
     # Pass in platform instance as argument so that enemy spawn on that platform
     def __init__(self, game, platform):
         """
@@ -40,26 +41,25 @@ class Enemy(pg.sprite.Sprite):
         :param platform: platform to spawn
         """
         super().__init__()
+        self.dirty = 2
         self.game = game
 
         # Add to sprite groups for updating and drawing
         self.game.char_sprites.add(self)
         self.game.enemy_sprites.add(self)
         self.game.all_sprites.add(self)
+        self.game.render_sprites.add(self)
 
-        # Frames for animations
-        self.move_frames_r = []
-        self.move_frames_l = []
-        self.hurt_frames_r = []
-        self.hurt_frames_l = []
-        self.die_frames_r = []
-        self.die_frames_l = []
-        self.attack_frames_r = []
-        self.attack_frames_l = []
+        # Clips for animations
+        self.move_clip = None
+        self.hurt_clip = None
+        self.die_clip = None
+        self.attack_clip = None
         self.load_frames()
+        self.animator = Animator(self.game.animations, self.move_clip)
 
         # For drawing through pygame
-        self.image = self.move_frames_r[0]
+        self.image = self.animator.image
         self.rect = self.image.get_rect(midbottom=(randint(platform.rect.centerx - platform.rect.w // 3,
                                                            platform.rect.centerx + platform.rect.w // 3),
                                                    platform.rect.top))
@@ -74,11 +74,6 @@ class Enemy(pg.sprite.Sprite):
         self.friction = -0.12
 
         # For animations
-        self.last_frame_update = 0
-        self.current_frame = -1
-        self.curr_hurt_frame = -1
-        self.curr_attk_frame = -1
-        self.curr_die_frame = -1
         self.is_hurt = False
         self.is_attacking = False
         self.is_dying = False
@@ -111,91 +106,67 @@ class Enemy(pg.sprite.Sprite):
 
     def load_frames(self):
         """
-        Load images for sprite frames for animations onto frame lists declared in constructor
+        Load clips for animations declared in constructor (slime frames face left; flipped when facing right)
         :return: None
         """
-        for i in range(0, 4):
-            # Move sprite
-            moveimg = pg.image.load(slime_move[i]).convert_alpha()
-            moveimg = pg.transform.scale(moveimg, (64, 64))
-            self.move_frames_l.append(moveimg)
-            self.move_frames_r.append(pg.transform.flip(self.move_frames_l[i], True, False))
-            # Hurt sprite
-            hurtimg = pg.image.load(slime_hurt[i]).convert_alpha()
-            hurtimg = pg.transform.scale(hurtimg, (64, 64))
-            self.hurt_frames_l.append(hurtimg)
-            self.hurt_frames_r.append(pg.transform.flip(self.hurt_frames_l[i], True, False))
-            # Die sprite
-            dieimg = pg.image.load(slime_die[i]).convert_alpha()
-            dieimg = pg.transform.scale(dieimg, (64, 64))
-            self.die_frames_l.append(dieimg)
-            self.die_frames_r.append(pg.transform.flip(self.die_frames_l[i], True, False))
-            # Attack sprite
-            attackimg = pg.image.load(slime_attack[i]).convert_alpha()
-            attackimg = pg.transform.scale(attackimg, (64, 64))
-            self.attack_frames_l.append(attackimg)
-            self.attack_frames_r.append(pg.transform.flip(self.attack_frames_l[i], True, False))
+        self.move_clip = clip("slime_move")
+        self.hurt_clip = clip("slime_hurt", loop=False)
+        self.die_clip = clip("slime_die", loop=False)
+        self.attack_clip = clip("slime_attack", loop=False)
 
     def animate(self):
         """
-        Animation enemy sprite based on state variables and frame lists declared in constructor
+        Animation enemy sprite based on state variables; dying, attacking and hurt clips play once
         :return: None
         """
-        curr_time = pg.time.get_ticks()
-        if curr_time - self.last_frame_update > 100:
-            self.last_frame_update = curr_time
-            # Move left
-            if self.face_direction == -1 and not self.is_hurt:
-                self.current_frame = (self.current_frame + 1) % len(self.move_frames_l)
-                self.image = self.move_frames_l[self.current_frame]
-            # Move right
-            elif self.face_direction == 1 and not self.is_hurt:
-                self.current_frame = (self.current_frame + 1) % len(self.move_frames_r)
-                self.image = self.move_frames_r[self.current_frame]
-            # Hurt left
-            if self.face_direction == -1 and self.is_hurt:
-                self.curr_hurt_frame = (self.curr_hurt_frame + 1) % len(self.hurt_frames_l)
-                self.image = self.hurt_frames_l[self.current_frame]
-            # Hurt right
-            elif self.face_direction == 1 and self.is_hurt:
-                self.curr_hurt_frame = (self.curr_hurt_frame + 1) % len(self.hurt_frames_r)
-                self.image = self.hurt_frames_r[self.current_frame]
-            # Cancel hurt animation if played once
-            if self.curr_hurt_frame >= len(self.hurt_frames_l) - 1:
-                self.is_hurt = False
-                self.curr_hurt_frame = 0
-            # Attack left
-            if self.face_direction == -1 and self.is_attacking:
-                self.curr_attk_frame += 1
-                self.image = self.attack_frames_l[self.current_frame]
-            # Attack right
-            elif self.face_direction == 1 and self.is_attacking:
-                self.curr_attk_frame += 1
-                self.image = self.attack_frames_r[self.current_frame]
-            # Cancel attack animation if played once
-            if self.curr_attk_frame >= len(self.attack_frames_l) - 1:
-                self.is_attacking = False
-                self.curr_attk_frame = 0
-            # Die left
-            if self.face_direction == -1 and self.is_dying:
-                self.curr_die_frame += 1
-                self.image = self.die_frames_l[self.curr_die_frame]
-            # Die right
-            elif self.face_direction == 1 and self.is_dying:
-                self.curr_die_frame += 1
-                self.image = self.die_frames_r[self.curr_die_frame]
-            # Delete slime from memory if last die frame is reached
-            if self.curr_die_frame >= len(self.attack_frames_l) - 1:
-                # Increase player score
-                self.game.score += 100
-                self.kill()
+        if self.is_dying:
+            self.animator.play(self.die_clip, self.die)
+        elif self.is_attacking:
+            self.animator.play(self.attack_clip, self.end_attack)
+        elif self.is_hurt:
+            self.animator.play(self.hurt_clip, self.end_hurt)
+        else:
+            self.animator.play(self.move_clip)
+        self.animator.flip = self.face_direction == 1
+        self.image = self.animator.image
+
+    def end_hurt(self):
+        """
+        Cancel hurt animation once played
+        :return: None
+        """
+        self.is_hurt = False
+
+    def end_attack(self):
+        """
+        Cancel attack animation once played
+        :return: None
+        """
+        self.is_attacking = False
+
+    def die(self):
+        """
+        Delete slime from memory once the die animation has played
+        :return: None
+        """
+        # Increase player score
+        self.game.score += 100
+        self.kill()
+
+    def kill(self):
+        """
+        Remove from all groups and stop the animation
+        :return: None
+        """
+        self.animator.release()
+        super().kill()
 
     def cleanup(self):
         """
         Kill slime and update point if slime is below the screen
         :return: None
         """
-        if self.pos.y > SCREEN_HEIGHT + self.rect.h // 2:
+        if self.pos.y > self.game.camera.rect.bottom + self.rect.h // 2:
             # If slime is falling, this means player has knocked slime off
             if self.vel.y > 5 and self.health < self.maxhealth:
                 self.game.score += 100  # Player gets points for killing slime
@@ -242,23 +213,24 @@ class Enemy(pg.sprite.Sprite):
         Updates health if player hits slime and spawns bullet impact effect
         :return: None
         """
-        for proj in self.game.player_proj_sprites:
-            if self.hitbox.colliderect(proj.hitbox):
-                if proj.pos.x < self.pos.x:  # Hit from the left
-                    self.vel.x += 10
-                elif proj.pos.x > self.pos.x:  # Hit from the right
-                    self.vel.x -= 10
-                self.health -= 1
-                BulletImpact(self.game, proj.pos.x, proj.pos.y)
-                proj.kill()
-                self.is_hurt = True
+        projectiles = self.game.projectiles
+        for proj in projectiles.hits(self.hitbox, LAYER_PLAYER_PROJECTILES):
+            proj_x, proj_y = projectiles.x[proj], projectiles.y[proj]
+            if proj_x < self.pos.x:  # Hit from the left
+                self.vel.x += 10
+            elif proj_x > self.pos.x:  # Hit from the right
+                self.vel.x -= 10
+            self.health -= 1
+            self.game.particles.emit("bullet_impact", proj_x, proj_y)
+            projectiles.release(proj)
+            self.is_hurt = True
 
     def hit_player(self):
         """
         Tests for collision with player and decreases player health if colliding
         :return: None
         """
-        curr_time = pg.time.get_ticks()
+        curr_time = self.game.now
         # If player is touching slime
         if self.hitbox.colliderect(self.game.player.hitbox) and curr_time - self.last_attk_time > self.attk_rate:
             self.last_attk_time = curr_time
@@ -274,7 +246,7 @@ class Enemy(pg.sprite.Sprite):
             elif self.game.player.pos.x > self.pos.x:
                 # Knock player to the right
                 self.game.player.vel.x = 20
-            self.game.player.sound_fx.hurt.play()
+            self.game.sounds.play("hurt")
 
     def test_if_dead(self):
         """
@@ -0,0 +1,103 @@
+# Name: governor.py
+# Purpose: Lowers the quality of the game (background layers, FX, animation rate, internal resolution) when frames take
+#   too long to draw, and raises it again once there is time to spare
+# Version: 1.0
+# Date: 18 October 2026
+# Dependencies: logging, collections, and settings modules
+
+import logging
+from collections import deque
+from settings import *
+
+log = logging.getLogger(__name__)
+
+# Value of each quality knob at full quality
+FULL_QUALITY = {"layers": None, "max_fx": None, "animation_scale": 1, "resolution": None}
+
+
+class QualityGovernor:
+    def __init__(self, game):
+        """
+        Watches recent frame times and steps through QUALITY_LEVELS; steps down as soon as most frames are over
+        budget, but only steps up after a long stretch of frames well under budget so it doesn't flip back and forth
+        :param game: reference to game instance
+        """
+        self.game = game
+        self.level = 0
+        self.frame_times = deque(maxlen=GOVERNOR_WINDOW)  # Milliseconds
+        self.budget = 1000 / MAX_FPS
+        self.headroom_frames = 0  # Frames in a row with the median frame time under GOVERNOR_UP_LOAD
+        # The internal resolution is never raised above the one the game was started with
+        self.start_resolution = game.world_surface.get_size() if game.world_surface is not None else None
+        # Stats
+        self.changes = 0
+        self.lowest = 0  # Highest level (lowest quality) reached
+
+    def update(self, frame_time):
+        """
+        Record the time a frame took and change the quality level if needed
+        :param frame_time: milliseconds spent on the frame, not counting the wait for the next one
+        :return: None
+        """
+        self.frame_times.append(frame_time)
+        if len(self.frame_times) < GOVERNOR_WINDOW:
+            return
+        # The median ignores single slow frames (like the one after a menu)
+        median = sorted(self.frame_times)[GOVERNOR_WINDOW // 2]
+        if median > self.budget * GOVERNOR_DOWN_LOAD:
+            self.headroom_frames = 0
+            if self.level < len(QUALITY_LEVELS) - 1:
+                self.set_level(self.level + 1, median)
+        elif median < self.budget * GOVERNOR_UP_LOAD:
+            self.headroom_frames += 1
+            if self.headroom_frames >= GOVERNOR_UP_FRAMES and self.level > 0:
+                self.set_level(self.level - 1, median)
+        else:
+            self.headroom_frames = 0
+
+    def set_level(self, level, median):
+        """
+        Change the quality level and log it
+        :param level: index of QUALITY_LEVELS
+        :param median: median frame time that caused the change, in milliseconds
+        :return: None
+        """
+        log.info("Quality level %d -> %d (median frame time %.1f ms, budget %.1f ms): %s", self.level, level, median,
+                 self.budget, self.knobs(level))
+        self.level = level
+        self.apply()
+        # Judge the new level on its own frames
+        self.frame_times.clear()
+        self.headroom_frames = 0
+        self.changes += 1
+        self.lowest = max(self.lowest, level)
+
+    def knobs(self, level):
+        """
+        :param level: index of QUALITY_LEVELS
+        :return: dict with the value of every quality knob at that level
+        """
+        knobs = dict(FULL_QUALITY, **QUALITY_LEVELS[level])
+        if knobs["resolution"] is None or self.start_resolution and knobs["resolution"][0] > self.start_resolution[0]:
+            knobs["resolution"] = self.start_resolution
+        return knobs
+
+    def apply(self):
+        """
+        Set the quality knobs of the game to the current level
+        :return: None
+        """
+        knobs = self.knobs(self.level)
+        self.game.background.set_layer_count(knobs["layers"])
+        self.game.max_fx = knobs["max_fx"]
+        self.game.animation_scale = knobs["animation_scale"]
+        self.game.set_resolution(knobs["resolution"])
+        if self.game.renderer:
+            self.game.renderer.invalidate()
+
+    def report(self):
+        """
+        :return: string with the current quality level and how often it changed
+        """
+        return "QualityGovernor: level {} of {} ({} changes, lowest quality reached: level {})".format(
+            self.level, len(QUALITY_LEVELS) - 1, self.changes, self.lowest)
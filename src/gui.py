@@ -1,14 +1,217 @@
 # Name: gui.py
 # Purpose: Implements the GUI class (used for displaying graphics) and all GUI-related methods/attributes
-# Version: 2.1
+# Version: 2.2
 # Date: 5 June 2020
 # Author(s): Khoa Hoang, Adrienne Lhuc Estrella
-# Dependencies: pygame, sys, paths, and settings modules
+# Dependencies: pygame, sys, time, collections, paths, settings, and assets modules
 
 import pygame as pg
 import sys
+import time
+from collections import OrderedDict
 from paths import *
 from settings import *
+from assets import asset_cache
+
+
+class FontRegistry:
+    def __init__(self):
+        """
+        Keeps one Font per (face, size, bold) so that font files are opened and parsed once
+        """
+        self.fonts = {}
+
+    def get(self, face, size, bold=False):
+        """
+        :param face: font file path (ex: from pg.font.match_font()); None for pygame's default font
+        :param size: size of font
+        :param bold: True for bold font
+        :return: pg.font.Font
+        """
+        key = (face, size, bold)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pg.font.Font(face, size)
+            font.set_bold(bold)
+            self.fonts[key] = font
+        return font
+
+
+class TextCache:
+    def __init__(self, fonts, max_entries=TEXT_CACHE_ENTRIES, max_bytes=TEXT_CACHE_BYTES):
+        """
+        Least recently used cache of rendered text, so drawing text that didn't change is a single blit
+        :param fonts: FontRegistry to get fonts from
+        :param max_entries: most surfaces to keep
+        :param max_bytes: most bytes of pixels to keep
+        """
+        self.fonts = fonts
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.surfaces = OrderedDict()  # key -> rendered surface; oldest first
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, face, text, size, color, antialias=True, bold=False):
+        """
+        Get rendered text from the cache or render it
+        :param face: font file path; None for pygame's default font
+        :param text: string to render
+        :param size: size of font
+        :param color: color of text
+        :param antialias: True for smooth edges
+        :param bold: True for bold text
+        :return: pygame Surface (shared, so never draw onto it)
+        """
+        key = (face, text, size, tuple(color), antialias, bold)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = self.fonts.get(face, size, bold).render(text, antialias, color)
+        self.surfaces[key] = surface
+        self.bytes += surface.get_pitch() * surface.get_height()
+        while len(self.surfaces) > self.max_entries or self.bytes > self.max_bytes:
+            _, oldest = self.surfaces.popitem(last=False)
+            self.bytes -= oldest.get_pitch() * oldest.get_height()
+        return surface
+
+    def report(self):
+        """
+        :return: string with size of cache and hit/miss counters
+        """
+        return "TextCache: {} surfaces ({} KB), {} hits, {} misses".format(
+            len(self.surfaces), self.bytes // 1024, self.hits, self.misses)
+
+
+# Characters in every glyph atlas: digits, the decimal point of health counters (health drops by .5) and the characters
+#   of counter labels
+GLYPHS = "0123456789.-:/ Score"
+
+
+class GlyphAtlas:
+    def __init__(self, font, color, chars=GLYPHS):
+        """
+        Bitmap font for counters: every glyph is rendered once into one surface, so drawing a number is a single
+        blits() call and costs the same however often the number changes (kerning is ignored)
+        :param font: pg.font.Font to render glyphs with
+        :param color: color of glyphs
+        :param chars: characters to render
+        """
+        glyphs = [(char, font.render(char, True, color)) for char in sorted(set(chars))]
+        self.height = max(glyph.get_height() for _, glyph in glyphs)
+        self.surface = pg.Surface((sum(glyph.get_width() for _, glyph in glyphs), self.height), pg.SRCALPHA)
+        self.areas = {}  # char -> rect of glyph in surface
+        x = 0
+        for char, glyph in glyphs:
+            # BLEND_RGBA_MAX onto transparent black copies the pixels without blending them
+            self.surface.blit(glyph, (x, 0), special_flags=pg.BLEND_RGBA_MAX)
+            self.areas[char] = pg.Rect(x, 0, glyph.get_width(), glyph.get_height())
+            x += glyph.get_width()
+
+    def can_draw(self, text):
+        """
+        :param text: string
+        :return: True if every character of text is in the atlas
+        """
+        return all(char in self.areas for char in text)
+
+    def size(self, text):
+        """
+        :param text: string of characters in the atlas
+        :return: (w, h) of text
+        """
+        return sum(self.areas[char].w for char in text), self.height
+
+    def draw(self, surface, text, pos):
+        """
+        Draw text with one blits() call
+        :param surface: surface to draw on
+        :param text: string of characters in the atlas
+        :param pos: topleft of text
+        :return: None
+        """
+        x, y = pos
+        sequence = []
+        for char in text:
+            area = self.areas[char]
+            if char != " ":
+                sequence.append((self.surface, (x, y), area))
+            x += area.w
+        surface.blits(sequence, doreturn=False)
+
+
+# Shared by the whole game
+fonts = FontRegistry()
+text_cache = TextCache(fonts)
+
+# Button actions besides going to another menu
+PLAY = "play"
+QUIT = "quit"
+
+# Everything of each menu that never changes; drawn once by GUI.build_menu()
+#   texts: draw_text() arguments
+#   buttons: ((x, y, w, h), color, outline color, text, action); action is the name of the menu to go to, PLAY or QUIT
+#   pictures: (path, topleft) of 120x160 pictures
+MENUS = {
+    "start menu": {
+        "background": background_start,
+        "fill": (255, 255, 255),
+        "texts": [(SCREEN_TITLE, 52, (255, 255, 255), (SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2), True),
+                  ("Use WASD to move!", 32, (0, 0, 0), (SCREEN_WIDTH / 2, SCREEN_HEIGHT * 3 / 4))],
+        "buttons": [((350, SCREEN_HEIGHT * 6 / 7, 110, 40), (0, 200, 0), (0, 0, 0), "START", PLAY),
+                    ((500, SCREEN_HEIGHT * 6 / 7, 110, 40), (30, 60, 255), (0, 0, 0), "SCORES", "leaderboard"),
+                    ((650, SCREEN_HEIGHT * 6 / 7, 110, 40), (255, 100, 0), (0, 0, 0), "ABOUT", "about menu"),
+                    ((800, SCREEN_HEIGHT * 6 / 7, 110, 40), (255, 0, 30), (0, 0, 0), "QUIT", QUIT)],
+    },
+    "game over menu": {
+        "background": background_over,
+        "fill": (255, 255, 255),
+        "texts": [("GAME OVER", 68, (255, 255, 255), (SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2), True, (0, 0, 0))],
+        "buttons": [((450, SCREEN_HEIGHT * 6 / 7, 110, 50), (0, 200, 0), (0, 0, 0), "PLAY AGAIN", PLAY),
+                    ((580, SCREEN_HEIGHT * 6 / 7, 110, 50), (255, 200, 0), (0, 0, 0), "MAIN MENU", "start menu"),
+                    ((710, SCREEN_HEIGHT * 6 / 7, 110, 50), (255, 0, 30), (0, 0, 0), "QUIT", QUIT)],
+    },
+    "pause menu": {
+        "background": background_pause,
+        "fill": (0, 0, 0),
+        "texts": [("PAUSED", 78, (255, 255, 255), (SCREEN_WIDTH / 2, SCREEN_HEIGHT / 6), True, (0, 0, 0))],
+        "buttons": [((520, SCREEN_HEIGHT * 6 / 7, 110, 50), (255, 200, 0), (0, 0, 0), "RESUME", PLAY),
+                    ((658, SCREEN_HEIGHT * 6 / 7, 110, 50), (255, 0, 30), (0, 0, 0), "QUIT", QUIT)],
+    },
+    "leaderboard": {
+        "background": background_score,
+        "fill": (255, 255, 255),
+        "texts": [("HIGH SCORE", 52, (255, 255, 255), (SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2), True, (0, 0, 0))],
+        "buttons": [((567, SCREEN_HEIGHT * 6 / 7, 140, 50), (0, 0, 0), None, "BACK", "start menu")],
+    },
+    "about menu": {
+        "background": background_about,
+        "fill": (255, 255, 255),
+        "texts": [("ABOUT", 52, (255, 255, 255), (SCREEN_WIDTH / 2, SCREEN_HEIGHT / 7), True, (0, 0, 0)),
+                  ("Our game is a roguelike 2D platformer where the player tries to kill the AI. This "
+                   "is a game where the player is the boss and the AI adapts to their patterns.", 19,
+                   (0, 0, 0), (SCREEN_WIDTH / 2, SCREEN_HEIGHT / 3)),
+                  ("It will have pixel/sprite graphics and will be programmed primarily in Python. The "
+                   "defining feature of this game entails that the AI learns your moves", 19,
+                   (0, 0, 0), (SCREEN_WIDTH / 2, 263)),
+                  ("and eventually either you improve or let the AI get to you.Each time the AI improves,"
+                   "we give the player a chance by improving the player’s statistics.", 19,
+                   (0, 0, 0), (SCREEN_WIDTH / 2, 285)),
+                  ("Khoa Hoang", 25, (0, 0, 0), (200, SCREEN_HEIGHT / 2)),
+                  ("Matthew Innaurato", 25, (0, 0, 0), (500, SCREEN_HEIGHT / 2)),
+                  ("Pratham Kwatra", 25, (0, 0, 0), (750, SCREEN_HEIGHT / 2)),
+                  ("Adrienne Lhuc Estrella", 25, (0, 0, 0), (1050, SCREEN_HEIGHT / 2))],
+        "buttons": [((580, SCREEN_HEIGHT * 6 / 7, 110, 40), (0, 0, 0), None, "BACK", "start menu")],
+        "pictures": [(adrienne_path, (990, 400)),
+                     (khoa_path, (140, 400)),
+                     (matt_path, (440, 400)),
+                     (pk_path, (685, 400))],
+    },
+}
 
 
 class GUI:
@@ -20,9 +223,19 @@ class GUI:
         '''
         self.game = game
         self.font_name = pg.font.match_font(FONT_NAME) # Used so all fonts in the game renders as the same
+        self.glyph_atlases = {} # (size, color) -> GlyphAtlas used by draw_counter()
+        self.health_icon = asset_cache.load(health_path, size=(22, 22)) # Loaded once for the HUD
+        self.ammo_icon = asset_cache.load(ammo_path, size=(22, 22))
+        self.menu_layers = {} # Menu name -> surface with everything of the menu that never changes
+        self.menu_info = {"game over menu": self.draw_game_over_info, # Menu name -> draws the parts that change
+                          "pause menu": self.draw_pause_info,
+                          "leaderboard": self.draw_leaderboard_info}
+        # Stats
+        self.menu_switches = 0
+        self.menu_switch_time = 0
 
 
-    def draw_text(self, text, size, color, pos=(0, 0), design = False, design_color=(0, 0, 0)):
+    def draw_text(self, text, size, color, pos=(0, 0), design = False, design_color=(0, 0, 0), surface=None):
         '''
         Used to display text onto the game screen
         :param text: the text you want to display on the screen (must be type string)
@@ -32,18 +245,46 @@ class GUI:
         this position is the midtop of the text's rectangle, default to the top left of the screen
         :param design: creates a border around the text, True = border or False = no border, default to False
         :param design_color: the color of the border (must be a rgb value), default to black
-        :return: None
+        :param surface: the surface to draw on, default to the game screen
+        :return: rect of the surface that was drawn on
         '''
-        font = pg.font.Font(self.font_name, size)
-        text_surface = font.render(text, True, color)
+        if surface is None:
+            surface = self.game.screen
+        text_surface = text_cache.render(self.font_name, text, size, color)
         text_rect = text_surface.get_rect(midtop=pos)
         if design: # Creates the border 
-            pg.draw.rect(self.game.screen, design_color, (text_rect[0]-10, text_rect[1]-10, 
-                            text_rect[2]+18, text_rect[3]+20))
-        self.game.screen.blit(text_surface, text_rect)
+            border = pg.draw.rect(surface, design_color, (text_rect[0]-10, text_rect[1]-10, 
+                                  text_rect[2]+18, text_rect[3]+20))
+            return border.union(surface.blit(text_surface, text_rect))
+        return surface.blit(text_surface, text_rect)
 
 
-    def draw_button(self, x, y, w, h, color, text_size, text_color, outline=None, text=""):
+    def draw_counter(self, text, size, color, pos=(0, 0), surface=None):
+        '''
+        Used to display text that changes often (like the score) with a glyph atlas instead of rendering it
+        :param text: the text you want to display; characters not in GLYPHS make it fall back to draw_text()
+        :param size: the size of the text
+        :param color: the color of the text
+        :param pos: the midtop position of the text's rectangle
+        :param surface: the surface to draw on, default to the game screen
+        :return: rect of the surface that was drawn on
+        '''
+        if surface is None:
+            surface = self.game.screen
+        key = (size, tuple(color))
+        atlas = self.glyph_atlases.get(key)
+        if atlas is None:
+            atlas = GlyphAtlas(fonts.get(self.font_name, size), color)
+            self.glyph_atlases[key] = atlas
+        if not atlas.can_draw(text):
+            return self.draw_text(text, size, color, pos, surface=surface)
+        text_rect = pg.Rect((0, 0), atlas.size(text))
+        text_rect.midtop = pos
+        atlas.draw(surface, text, text_rect.topleft)
+        return text_rect.clip(surface.get_rect())
+
+
+    def draw_button(self, x, y, w, h, color, text_size, text_color, outline=None, text="", surface=None):
         '''
         Used to create a button element onto the game screen
         :param x: a type integer used as the x coordinate position of the button's top right rectangle
@@ -55,18 +296,18 @@ class GUI:
         :param text_color: a rgb value, the color of th text inside the button
         :param outline: a rgb value default is None, color of the button's border
         :param text: a type string, the text inside the button
+        :param surface: the surface to draw on, default to the game screen
         :return: None
         '''
-        buttonRect = pg.draw.rect(self.game.screen, color, (x, y, w, h), 0)
+        if surface is None:
+            surface = self.game.screen
+        buttonRect = pg.draw.rect(surface, color, (x, y, w, h), 0)
         if outline: # Creates the border
-            pg.draw.rect(self.game.screen, outline, (buttonRect), 3)
+            pg.draw.rect(surface, outline, (buttonRect), 3)
         if text: # Creates the text
-            pg.font.init()
-            font = pg.font.Font(self.font_name, text_size)
-            font.set_bold(True)
-            text = font.render(text, 1, text_color)
-            self.game.screen.blit(text, (x + (w / 2 - text.get_width() / 2),
-                                         y + (h / 2 - text.get_height() / 2)))
+            text = text_cache.render(self.font_name, text, text_size, text_color, bold=True)
+            surface.blit(text, (x + (w / 2 - text.get_width() / 2),
+                                y + (h / 2 - text.get_height() / 2)))
 
 
     def button_input(self, mouse_pos, x, y, w, h):
@@ -84,235 +325,238 @@ class GUI:
         return x < mouse_pos[0] < x + w and y < mouse_pos[1] < y + h # this expression creates a border for the button
 
 
+    def run_menu(self, menu):
+        '''
+        Shows menus until the player starts playing; buttons switch between menus in this loop (no recursion), and each
+        menu is drawn once into a cached layer so showing it again is a single blit
+        :param menu: a type string, the first menu to show (key of MENUS)
+        :return: None
+        '''
+        while menu != PLAY:
+            start = time.perf_counter()
+            self.show_menu(menu)
+            self.menu_switches += 1
+            self.menu_switch_time += time.perf_counter() - start
+            menu = self.wait_for_click(menu)
+
+
+    def show_menu(self, menu):
+        '''
+        Displays a menu onto the screen from its cached layer, then the parts of it that can change (like the score)
+        :param menu: a type string, the menu to show (key of MENUS)
+        :return: None
+        '''
+        layer = self.menu_layers.get(menu)
+        if layer is None:
+            layer = self.build_menu(menu)
+            self.menu_layers[menu] = layer
+        self.game.screen.blit(layer, (0, 0))
+        if menu in self.menu_info:
+            self.menu_info[menu]()
+        pg.display.update()
+
+
+    def build_menu(self, menu):
+        '''
+        Draws everything of a menu that never changes (background, text, pictures and buttons) into one surface
+        :param menu: a type string, the menu to build (key of MENUS)
+        :return: pygame Surface the size of the screen
+        '''
+        spec = MENUS[menu]
+        layer = pg.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+        layer.fill(spec["fill"])
+        background = pg.transform.scale(pg.image.load(spec["background"]).convert_alpha(), (SCREEN_WIDTH, SCREEN_HEIGHT))
+        layer.blit(background, (0, 0))
+        for text in spec.get("texts", ()):
+            self.draw_text(*text, surface=layer)
+        for rect, color, outline, text, _ in spec["buttons"]:
+            self.draw_button(*rect, color, 14, (255, 255, 255), outline, text, surface=layer)
+        for path, pos in spec.get("pictures", ()):
+            layer.blit(pg.transform.scale(pg.image.load(path).convert(), (120, 160)), pos)
+        return layer
+
+
     def wait_for_click(self, menu):
         '''
         Used to detect if a button is clicked and triggers the buttons specific event
         :param menu: a type string, the menu type the button resides in
-        :return: None
+        :return: the clicked button's action; the next menu to show or PLAY
         '''
-        is_waiting = True
-        while is_waiting:
-            self.game.clock.tick(10)
-            for event in pg.event.get():
-                mouse_pos = pg.mouse.get_pos()
+        buttons = MENUS[menu]["buttons"]
+        while True:
+            if menu == "start menu":
+                self.draw_loading_bar()
+            # Sleeps until there is an event, but wakes up to keep the loading bar moving
+            for event in [pg.event.wait(MENU_REFRESH_MS)] + pg.event.get():
                 if event.type == pg.QUIT:
-                    is_waiting = False
-                    self.game.is_playing = False
-                    self.game.is_running = False
-                    sys.exit(0)
+                    self.quit()
                 if event.type == pg.MOUSEBUTTONUP:
-                    if menu == "start menu":
-                        if self.button_input(mouse_pos, 350, SCREEN_HEIGHT*6/7, 110, 40): # START BUTTON
-                            # Starts the game
-                            is_waiting = False
-                        elif self.button_input(mouse_pos, 500, SCREEN_HEIGHT*6/7, 110, 40): # SCORE BUTTON
-                            # Brings you to the score menu
-                            self.draw_leaderboard_menu()
-                            is_waiting = False
-                        elif self.button_input(mouse_pos, 650, SCREEN_HEIGHT*6/7, 110, 40): # ABOUT BUTTON
-                            # Brings you to the about menu
-                            self.draw_about_menu()
-                            is_waiting = False
-                        elif self.button_input(mouse_pos, 800, SCREEN_HEIGHT*6/7, 110, 40): # QUIT BUTTON
-                            # Quits the game
-                            is_waiting = False
-                            self.game.is_playing = False
-                            self.game.is_running = False
-                            sys.exit()
-                    elif menu == "leaderboard":
-                        if self.button_input(mouse_pos, 567, SCREEN_HEIGHT*6/7, 140, 50): # BACK BUTTON
-                            # Brings back to main menu
-                            self.draw_start_menu()
-                            is_waiting = False
-                    elif menu == "about menu":
-                        if self.button_input(mouse_pos, 567, SCREEN_HEIGHT*6/7, 110, 40): # BACK BUTTON
-                            # Brings back to main menu
-                            self.draw_start_menu()
-                            is_waiting = False
-                    elif menu == "pause menu":
-                        if self.button_input(mouse_pos, 527, SCREEN_HEIGHT*6/7, 110, 50): # RESUME BUTTON
-                            # Exits the pause menu and unpauses the game
-                            is_waiting = False
-                        elif self.button_input(mouse_pos, 665, SCREEN_HEIGHT*6/7, 110, 50): # QUIT BUTTON
-                            # Quits the game
-                            is_waiting = False
-                            self.game.is_playing = False
-                            self.game.is_running = False
-                            sys.exit()
-                    elif menu == "game over menu":
-                        if self.button_input(mouse_pos, 450, SCREEN_HEIGHT*6/7, 110, 50): # PLAY AGAIN BUTTON
-                            # Starts a new game
-                            is_waiting = False
-                        elif self.button_input(mouse_pos, 580, SCREEN_HEIGHT*6/7, 110, 50): # MAIN MENU BUTTON
-                            # Brings you back to he main menu
-                            self.draw_start_menu()
-                            is_waiting = False
-                        elif self.button_input(mouse_pos, 710, SCREEN_HEIGHT*6/7, 110, 50): # QUIT BUTTON
-                            # Quits the game
-                            is_waiting = False
-                            self.game.is_playing = False
-                            self.game.is_running = False
-                            sys.exit()
-
-
-    def draw_start_menu(self):
-        '''
-        Displays the start menu onto the screen
+                    for (x, y, w, h), _, _, _, action in buttons:
+                        if self.button_input(event.pos, x, y, w, h):
+                            if action == QUIT:
+                                self.quit()
+                            return action
+
+
+    def quit(self):
+        '''
+        Quits the game from a menu
         :return: None
         '''
-        self.game.screen.fill((255, 255, 255))
-        background = pg.transform.scale(pg.image.load(background_start).convert_alpha(), (SCREEN_WIDTH, SCREEN_HEIGHT)) # Background image
-        self.game.screen.blit(background, (0, 0))
-        self.draw_text(SCREEN_TITLE, 52, (255, 255, 255), (SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2), True)
-        # Buttons
-        self.draw_button(350, SCREEN_HEIGHT * 6 / 7, 110, 40, (0, 200, 0), 14, (255, 255, 255), (0, 0, 0), text="START")
-        self.draw_button(500, SCREEN_HEIGHT * 6 / 7, 110, 40, (30, 60, 255), 14, (255, 255, 255), (0, 0, 0), text="SCORES")
-        self.draw_button(650, SCREEN_HEIGHT * 6 / 7, 110, 40, (255, 100, 0), 14, (255, 255, 255), (0, 0, 0), text="ABOUT")
-        self.draw_button(800, SCREEN_HEIGHT * 6 / 7, 110, 40, (255, 0, 30), 14, (255, 255, 255), (0, 0, 0), text="QUIT")
-        self.draw_text("Use WASD to move!", 32, (0, 0, 0), (SCREEN_WIDTH / 2, SCREEN_HEIGHT * 3 / 4))
-        pg.display.update()
-        self.wait_for_click('start menu')
+        self.game.is_playing = False
+        self.game.is_running = False
+        sys.exit(0)
 
 
-    def draw_game_over_menu(self):
+    def draw_loading_bar(self):
         '''
-        Displays the game over menu onto the screen
+        Displays how much of the gameplay assets the preloader has loaded at the bottom of the start menu
         :return: None
         '''
-        self.game.screen.fill((255, 255, 255))
-        background = pg.transform.scale(pg.image.load(background_over).convert_alpha(), (SCREEN_WIDTH, SCREEN_HEIGHT)) # Background image
-        self.game.screen.blit(background, (0, 0))
-        self.draw_text("GAME OVER", 68, (255, 255, 255), (SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2), True, (0, 0, 0))
-        self.draw_text("Score: {}".format(self.game.score), 22, (255, 255, 255),
-                       (SCREEN_WIDTH / 2, SCREEN_HEIGHT * 3 / 4)) # The score the player ended the game with
-        # Buttons
-        self.draw_button(450, SCREEN_HEIGHT * 6 / 7, 110, 50, (0, 200, 0), 14, (255, 255, 255), (0, 0, 0), text="PLAY AGAIN")
-        self.draw_button(580, SCREEN_HEIGHT * 6 / 7, 110, 50, (255, 200, 0), 14, (255, 255, 255), (0, 0 ,0), text="MAIN MENU")
-        self.draw_button(710, SCREEN_HEIGHT * 6 / 7, 110, 50, (255, 0, 30), 14, (255, 255, 255), (0, 0, 0), text="QUIT")
+        bar = pg.Rect(SCREEN_WIDTH / 2 - 150, SCREEN_HEIGHT - 30, 300, 10)
+        pg.draw.rect(self.game.screen, (255, 255, 255), bar, 1)
+        pg.draw.rect(self.game.screen, (255, 255, 255), (bar.x, bar.y, bar.w * self.game.preloader.progress, bar.h))
+        pg.display.update(bar)
+
+
+    def draw_game_over_info(self):
         '''
-        Displays the "High score" text onto the screen if the player's round score is higher than their hih score
+        Displays the score the player ended the game with on the game over menu, and the "NEW HIGH SCORE" text if
+        it is higher than the high score
+        :return: None
         '''
+        self.draw_text("Score: {}".format(self.game.score), 22, (255, 255, 255),
+                       (SCREEN_WIDTH / 2, SCREEN_HEIGHT * 3 / 4)) # The score the player ended the game with
         if self.game.score > self.game.high_score:
             self.game.high_score = self.game.score
             self.draw_text("NEW HIGH SCORE", 38, (255, 255, 255), (SCREEN_WIDTH / 2, 40), True, (0, 0, 0))
             with open(high_score_path, "w") as file:
                 file.write(str(self.game.high_score))
-        pg.display.update()
-        self.wait_for_click('game over menu')
 
 
-    def draw_pause_menu(self):
+    def draw_pause_info(self):
         '''
-        Displays the pause menu onto the screen
+        Displays the high score and the player's current score on the pause menu
         :return: None
         '''
-        with open(high_score_path, "r") as file: # Loads the players highest score to be displayed onto the screen
-            try:
-                self.game.high_score = int(file.read())
-            except ValueError:
-                self.game.high_score = 0
-        self.game.screen.fill((0, 0, 0))
-        background = pg.transform.scale(pg.image.load(background_pause).convert_alpha(), (SCREEN_WIDTH, SCREEN_HEIGHT)) # Background image
-        self.game.screen.blit(background, (0, 0))
-        self.draw_text("PAUSED", 78, (255, 255, 255), (SCREEN_WIDTH / 2, SCREEN_HEIGHT / 6), True, (0, 0, 0))
         self.draw_text(f"HIGH SCORE: {self.game.high_score}", 28, (255, 255, 255),
                        (SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2))
         self.draw_text(f"YOUR SCORE: {self.game.score}", 22, (255, 255, 255),
                        (SCREEN_WIDTH / 2, 530)) # The player's current score
-        # Buttons
-        self.draw_button(520, SCREEN_HEIGHT * 6 / 7, 110, 50, (255, 200, 0), 14, (255, 255, 255), (0, 0, 0), text="RESUME")
-        self.draw_button(658, SCREEN_HEIGHT * 6 / 7, 110, 50, (255, 0, 30), 14, (255, 255, 255), (0, 0, 0), text="QUIT")
-        pg.display.update()
-        self.wait_for_click('pause menu')
 
 
-    def draw_leaderboard_menu(self):
+    def draw_leaderboard_info(self):
         '''
-        Displays the score menu onto the screen
+        Displays the high score on the score menu
         :return: None
         '''
-        with open(high_score_path, "r") as file: # Loads the player's high score to be displayed onto the screen
-            try:
-                self.game.high_score = int(file.read())
-            except ValueError:
-                self.game.high_score = 0
-        self.game.screen.fill((255, 255, 255))
-        background = pg.transform.scale(pg.image.load(background_score).convert_alpha(), (SCREEN_WIDTH, SCREEN_HEIGHT)) # Background image
-        self.game.screen.blit(background, (0, 0))
-        self.draw_text("HIGH SCORE", 52, (255, 255, 255), (SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2), True, (0, 0, 0))
         self.draw_text("High score: {}".format(self.game.high_score), 22, (255, 255, 255),
                        (SCREEN_WIDTH / 2, SCREEN_HEIGHT * 3 / 4))
-        # Buttons
-        self.draw_button(567, SCREEN_HEIGHT * 6 / 7, 140, 50, (0, 0, 0), 14, (255, 255, 255), text="BACK")
-        pg.display.update()
-        self.wait_for_click('leaderboard')
 
 
-    def draw_about_menu(self):
+    def menu_report(self):
         '''
-        Displays the about menu onto the screen
-        :return: None
+        :return: string with how long it took to show a menu
         '''
-        self.game.screen.fill((255, 255, 255))
-        background = pg.transform.scale(pg.image.load(background_about).convert_alpha(), (SCREEN_WIDTH, SCREEN_HEIGHT)) # Background Image
-        self.game.screen.blit(background, (0, 0))
-        self.draw_text("ABOUT", 52, (255, 255, 255), (SCREEN_WIDTH / 2, SCREEN_HEIGHT / 7), True, (0, 0, 0))
-        self.draw_text("Our game is a roguelike 2D platformer where the player tries to kill the AI. This "
-                       "is a game where the player is the boss and the AI adapts to their patterns.", 19,
-                       (0, 0, 0), (SCREEN_WIDTH / 2, SCREEN_HEIGHT / 3))
-        self.draw_text("It will have pixel/sprite graphics and will be programmed primarily in Python. The "
-                       "defining feature of this game entails that the AI learns your moves",
-                       19,
-                       (0, 0, 0), (SCREEN_WIDTH / 2, 263))
-        self.draw_text("and eventually either you improve or let the AI get to you.Each time the AI improves,"
-                       "we give the player a chance by improving the player’s statistics.", 19,
-                       (0, 0, 0), (SCREEN_WIDTH / 2, 285))
-        self.draw_text("Khoa Hoang", 25, (0, 0, 0), (200, SCREEN_HEIGHT / 2))
-        self.draw_text("Matthew Innaurato", 25, (0, 0, 0), (500, SCREEN_HEIGHT / 2))
-        self.draw_text("Pratham Kwatra", 25, (0, 0, 0), (750, SCREEN_HEIGHT / 2))
-        self.draw_text("Adrienne Lhuc Estrella", 25, (0, 0, 0), (1050, SCREEN_HEIGHT / 2))
-        # Buttons
-        self.draw_button(580, SCREEN_HEIGHT * 6 / 7, 110, 40, (0, 0, 0), 14, (255, 255, 255), text="BACK")
-        adrienne = pg.transform.scale(pg.image.load(adrienne_path).convert(), (120, 160)) # Picture of Adrienne
-        self.game.screen.blit(adrienne, (990, 400))
-        khoa = pg.transform.scale(pg.image.load(khoa_path).convert(), (120, 160)) # Picture of Khoa
-        self.game.screen.blit(khoa, (140, 400))
-        matt = pg.transform.scale(pg.image.load(matt_path).convert(), (120, 160)) # Picture of Matt
-        self.game.screen.blit(matt, (440, 400))
-        pk = pg.transform.rotate(pg.transform.scale(pg.image.load(pk_path).convert(), (120, 160)), 360) # Picture of Matt
-        self.game.screen.blit(pk, (685, 400))
-        pg.display.update()
-        self.wait_for_click('about menu')
+        if not self.menu_switches:
+            return "Menus: none shown"
+        return "Menus: {} shown, {:.2f} ms on average ({} layers cached)".format(
+            self.menu_switches, self.menu_switch_time / self.menu_switches * 1000, len(self.menu_layers))
 
 
-    def draw_health_bar(self):
+    def draw_health_bar(self, surface=None):
         '''
         Displays the Player's health bar onto the screen and tracks the Player's health
-        :return: None
+        :param surface: the surface to draw on, default to the game screen
+        :return: rect of the surface that was drawn on
         '''
-        health = pg.transform.scale(pg.image.load(health_path).convert_alpha(), (22,22)) # Health icon
-        self.game.screen.blit(health, (35, 40))
-        pg.draw.rect(self.game.screen, (255, 0, 0), (60, 43, 100, 16))
-        pg.draw.rect(self.game.screen, (0, 255, 0), (60, 43, 100 - (10 * (10 - self.game.player.health)), 16))
+        if surface is None:
+            surface = self.game.screen
+        icon_rect = surface.blit(self.health_icon, (35, 40))
+        bar_rect = pg.draw.rect(surface, (255, 0, 0), (60, 43, 100, 16))
+        pg.draw.rect(surface, (0, 255, 0), (60, 43, 100 - (10 * (10 - self.game.player.health)), 16))
+        counter_rect = self.draw_counter(str(self.game.player.health), 18, (255, 255, 255), (180, 43), surface=surface)
+        return icon_rect.union(bar_rect).union(counter_rect)
 
 
-    def draw_ammo_bar(self):
+    def draw_ammo_bar(self, surface=None):
         '''
         Displays the Player's ammo bar onto the screen and tracks the Player's ammo
-        :return: None
+        :param surface: the surface to draw on, default to the game screen
+        :return: rect of the surface that was drawn on
         '''
-        ammo = pg.transform.scale(pg.image.load(ammo_path).convert_alpha(), (22,22)) # Ammo icon
-        self.game.screen.blit(ammo, (35, 73))
-        pg.draw.rect(self.game.screen, (255, 0, 0), (60, 74, 100, 16))
-        pg.draw.rect(self.game.screen, (0, 255, 0), (60, 74, 100 - (10 * (10 - self.game.player.gun.ammo)), 16))
+        if surface is None:
+            surface = self.game.screen
+        icon_rect = surface.blit(self.ammo_icon, (35, 73))
+        bar_rect = pg.draw.rect(surface, (255, 0, 0), (60, 74, 100, 16))
+        pg.draw.rect(surface, (0, 255, 0), (60, 74, 100 - (10 * (10 - self.game.player.gun.ammo)), 16))
+        counter_rect = self.draw_counter(str(self.game.player.gun.ammo), 18, (255, 255, 255), (180, 74), surface=surface)
+        return icon_rect.union(bar_rect).union(counter_rect)
 
 
-    def boss_health_bar(self):
+    def boss_health_bar(self, surface=None):
         '''
         Displays the Boss's health bar onto the screen and tracks the Boss's health
-        :return: None
+        :param surface: the surface to draw on, default to the game screen
+        :return: rect of the surface that was drawn on
         '''
-        health = pg.transform.scale(pg.image.load(health_path).convert_alpha(), (22,22)) #Health icon
-        self.game.screen.blit(health, (1110, 40))
-        pg.draw.rect(self.game.screen, (255, 0, 0), (1135, 43, 100, 16))
-        pg.draw.rect(self.game.screen, (0, 255, 0), (1135, 43, 100 - (10 * (10 - self.game.boss.health)), 16))
+        if surface is None:
+            surface = self.game.screen
+        icon_rect = surface.blit(self.health_icon, (1110, 40))
+        bar_rect = pg.draw.rect(surface, (255, 0, 0), (1135, 43, 100, 16))
+        pg.draw.rect(surface, (0, 255, 0), (1135, 43, 100 - (10 * (10 - self.game.boss.health)), 16))
+        counter_rect = self.draw_counter(str(self.game.boss.health), 18, (255, 255, 255), (1255, 43), surface=surface)
+        return icon_rect.union(bar_rect).union(counter_rect)
+
+
+class HUD:
+    def __init__(self, gui):
+        """
+        Score, health and ammo drawn on top of the game; rendered into a cached surface only when one of the values
+        changes, so most frames it is a few blits from the cache
+        :param gui: GUI instance to draw the HUD with
+        """
+        self.gui = gui
+        self.game = gui.game
+        self.surface = pg.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pg.SRCALPHA)  # Transparent except for the HUD
+        self.rects = []  # Parts of self.surface with the HUD on them
+        self.values = None  # Values the cached surface was rendered with
+        # Stats
+        self.frames = 0
+        self.renders = 0
+
+    def render(self):
+        """
+        Draw the HUD into the cached surface
+        :return: None
+        """
+        for rect in self.rects:
+            self.surface.fill((0, 0, 0, 0), rect)
+        white = (255, 255, 255)
+        self.rects = [self.gui.draw_counter("Score: {}".format(self.game.score), 22, white, (SCREEN_WIDTH/2, 15),
+                                            surface=self.surface),
+                      self.gui.draw_text("Player", 22, white, (92, 15), surface=self.surface),
+                      self.gui.draw_text("Boss", 22, white, (1160, 15), surface=self.surface),
+                      self.gui.draw_health_bar(self.surface),
+                      self.gui.draw_ammo_bar(self.surface),
+                      self.gui.boss_health_bar(self.surface)]
+        self.renders += 1
+
+    def draw(self):
+        """
+        Blit the HUD onto the screen, rendering it again first if the values on it changed
+        :return: list of rects of the screen that were drawn on
+        """
+        values = (self.game.score, self.game.player.health, self.game.player.gun.ammo, self.game.boss.health)
+        if values != self.values:
+            self.values = values
+            self.render()
+        self.game.screen.blits([(self.surface, rect, rect) for rect in self.rects], doreturn=False)
+        self.frames += 1
+        return list(self.rects)
+
+    def report(self):
+        """
+        :return: string with how often the HUD had to be rendered
+        """
+        return "HUD: rendered {} times in {} frames".format(self.renders, self.frames)
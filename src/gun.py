@@ -1,69 +1,64 @@
 # Name: gun.py
 # Purpose: Implements the gun's visible effects and handles all gun related actions/attributes/graphics
-# Version: 1.7
+# Version: 1.8
 # Date: 5 June 2020
 # Author(s): Khoa Hoang
-# Dependencies: pygame, settings, paths, and projectiles modules
+# Dependencies: pygame, settings, paths, animation, and projectiles modules
 
 import pygame as pg
 from settings import *
 from paths import *
+from animation import Animator, clip
 from projectiles import *
 
 
-# Unlike other FX classes, this one sticks to the "gun"
-class GunFX(pg.sprite.Sprite):
+# Unlike the effects in particles.py, this one sticks to the "gun"
+class GunFX(pg.sprite.DirtySprite):
+    _layer = LAYER_GUNS
+
     def __init__(self, game, gun):
         """
-        Fire effect that is attached to the "gun" (Not a child of FX class because animation loops
+        Fire effect that is attached to the "gun" (Not a particle because animation loops
         :param game: reference to game instance
         :param gun: gun sprite object
         """
         super().__init__()
+        self.dirty = 2
         self.game = game
         self.gun = gun
 
         self.game.gun_sprites.add(self)
         self.game.all_sprites.add(self)
+        self.game.render_sprites.add(self)
 
-        # Animation frames
-        self.frames = []
-        self.load_frames()
+        # Animation
+        self.animator = Animator(self.game.animations, clip("gun_fx"))
 
-        self.image = self.frames[0]
+        self.image = self.animator.image
         self.rect = self.image.get_rect(midbottom=(self.gun.pos.x, self.gun.pos.y - self.gun.rect.h / 5))
 
-        # Animation frames
-        self.last_frame_update = 0
-        self.frame_delay = 50
-        self.current_frame = -1
-
-    def load_frames(self):
+    def kill(self):
         """
-        Load frame images into frame list
+        Remove from all groups and stop the animation
         :return: None
         """
-        for filepath in fire:
-            img = pg.image.load(filepath).convert_alpha()
-            img = pg.transform.scale(img, (40, 40))
-            self.frames.append(img)
+        self.animator.release()
+        super().kill()
 
     def update(self):
         """
-        Update frame animation using frame list and variables
+        Show the current frame of the animation
         :return: None
         """
-        current_time = pg.time.get_ticks()
-        if current_time - self.last_frame_update > self.frame_delay:
-            self.last_frame_update = current_time
-            self.current_frame = (self.current_frame + 1) % len(self.frames)
-            self.image = self.frames[self.current_frame]
+        self.image = self.animator.image
 
         # Attach midbottom to top of gun sprite
         self.rect.midbottom = (self.gun.pos.x, self.gun.pos.y - self.gun.rect.h / 5)
 
 
-class Gun(pg.sprite.Sprite):
+class Gun(pg.sprite.DirtySprite):
+    _layer = LAYER_GUNS
+
     # Can be attached to a character sprite
     def __init__(self, game, char):
         """
@@ -72,23 +67,18 @@ class Gun(pg.sprite.Sprite):
         :param char: character to attach to (currently only player)
         """
         super().__init__()
+        self.dirty = 2
         self.game = game
         self.char = char
 
         self.game.gun_sprites.add(self)
         self.game.all_sprites.add(self)
+        self.game.render_sprites.add(self)
 
-        # Frame list
-        self.frames = []
-        self.load_frames()
-        
-        self.image = self.frames[0]
-        self.rect = self.image.get_rect(center=(char.pos.x, char.pos.y - char.rect.h/2))
-
-        # For animations
-        self.last_frame_update = 0
-        self.current_frame = -1
+        # Spinning animation
+        self.animator = Animator(self.game.animations, clip("gun"))
 
+        self.image = self.animator.image
         self.rect = self.image.get_rect(center=(char.pos.x, char.pos.y - char.rect.h/2))
         # Position relative to character (NOT the actual coordinate position of gun); used as direction
         self.attach_pos = pg.Vector2(1, 1)
@@ -97,7 +87,7 @@ class Gun(pg.sprite.Sprite):
 
         # For shooting
         self.shot_delay = 200
-        self.last_shot_time = pg.time.get_ticks()
+        self.last_shot_time = self.game.now
         self.bullet_speed = 6
         self.ammo = 10
         self.maxammo = 10
@@ -105,26 +95,20 @@ class Gun(pg.sprite.Sprite):
         # FX
         GunFX(self.game, self)
 
-    def load_frames(self):
+    def kill(self):
         """
-        Load frame images into frame list
+        Remove from all groups and stop the animation
         :return: None
         """
-        for filepath in bullet_path:
-            img = pg.image.load(filepath).convert_alpha()
-            img = pg.transform.scale(img, (30, 30))
-            self.frames.append(img)
+        self.animator.release()
+        super().kill()
 
     def animate(self):
         """
         Animate spinning animation while player is holding
         :return: None
         """
-        current_time = pg.time.get_ticks()
-        if current_time - self.last_frame_update > 100:
-            self.last_frame_update = current_time
-            self.current_frame = (self.current_frame + 1) % len(self.frames)
-            self.image = self.frames[self.current_frame]
+        self.image = self.animator.image
 
     def shoot(self):
         """
@@ -132,12 +116,12 @@ class Gun(pg.sprite.Sprite):
         :return: None
         """
         pressed = pg.key.get_pressed()
-        current_time = pg.time.get_ticks()
+        current_time = self.game.now
         if self.ammo > 0 and (pressed[pg.K_UP] or pressed[pg.K_LEFT] or pressed[pg.K_DOWN] or pressed[pg.K_RIGHT]) \
                 and (current_time - self.last_shot_time > self.shot_delay):
             self.last_shot_time = current_time
 
-            Bullet(self.game, self.rect.center, self.attach_pos)
+            self.game.projectiles.acquire(BULLET, self.rect.center, self.attach_pos)
             self.ammo -= 1
 
     def update(self):
@@ -6,14 +6,17 @@
 # Date: 5 June 2020
 # Author(s): Khoa Hoang, Adrienne Lhuc Estrella, Pratham Kwatra, Matt Innaurato
 # Dependencies: 
-#   sys, pygame, random, datetime, paths, settings, 
+#   sys, atexit, logging, argparse, pygame, random, datetime, paths, settings, 
 #   player, boss, platforms, backgrounds, gui, projectiles, 
-#   powerups, and enemies modules.
+#   powerups, enemies, sounds, preloader, render, governor, camera, animation, and particles modules.
 
 
 """ RUN GAME FROM THIS MODULE """
 # TRY TO AVOID PUTTING GAME LOGIC HERE; USE OTHER MODULES
 import sys
+import atexit
+import logging
+import argparse
 import pygame as pg
 from random import seed
 from datetime import datetime
@@ -27,6 +30,13 @@ from gui import *          # GUI and menus
 from projectiles import *  # Projectiles
 from powerups import *     # PowerUps
 from enemies import *      # Enemies (not including boss)
+from sounds import *       # Sound effects
+from preloader import *    # Loads assets while the start menu is shown
+from render import *       # Render queue and dirty rectangle renderer
+from governor import *     # Lowers quality when frames take too long
+from camera import *       # Part of the world shown on the screen
+from animation import *    # Animation clips played from one frame clock
+from particles import *    # Impacts, blood, dust and other short effects
 
 """ GAME INFO """
 """
@@ -39,12 +49,14 @@ Boss has 10 health
 
 
 class Game:
-    def __init__(self):
+    def __init__(self, resolution=INTERNAL_RESOLUTION):
         """
         Main class for running the game; create instance of this class in main script and call run()
+        :param resolution: (w, h) to draw the world at before scaling it to the screen; None for the screen's
         """
         seed(datetime.now())
 
+        SoundBank.pre_init()  # Mixer settings must be set before pg.init()
         pg.init()
         icon = pg.image.load(icon_path)
         pg.display.set_icon(icon)
@@ -52,6 +64,7 @@ class Game:
         self.screen = pg.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         self.clock = pg.time.Clock()
         self.events = pg.event.get()
+        self.sounds = SoundBank()
 
         self.is_running = True  # Used to keep program running
         self.is_playing = True  # Used to track whether player is playing
@@ -60,16 +73,23 @@ class Game:
         self.all_sprites = pg.sprite.Group()          # All
         self.plat_sprites = pg.sprite.Group()         # Platforms
         self.char_sprites = pg.sprite.Group()         # Characters
-        self.fx_sprites = pg.sprite.Group()           # Effects
-        self.player_proj_sprites = pg.sprite.Group()  # Player bullets
-        self.boss_proj_sprites = pg.sprite.Group()    # Boss bullets
         self.gun_sprites = pg.sprite.Group()          # Guns
         self.pow_sprites = pg.sprite.Group()          # PowerUps
         self.enemy_sprites = pg.sprite.Group()        # Enemies (not including boss)
+        self.render_sprites = pg.sprite.LayeredDirty()  # Everything drawn, sorted by layer (see render.py)
 
-        # Character sprites
-        self.player = Player(self)
-        self.boss = Boss(self)
+        # Sprites are in world coordinates; the camera decides which part of the world is on the screen
+        self.camera = Camera()
+
+        # Frame clock; every animation is advanced from it once per frame
+        self.now = 0
+        self.animations = Animations()
+        self.particles = Particles(self)  # Effects are not sprites; see particles.py
+        self.projectiles = ProjectileEngine(self)  # Neither are projectiles; see projectiles.py
+
+        # Character sprites (created by load_world() once their assets are loaded)
+        self.player = None
+        self.boss = None
 
         # Spawners for platforms and powerups
         self.power_spawner = PowerSpawner(self)
@@ -81,11 +101,64 @@ class Game:
         self.high_score = 0
 
         # Background
-        self.background = GlacialBackground(self)
+        self.background = None
         self.true_scroll = [0, 0]
 
+        # Surface the world is drawn on when it is drawn at a lower resolution than the screen (see set_resolution())
+        self.world_surface = None
+        self.render_scale = 1
+        # Renderer that only updates changed parts of the screen; None to redraw everything every frame
+        self.renderer = None
+        self.set_resolution(resolution)
+        self.render_queue = RenderQueue(self)  # Culls sprites, and draws them all when redrawing everything
+        self.frame_stats = FrameStats()
+
+        # Quality knobs (changed by the quality governor)
+        self.max_fx = None  # Most FX alive at once
+        self.animation_scale = 1  # Multiplies the delay between animation frames
+        self.governor = QualityGovernor(self) if QUALITY_GOVERNOR else None
+
         # GUI
         self.gui = GUI(self)
+        self.hud = HUD(self.gui)
+
+        # Start loading gameplay assets in the background so the start menu shows up right away
+        self.preloader = Preloader(self)
+        self.preloader.start()
+
+    def load_world(self):
+        """
+        Create characters and background; only waits for assets the preloader hasn't finished yet
+        :return: None
+        """
+        self.preloader.wait()
+        self.player = Player(self)
+        self.boss = Boss(self)
+        self.background = GlacialBackground(self)
+
+    def set_resolution(self, resolution):
+        """
+        Set the resolution the world is drawn at; a lower resolution than the screen is scaled up to it once per frame,
+        and the HUD is still drawn at the screen's resolution
+        :param resolution: (w, h) with the same aspect ratio as the screen; None for the screen's resolution
+        :return: None
+        """
+        if resolution is None or tuple(resolution) == (SCREEN_WIDTH, SCREEN_HEIGHT):
+            self.world_surface = None
+            self.render_scale = 1
+        elif resolution[0] * SCREEN_HEIGHT != resolution[1] * SCREEN_WIDTH:
+            raise ValueError("Resolution {}x{} does not have the aspect ratio of the screen ({}x{})".format(
+                resolution[0], resolution[1], SCREEN_WIDTH, SCREEN_HEIGHT))
+        else:
+            self.world_surface = pg.Surface(resolution).convert()
+            self.render_scale = resolution[0] / SCREEN_WIDTH
+        # The whole screen changes every frame when scaling
+        if not DIRTY_RENDERING or self.world_surface is not None:
+            self.renderer = None
+        elif self.renderer is None:
+            self.renderer = DirtyRenderer(self)
+        if self.background:
+            self.background.set_scale(self.render_scale)
 
     def run(self):
         """
@@ -94,7 +167,8 @@ class Game:
         """
         with open(high_score_path, "w") as file:
             file.write("0")
-        self.gui.draw_start_menu()
+        self.gui.run_menu("start menu")
+        self.load_world()
         self.plat_spawner.init_game()
         # Game loop for running
         while self.is_running:
@@ -102,10 +176,14 @@ class Game:
             while self.is_playing:
                 # Main drivers
                 self.handle_events()
-                self.update()
+                self.update(pg.time.get_ticks())
                 self.draw()
                 self.clock.tick(MAX_FPS)
+                if self.governor:
+                    self.governor.update(self.clock.get_rawtime())
             # Player died; reset game
+            if self.is_running:
+                self.gui.run_menu("game over menu")
             self.reset()
         pg.quit()
         sys.exit(0)
@@ -124,13 +202,20 @@ class Game:
             # Bring up menus
             if event.type == pygame.KEYUP:
                 if event.key == pygame.K_p:
-                    self.gui.draw_pause_menu()
+                    self.gui.run_menu("pause menu")
+                    if self.renderer:
+                        self.renderer.invalidate()  # Menu was drawn over the screen
 
-    def update(self):
+    def update(self, now=None):
         """
         Update the states and positions of all objects and variables
+        :param now: time of this frame in ms; None for pg.time.get_ticks()
         :return: None
         """
+        self.now = pg.time.get_ticks() if now is None else now
+        self.animations.advance(self.now, self.animation_scale)
+        self.particles.update(self.now, self.animation_scale)
+        self.projectiles.update()
         self.background.update()
         self.all_sprites.update()
         # self.music.update()
@@ -138,32 +223,28 @@ class Game:
         self.plat_spawner.spawn()
         # Player update() is separate to ensure player doesn't clip through stuff
         self.player.update_solo()
+        # Play sounds triggered this frame
+        self.sounds.update()
 
     def draw(self):
         """
         Drawing everything in correct order onto the screen
         :return: None
         """
+        self.frame_stats.new_frame()
+        self.render_queue.cull()
+        if self.renderer:
+            self.renderer.draw()
+            return
+        surface = self.screen if self.world_surface is None else self.world_surface
         # Background
-        self.background.draw()
-        # Sprites
-        self.plat_sprites.draw(self.screen)
-        for plat in self.plat_sprites:
-            plat.draw_inner()
-        self.char_sprites.draw(self.screen)
-        self.gun_sprites.draw(self.screen)
-        self.pow_sprites.draw(self.screen)
-        self.fx_sprites.draw(self.screen)
-        self.player_proj_sprites.draw(self.screen)
-        self.boss_proj_sprites.draw(self.screen)
+        self.background.draw(surface)
+        # Sprites, in the order of their layers
+        self.render_queue.draw(surface)
+        if self.world_surface is not None:
+            pg.transform.scale(self.world_surface, (SCREEN_WIDTH, SCREEN_HEIGHT), self.screen)
         # GUI
-        self.gui.draw_text("Score: {}".format(self.score),
-                           22, (255, 255, 255), (SCREEN_WIDTH/2, 15))
-        self.gui.draw_text("Player", 22, (255, 255, 255), (92, 15))
-        self.gui.draw_text("Boss", 22, (255, 255, 255), (1160, 15))
-        self.gui.draw_health_bar()
-        self.gui.draw_ammo_bar()
-        self.gui.boss_health_bar()
+        self.draw_hud()
 
         """ UNCOMMENT THIS TO SHOW INVISIBLE FUTURE PLAYER"""
         """
@@ -175,6 +256,13 @@ class Game:
         # Update screen
         pg.display.update()
 
+    def draw_hud(self):
+        """
+        Draw score, health and ammo on top of everything else
+        :return: list of rects of the screen that were drawn on
+        """
+        return self.hud.draw()
+
     def reset(self):
         """
         Used for resetting game when player dies
@@ -183,15 +271,69 @@ class Game:
         self.is_playing = True
         for sprite in self.all_sprites:
             sprite.kill()
+        self.camera.reset()
+        self.particles.clear()
+        self.projectiles.clear()
         self.player = Player(self)  # TODO: Make reset() method for Player
         self.boss = Boss(self)  # TODO: Make reset() method for Boss
         self.score = 0
         self.plat_spawner.init_game()
         self.background.reset()
+        if self.renderer:
+            self.renderer.invalidate()
+
+    def log_stats(self):
+        """
+        Log performance stats collected while playing; called when the program exits
+        :return: None
+        """
+        if self.background:
+            log.info(self.background.report())
+        if self.renderer:
+            log.info(self.renderer.report())
+        log.info(self.plat_spawner.report())
+        log.info(self.projectiles.report())
+        log.info(asset_cache.report())
+        log.info(self.frame_stats.report())
+        if self.governor:
+            log.info(self.governor.report())
+        log.info(self.animations.report())
+        log.info(self.particles.report())
+        log.info(self.hud.report())
+        log.info(self.gui.menu_report())
+        log.info(text_cache.report())
+        log.debug(asset_cache.format_report())
+        log.info(self.sounds.latency_report())
+
+
+log = logging.getLogger(__name__)
+
+
+def parse_resolution(text):
+    """
+    :param text: command line resolution (ex: "640x360")
+    :return: (w, h); checked here so that a bad resolution is reported before the window opens
+    """
+    try:
+        w, h = (int(n) for n in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError("Resolution must look like 640x360, not {}".format(text))
+    if w <= 0 or h <= 0:
+        raise argparse.ArgumentTypeError("Resolution must be at least 1x1, not {}".format(text))
+    if w * SCREEN_HEIGHT != h * SCREEN_WIDTH:
+        raise argparse.ArgumentTypeError("Resolution {} does not have the aspect ratio of the screen ({}x{})".format(
+            text, SCREEN_WIDTH, SCREEN_HEIGHT))
+    return w, h
 
 
 def main():
-    game = Game()
+    parser = argparse.ArgumentParser(description=SCREEN_TITLE)
+    parser.add_argument("--resolution", type=parse_resolution, default=INTERNAL_RESOLUTION,
+                        help="resolution to draw the world at before scaling it to the window (ex: 640x360)")
+    args = parser.parse_args()
+    logging.basicConfig(level=LOG_LEVEL, format="%(asctime)s %(name)s %(levelname)s: %(message)s")
+    game = Game(args.resolution)
+    atexit.register(game.log_stats)  # Menus can exit the program too
     game.run()
 
 
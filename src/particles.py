@@ -0,0 +1,171 @@
+# Name: particles.py
+# Purpose: Short effects (impacts, blood, jump dust, muzzle flashes) that play an animation once, stored as arrays and
+#   advanced in one vectorized step per frame instead of being sprites
+# Version: 1.0
+# Date: 18 October 2026
+# Dependencies: numpy, settings, atlas, and animation modules
+
+
+import numpy as np
+from settings import *
+from atlas import atlas
+from animation import clip
+
+
+class Particles:
+    def __init__(self, game, capacity=256):
+        """
+        Live effects, packed at the front of the arrays in the order they were emitted; an effect only has a position,
+        a clip, the time it started and its current frame, so emitting one allocates no Python objects
+        :param game: reference to game instance
+        :param capacity: effects to make room for at first; doubled whenever it runs out
+        """
+        self.game = game
+        self.count = 0  # Live effects
+        self.x = np.zeros(capacity, np.float64)  # World position of the topleft of the frame
+        self.y = np.zeros(capacity, np.float64)
+        self.start = np.zeros(capacity, np.int64)  # Game.now when emitted
+        self.clip = np.zeros(capacity, np.int32)  # Clip id (see register())
+        self.frame = np.zeros(capacity, np.int32)  # Frame of the clip
+
+        # Registered clips; arrays are indexed by clip id
+        self.clip_ids = {}  # (name, flip) -> clip id
+        self.frames = []  # Frames of every clip, one clip after the other
+        self.clip_first = np.zeros(0, np.int32)  # Index of the first frame of the clip in self.frames
+        self.clip_length = np.zeros(0, np.int32)
+        self.clip_delay = np.zeros(0, np.float64)
+        self.clip_w = np.zeros(0, np.int32)
+        self.clip_h = np.zeros(0, np.int32)
+        self.clip_offset_x = np.zeros(0, np.float64)  # Moves the pivot of the clip onto the emitted position
+        self.clip_offset_y = np.zeros(0, np.float64)
+
+        # Stats
+        self.emitted = 0
+        self.peak = 0
+
+    def register(self, name, flip=False):
+        """
+        Add the frames of an animation to the shared frame list
+        :param name: key of atlas.ANIMATIONS
+        :param flip: True for the mirrored frames
+        :return: clip id
+        """
+        effect_clip = clip(name, loop=False)
+        frames = effect_clip.mirrored if flip else effect_clip.frames
+        rect = frames[0].get_rect()
+        pivot_x, pivot_y = atlas.pivot(name, flip)
+        clip_id = len(self.clip_ids)
+        self.clip_ids[(name, flip)] = clip_id
+        self.clip_first = np.append(self.clip_first, len(self.frames)).astype(np.int32)
+        self.clip_length = np.append(self.clip_length, len(frames)).astype(np.int32)
+        self.clip_delay = np.append(self.clip_delay, effect_clip.delay)
+        self.clip_w = np.append(self.clip_w, rect.w).astype(np.int32)
+        self.clip_h = np.append(self.clip_h, rect.h).astype(np.int32)
+        self.clip_offset_x = np.append(self.clip_offset_x, -pivot_x)
+        self.clip_offset_y = np.append(self.clip_offset_y, -pivot_y)
+        self.frames.extend(frames)
+        return clip_id
+
+    def grow(self):
+        """
+        Double the room for live effects
+        :return: None
+        """
+        self.x = np.concatenate((self.x, np.zeros_like(self.x)))
+        self.y = np.concatenate((self.y, np.zeros_like(self.y)))
+        self.start = np.concatenate((self.start, np.zeros_like(self.start)))
+        self.clip = np.concatenate((self.clip, np.zeros_like(self.clip)))
+        self.frame = np.concatenate((self.frame, np.zeros_like(self.frame)))
+
+    def emit(self, name, x, y, flip=False):
+        """
+        Start an effect; it is positioned by the pivot of its animation and removed after its last frame
+        :param name: key of atlas.ANIMATIONS
+        :param x: x-position in the world
+        :param y: y-position in the world
+        :param flip: True to play the mirrored frames
+        :return: None
+        """
+        # The quality governor can limit how many FX are alive; new ones are dropped past that
+        if self.game.max_fx is not None and self.count >= self.game.max_fx:
+            self.game.frame_stats.fx_dropped += 1
+            return
+        clip_id = self.clip_ids.get((name, flip))
+        if clip_id is None:
+            clip_id = self.register(name, flip)
+        if self.count == len(self.x):
+            self.grow()
+        i = self.count
+        self.x[i] = x + self.clip_offset_x[clip_id]
+        self.y[i] = y + self.clip_offset_y[clip_id]
+        self.start[i] = self.game.now
+        self.clip[i] = clip_id
+        self.frame[i] = 0
+        self.count += 1
+        self.emitted += 1
+        self.peak = max(self.peak, self.count)
+
+    def update(self, now, scale=1):
+        """
+        Set the frame of every effect from the time since it started and remove the ones that are done
+        :param now: time of this frame in ms (Game.now)
+        :param scale: multiplies the delay between frames (Game.animation_scale)
+        :return: None
+        """
+        n = self.count
+        if not n:
+            return
+        clips = self.clip[:n]
+        frame = (now - self.start[:n]) // (self.clip_delay[clips] * scale)
+        live = frame < self.clip_length[clips]
+        if not live.all():
+            # Pack the live effects at the front, keeping the order they are drawn in
+            keep = np.flatnonzero(live)
+            n = len(keep)
+            for array in (self.x, self.y, self.start, self.clip):
+                array[:n] = array[keep]
+            frame = frame[keep]
+            self.count = n
+        self.frame[:n] = frame
+
+    def sequence(self, view, top, scale=1, scale_image=None):
+        """
+        (image, position) pairs of the effects inside a rect of the world, for a blits() call
+        :param view: rect of the world to draw effects in
+        :param top: y of the world at the top of the surface drawn on
+        :param scale: size of the surface drawn on relative to the screen
+        :param scale_image: function(image, scale) returning a scaled image, used when scale isn't 1
+        :return: list of (image, position) pairs, in the order the effects were emitted
+        """
+        n = self.count
+        if not n:
+            return []
+        clips = self.clip[:n]
+        x = self.x[:n]
+        y = self.y[:n]
+        visible = (x < view.right) & (x + self.clip_w[clips] > view.left) & \
+                  (y < view.bottom) & (y + self.clip_h[clips] > view.top)
+        drawn = int(np.count_nonzero(visible))
+        self.game.frame_stats.drawn[LAYER_FX] += drawn
+        self.game.frame_stats.culled[LAYER_FX] += n - drawn
+        images = (self.clip_first[clips] + self.frame[:n])[visible].tolist()
+        xs = (x[visible] * scale).astype(int).tolist()
+        ys = ((y[visible] - top) * scale).astype(int).tolist()
+        frames = self.frames
+        if scale == 1:
+            return [(frames[i], (px, py)) for i, px, py in zip(images, xs, ys)]
+        return [(scale_image(frames[i], scale), (px, py)) for i, px, py in zip(images, xs, ys)]
+
+    def clear(self):
+        """
+        Remove every effect
+        :return: None
+        """
+        self.count = 0
+
+    def report(self):
+        """
+        :return: string with effect stats
+        """
+        return "Particles: {} effects emitted, {} alive at most, {} clips".format(
+            self.emitted, self.peak, len(self.clip_ids))
@@ -19,6 +19,9 @@ parent_path = Path(__file__).resolve().parents[1]
 # High score
 high_score_path = str(parent_path / "bin/high_score.txt")
 
+# Decoded images cached on disk (rebuilt automatically when the source images change)
+asset_cache_dir = str(parent_path / "bin/cache")
+
 # Icons
 icon_path = str(parent_path / "res/icons/gun.png")
 health_path = str(parent_path / "res/icons/health_icon.png")
@@ -97,6 +100,10 @@ iceshard_hit_sound = str(parent_path / "res/sounds/ice_shard_collision.wav")
 
 
 
+# Texture atlas (built by running atlas.py)
+atlas_dir = str(parent_path / "res/atlas")
+atlas_manifest_path = str(parent_path / "res/atlas/manifest.json")
+
 # Platforms
 grass_tile_flat_path = str(parent_path / "res/platforms/Grass_Tile_Flat.png")
 
@@ -1,6 +1,6 @@
 # Name: platforms.py
 # Purpose: Handles the platforms that the player will stand on. This module dictates all methods/attributes associated with the platforms
-# Version: 2.1
+# Version: 2.2
 # Date: 5 June 2020
 # Author(s): Khoa Hoang, Matt Innaurato
 # Dependencies: pygame, settings, and random modules
@@ -10,6 +10,43 @@ import pygame as pg
 from settings import *
 from random import randint, choice
 
+# Friction and color of each platform type
+PLATFORM_TYPES = {
+    "grassy": (-0.1, "#417b43"),
+    "icy": (-0.05, "#A5F2F3"),
+    "sandy": (-0.15, "#c2b280"),
+}
+INNER_COLOR = "#855E42"
+MARGIN = 10  # Width of the colored border around the inner platform
+
+images = {}  # (ptype, w, h) -> platform image shared by every platform of that type and size
+
+
+def platform_image(ptype, w, h):
+    """
+    Get the final look of a platform (colored border with inner platform), rendered once per type and size
+    :param ptype: type of platform (key of PLATFORM_TYPES)
+    :param w: width of platform
+    :param h: height of platform
+    :return: pygame Surface (shared, so never draw onto it)
+    """
+    key = (ptype, w, h)
+    image = images.get(key)
+    if image is None:
+        image = pg.Surface((w, h))
+        image.fill(pg.Color(PLATFORM_TYPES[ptype][1]))
+        image.fill(pg.Color(INNER_COLOR), (MARGIN, MARGIN, w - MARGIN * 2, h - MARGIN * 2))
+        images[key] = image
+    return image
+
+
+def random_width():
+    """
+    Random platform width, rounded to PLATFORM_WIDTH_STEP so that there are only a few platform images to cache
+    :return: width in pixels
+    """
+    return randint(SCREEN_WIDTH // 5, SCREEN_WIDTH // 2) // PLATFORM_WIDTH_STEP * PLATFORM_WIDTH_STEP
+
 
 class PlatformSpawner:
     def __init__(self, game):
@@ -20,6 +57,29 @@ class PlatformSpawner:
         self.game = game
         # Determines how far up the player has to travel for powerups to spawn
         self.spawn_dist = randint(120, 360)
+        self.pool = []  # Killed platforms waiting to be reused
+        # Stats
+        self.created = 0
+        self.reused = 0
+
+    def create(self, x, y, w, h, ptype):
+        """
+        Place a platform, reusing a killed one if there is one
+        :param x: x-position of topleft of platform
+        :param y: y-position of topleft of platform
+        :param w: width of platform
+        :param h: height of platform
+        :param ptype: type of platform
+        :return: Platform
+        """
+        if self.pool:
+            plat = self.pool.pop()
+            plat.place(x, y, w, h, ptype)
+            self.reused += 1
+        else:
+            plat = Platform(self.game, x, y, w, h, ptype)
+            self.created += 1
+        return plat
 
     def spawn(self):
         """
@@ -29,12 +89,11 @@ class PlatformSpawner:
         """
         if self.game.player.scroll_dist_plat > self.spawn_dist:
             self.game.player.scroll_dist_plat = 0
-            plat_width = randint(SCREEN_WIDTH // 5, SCREEN_WIDTH // 2)
+            plat_width = random_width()
             plat_pos_x = randint(10, SCREEN_WIDTH - plat_width - 10)
-            plat_pos_y = -48
+            plat_pos_y = self.game.camera.rect.top - 48
             ptype = choice(("grassy", "icy", "sandy"))
-            plat = Platform(self.game, plat_pos_x,
-                            plat_pos_y, plat_width, 48, ptype)
+            plat = self.create(plat_pos_x, plat_pos_y, plat_width, 48, ptype)
             # 25% chance of enemy spawning on platform
             if randint(0, 4) == 0:
                 self.game.enemy_spawner.spawn(plat)
@@ -46,20 +105,29 @@ class PlatformSpawner:
         not moved any distance yet
         :return: None
         """
-        Platform(self.game, -100, SCREEN_HEIGHT - 48,
-                 SCREEN_WIDTH + 200, 96, "grassy")  # Ground
-        plat_pos_y = SCREEN_HEIGHT
+        top = self.game.camera.rect.top
+        self.create(-100, top + SCREEN_HEIGHT - 48, SCREEN_WIDTH + 200, 96, "grassy")  # Ground
+        plat_pos_y = top + SCREEN_HEIGHT
         # Spawn i more platforms
         for i in range(0, 4):
-            plat_width = randint(SCREEN_WIDTH // 5, SCREEN_WIDTH // 2)
+            plat_width = random_width()
             plat_pos_x = randint(10, SCREEN_WIDTH - 10 - plat_width)
             plat_pos_y -= randint(200, 300)
             # New platform created and automatically added to sprite groups
             ptype = choice(("grassy", "icy", "sandy"))
-            Platform(self.game, plat_pos_x, plat_pos_y, plat_width, 48, ptype)
+            self.create(plat_pos_x, plat_pos_y, plat_width, 48, ptype)
+
+    def report(self):
+        """
+        :return: string with platform allocation stats
+        """
+        return "PlatformSpawner: {} platforms created, {} reused, {} platform images".format(
+            self.created, self.reused, len(images))
+
 
+class Platform(pg.sprite.DirtySprite):
+    _layer = LAYER_PLATFORMS
 
-class Platform(pg.sprite.Sprite):
     def __init__(self, game, x, y, w, h, ptype):
         """
         Platforms for player and enemies to land on; has different type with different colors and friction values
@@ -71,50 +139,50 @@ class Platform(pg.sprite.Sprite):
         :param ptype: type of platform as a string that determines the platform's friction and color
         """
         super().__init__()
+        self.dirty = 2
         self.game = game
+        self.place(x, y, w, h, ptype)
 
-        # Add to sprite groups
-        self.game.plat_sprites.add(self)
-        self.game.all_sprites.add(self)
-
+    def place(self, x, y, w, h, ptype):
+        """
+        Set type, size and position of platform and add it to the sprite groups; also used to reuse a killed platform
+        :param x: x-position of topleft of platform
+        :param y: y-position of topleft of platform
+        :param w: width of platform
+        :param h: height of platform
+        :param ptype: type of platform as a string that determines the platform's friction and color
+        :return: None
+        """
         # Different platforms have different frictions and colors
-        if ptype == "grassy":
-            self.friction = -0.1
-            color = pg.Color("#417b43")
-        elif ptype == "icy":
-            self.friction = -0.05
-            color = pg.Color("#A5F2F3")
-        elif ptype == "sandy":
-            self.friction = -0.15
-            color = pg.Color("#c2b280")
-        else:
+        if ptype not in PLATFORM_TYPES:
             raise ValueError(
                 "Invalid platform type. Options: \"grassy\", \"icy\", \"sandy\"")
-
-        self.image = pg.Surface((w, h))
-        self.image.fill(color)
+        self.friction = PLATFORM_TYPES[ptype][0]
+        self.image = platform_image(ptype, w, h)
         self.rect = self.image.get_rect(topleft=(x, y))
 
-        self.margin = 10
-        self.inner = pg.Surface((w - self.margin * 2, h - self.margin * 2))
-        self.inner.fill(pg.Color("#855E42"))
+        # Add to sprite groups
+        self.game.plat_sprites.add(self)
+        self.game.all_sprites.add(self)
+        self.game.render_sprites.add(self)
 
     def cleanup(self):
         """
         Platforms below screen are removed
         :return: None
         """
-        if self.rect.top >= SCREEN_HEIGHT:
+        if self.rect.top >= self.game.camera.rect.bottom:
             self.kill()
             self.game.score += 5
 
-    def draw_inner(self):
+    def kill(self):
         """
-        Draw inner platform to clean up visuals
+        Remove platform from all groups and give it back to the spawner to be reused
         :return: None
         """
-        self.game.screen.blit(
-            self.inner, (self.rect.x + self.margin, self.rect.y + self.margin))
+        if self.alive():
+            super().kill()
+            self.game.plat_spawner.pool.append(self)
 
     def update(self):
         """
@@ -3,108 +3,47 @@
 # Version: 3.0
 # Date: 5 June 2020
 # Author(s): Khoa Hoang, Matt Innaurato, Adrienne Lhuc Estrella
-# Dependencies: pygame, paths, settings, utils, projectiles, gun, and fx modules
+# Dependencies: pygame, paths, settings, utils, animation, projectiles, and gun modules
 
 
 import pygame
 from paths import *
 from settings import *
 from utils import *
+from animation import Animator, clip
 from projectiles import *
 from gun import *
-from fx import *
 
 
-class PlayerJumpFX(FX):
-    def __init__(self, game, x, y):
-        """
-        Jump dash effect when player lifts off the ground after jumping
-        :param game: reference to game instance
-        :param x: x-position to spawn
-        :param y: y-position to spawn
-        """
-        super().__init__(game, x, y)
-
-        self.image = self.frames[0]
-        self.rect = self.image.get_rect(midbottom=(x, y))
-
-        self.frame_delay = 50
-
-    def load_frames(self):
-        """
-        Load frame images onto frame list
-        :return: None
-        """
-        sheet = SpriteSheet(player_jump_fx_path)
-        for i in range(0, 6):
-            self.frames.append(sheet.get_sprite(i * 28, 0, 28, 28))
-
-
-class PlayerLandFX(FX):
-    def __init__(self, game, x, y):
-        """
-        Jump dust effect that plays when player lands
-        :param game: reference to game instance
-        :param x: x-position to spawn
-        :param y: y-position to spawn
-        """
-        super().__init__(game, x, y)
-
-        self.image = self.frames[0]
-        self.rect = self.image.get_rect(midbottom=(x, y))
-
-    def load_frames(self):
-        """
-        Load frame images in frame list
-        :return: None
-        """
-        # Land FX
-        sheet = SpriteSheet(player_land_fx_path)
-        for i in range(0, 4):
-            self.frames.append(sheet.get_sprite(i * 44, 0, 44, 32))
-
-
-class PlayerSoundFX:
-    def __init__(self):
-        """
-        Contains sound effects to play when jumping and hurt
-        """
-        self.jump = pygame.mixer.Sound(jump_sound_path)
-        self.hurt = pygame.mixer.Sound(pain_sound_path)
-
+class Player(pygame.sprite.DirtySprite):
+    _layer = LAYER_CHARACTERS
 
-class Player(pygame.sprite.Sprite):
     def __init__(self, game):
         """
         Player class to be controlled by player
         :param game: reference to game instance
         """
         super().__init__()
+        self.dirty = 2  # Moves or animates every frame, so the dirty renderer always redraws it
         self.game = game
 
         # Add to sprite groups
         self.game.char_sprites.add(self)
         self.game.all_sprites.add(self)
-
-        self.sound_fx = PlayerSoundFX()
-
-        # Initialize sprite sheets and frame lists
-        self.idle_frames_r = []
-        self.idle_frames_l = []
-        self.walk_frames_r = []
-        self.walk_frames_l = []
-        self.jump_frames_r = []
-        self.jump_frames_l = []
-        self.fall_frames_r = []
-        self.fall_frames_l = []
-        self.land_frames_r = []
-        self.land_frames_l = []
-        self.hurt_frames_r = []
-        self.hurt_frames_l = []
+        self.game.render_sprites.add(self)
+
+        # Initialize animation clips
+        self.idle_clip = None
+        self.walk_clip = None
+        self.jump_clip = None
+        self.fall_clip = None
+        self.land_clip = None
+        self.hurt_clip = None
         self.load_sprite_sheets()
+        self.animator = Animator(self.game.animations, self.idle_clip)
 
         # Initialize pygame elements
-        self.image = self.idle_frames_r[0]
+        self.image = self.animator.image
         self.rect = self.image.get_rect(midbottom=(SCREEN_WIDTH/2, SCREEN_HEIGHT - 60))
 
         # Initialize vectors for realistic movement
@@ -141,11 +80,6 @@ class Player(pygame.sprite.Sprite):
         self.is_hurt = False
         self.last_jump_time = 0
         self.last_descend_time = 0
-        self.current_frame = -1  # Used for looping animations
-        self.current_jump_frame = -1  # Used for jumping animation
-        self.current_land_frame = -1  # Used for landing animation
-        self.current_hurt_frame = -1
-        self.last_frame_update = 0
 
         # USE THESE VARIABLES FOR CHANGE AI AS PLAYER PROGRESSES
         # Future player interval decreases as player score increases
@@ -177,6 +111,7 @@ class Player(pygame.sprite.Sprite):
         # Scrolling
         self.scroll_dist_plat = 0  # Use to spawn platforms
         self.scroll_dist_pow = 0   # Use to spawn powerups
+        self.has_fallen = False    # Fell below the screen; the game ends once all platforms have scrolled away
 
     def tweak_ai(self):
         """
@@ -193,7 +128,7 @@ class Player(pygame.sprite.Sprite):
     def send_future_player(self, current_time):
         """
         Send out the future player rect that the boss AI will track to predict player movement
-        :param current_time: pg.time.get_ticks()
+        :param current_time: time of this frame in ms (Game.now)
         :return: None
         """
         if current_time - self.last_ft_time > self.ft_player_interval:  # Tweak this time interval to modify AI prediction
@@ -219,124 +154,63 @@ class Player(pygame.sprite.Sprite):
 
     def load_sprite_sheets(self):
         """
-        Load sprite sheet images into frame lists
+        Load animation clips of the sprite sheets in the atlas (frames face right; flipped when facing left)
         :return: None
         """
-        # Idle
-        sheet = SpriteSheet(player_idle_path)
-        for i in range(0, 8):  # Add all frames of sprite sheet into a list (8 sprites in this case)
-            self.idle_frames_r.append(sheet.get_sprite(i * 32, 0, 32, 28))
-        for frame in self.idle_frames_r:
-            self.idle_frames_l.append(pygame.transform.flip(frame, True, False))
-
-        # Walk
-        sheet = SpriteSheet(player_walk_path)
-        for i in range(0, 8):
-            self.walk_frames_r.append(sheet.get_sprite(i * 32, 0, 32, 32))
-        for frame in self.walk_frames_r:
-            self.walk_frames_l.append(pygame.transform.flip(frame, True, False))
-
-        # Jump
-        sheet = SpriteSheet(player_jump_path)
-        for i in range(0, 6):
-            self.jump_frames_r.append(sheet.get_sprite(i * 28, 0, 28, 28))
-        for frame in self.jump_frames_r:
-            self.jump_frames_l.append(pygame.transform.flip(frame, True, False))
-
-        # Fall
-        sheet = SpriteSheet(player_fall_path)
-        for i in range(0, 2):
-            self.fall_frames_r.append(sheet.get_sprite(i * 32, 0, 32, 28))
-        for frame in self.fall_frames_r:
-            self.fall_frames_l.append(pygame.transform.flip(frame, True, False))
-
-        # Land
-        sheet = SpriteSheet(player_land_no_dust_path)
-        for i in range(0, 4):
-            self.land_frames_r.append(sheet.get_sprite(i * 44, 0, 44, 32))
-        for frame in self.land_frames_r:
-            self.land_frames_l.append(pygame.transform.flip(frame, True, False))
-
-        # Hurt
-        sheet = SpriteSheet(player_hurt_path)
-        for i in range(0, 9):
-            self.hurt_frames_r.append(sheet.get_sprite(i * 32, 0, 32, 28))
-        for frame in self.hurt_frames_r:
-            self.hurt_frames_l.append(pygame.transform.flip(frame, True, False))
+        self.idle_clip = clip("player_idle")
+        self.walk_clip = clip("player_walk")
+        self.jump_clip = clip("player_jump")
+        self.fall_clip = clip("player_fall")
+        self.land_clip = clip("player_land", loop=False)
+        self.hurt_clip = clip("player_hurt", loop=False)
 
     def animate(self):
         """
-        Animate frames using frame lists and state variables
+        Animate frames using clips and state variables; hurt and land clips play once
         :return: None
         """
-        current_time = pygame.time.get_ticks()
-        if current_time - self.last_frame_update > 100 and not self.is_hurt:
-            self.last_frame_update = current_time
-            # Land
-            if self.is_landing and self.is_facing_right:
-                self.current_land_frame = (self.current_land_frame + 1) % len(self.land_frames_r)
-                self.image = self.land_frames_r[self.current_land_frame]
-            elif self.is_landing and not self.is_facing_right:
-                self.current_land_frame = (self.current_land_frame + 1) % len(self.land_frames_l)
-                self.image = self.land_frames_l[self.current_land_frame]
-            if self.current_land_frame >= len(self.land_frames_r) - 1:
-                self.is_landing = False
-                self.current_land_frame = 0
-            # Idle
-            if not self.is_walking and not self.is_jumping and self.is_facing_right \
-                    and not self.is_landing and not self.is_falling:
-                self.current_frame = (self.current_frame + 1) % len(self.idle_frames_r)  # Make the frames loopy loop
-                self.image = self.idle_frames_r[self.current_frame]
-            elif not self.is_walking and not self.is_jumping and not self.is_facing_right \
-                    and not self.is_landing and not self.is_falling:
-                self.current_frame = (self.current_frame + 1) % len(self.idle_frames_l)
-                self.image = self.idle_frames_l[self.current_frame]
-            # Walk
-            if self.is_walking and not self.is_jumping and self.is_facing_right \
-                    and not self.is_landing and not self.is_falling:
-                self.current_frame = (self.current_frame + 1) % len(self.walk_frames_r)
-                self.image = self.walk_frames_r[self.current_frame]
-            elif self.is_walking and not self.is_jumping and not self.is_facing_right \
-                    and not self.is_landing and not self.is_falling:
-                self.current_frame = (self.current_frame + 1) % len(self.walk_frames_l)
-                self.image = self.walk_frames_l[self.current_frame]
-            # Jump
-            if self.is_jumping and not self.is_falling and self.is_facing_right and not self.is_landing:
-                self.current_jump_frame = (self.current_jump_frame + 1) % len(self.jump_frames_r)
-                self.image = self.jump_frames_r[self.current_jump_frame]
-            elif self.is_jumping and not self.is_falling and not self.is_facing_right and not self.is_landing:
-                self.current_jump_frame = (self.current_jump_frame + 1) % len(self.jump_frames_l)
-                self.image = self.jump_frames_l[self.current_jump_frame]
-            elif not self.is_jumping:
-                self.current_jump_frame = 0
-            # Fall
-            if self.is_falling and self.is_facing_right and not self.is_landing:
-                self.current_frame = (self.current_frame + 1) % len(self.fall_frames_r)
-                self.image = self.fall_frames_r[self.current_frame]
-            elif self.is_falling and not self.is_facing_right and not self.is_landing:
-                self.current_frame = (self.current_frame + 1) % len(self.fall_frames_l)
-                self.image = self.fall_frames_l[self.current_frame]
-
-        # Hurt
-        elif current_time - self.last_frame_update > 50 and self.is_hurt:
-            if self.is_facing_right:
-                self.last_frame_update = current_time
-                self.current_hurt_frame = (self.current_hurt_frame + 1) % len(self.hurt_frames_r)
-                self.image = self.hurt_frames_r[self.current_hurt_frame]
-            elif not self.is_facing_right:
-                self.last_frame_update = current_time
-                self.current_hurt_frame = (self.current_hurt_frame + 1) % len(self.hurt_frames_l)
-                self.image = self.hurt_frames_l[self.current_hurt_frame]
-            if self.current_hurt_frame >= len(self.hurt_frames_r) - 1:
-                self.is_hurt = False
-                self.current_hurt_frame = 0
-
+        if self.is_hurt:
+            self.animator.play(self.hurt_clip, self.end_hurt)
+        elif self.is_landing:
+            self.animator.play(self.land_clip, self.end_landing)
+        elif self.is_jumping and not self.is_falling:
+            self.animator.play(self.jump_clip)
+        elif self.is_falling:
+            self.animator.play(self.fall_clip)
+        elif self.is_walking:
+            self.animator.play(self.walk_clip)
+        else:
+            self.animator.play(self.idle_clip)
+        self.animator.flip = not self.is_facing_right
+        self.image = self.animator.image
 
         # Adjust sprite height so that sprite doesn't clip into platform
         bottom = self.rect.bottom
         self.rect = self.image.get_rect()
         self.rect.bottom = bottom
 
+    def end_hurt(self):
+        """
+        Called when the hurt clip has played
+        :return: None
+        """
+        self.is_hurt = False
+
+    def end_landing(self):
+        """
+        Called when the land clip has played
+        :return: None
+        """
+        self.is_landing = False
+
+    def kill(self):
+        """
+        Remove from all groups and stop the animation
+        :return: None
+        """
+        self.animator.release()
+        super().kill()
+
     def apply_platform_collisions(self):
         """
         Check and apply collisions with platforms
@@ -375,7 +249,7 @@ class Player(pygame.sprite.Sprite):
                         self.can_land = False
                         self.is_landing = True
                         # Trigger land fx
-                        PlayerLandFX(self.game, self.pos.x, self.pos.y)
+                        self.game.particles.emit("player_land_fx", self.pos.x, self.pos.y)
             elif self.pos.y > lowest_platform.rect.bottom:
                 self.is_descending = False
             else:
@@ -383,37 +257,16 @@ class Player(pygame.sprite.Sprite):
 
     def scroll_with_screen(self):
         """
-        When player reaches top half of screen, scroll up (move all objects down)
+        When player reaches top half of screen, scroll up (move the camera up with the player)
         :return: None
         """
-        if self.pos.y - self.rect.height <= SCREEN_HEIGHT // 2:
+        if self.pos.y - self.rect.height <= self.game.camera.rect.top + SCREEN_HEIGHT // 2:
             # Used for determining when to spawn new platforms
             self.scroll_dist_plat += abs(self.vel.y)
             self.scroll_dist_pow += abs(self.vel.y)
 
-            # Player moves down
-            self.pos.y += abs(self.vel.y)
-            # Boss moves down
-            self.game.boss.pos.y += abs(self.vel.y)
-            # Platforms move down
-            for plat in self.game.plat_sprites:
-                plat.rect.y += abs(self.vel.y)
-            # Effects move down
-            for fx in self.game.fx_sprites:
-                fx.rect.y += abs(self.vel.y)
-            # Future player moves down
-            self.ft_pos.y += abs(self.vel.y)
-            # Projectiles move down
-            for bullet in self.game.player_proj_sprites:
-                bullet.pos.y += abs(self.vel.y)
-            for bullet in self.game.boss_proj_sprites:
-                bullet.pos.y += abs(self.vel.y)
-            # PowerUps move down
-            for power in self.game.pow_sprites:
-                power.rect.y += abs(self.vel.y)
-            # Enemies move down
-            for enemy in self.game.enemy_sprites:
-                enemy.pos.y += abs(self.vel.y)
+            # Everything else stays where it is in the world
+            self.game.camera.scroll(-abs(self.vel.y))
 
     def check_death_eligibility(self):
         """
@@ -421,41 +274,41 @@ class Player(pygame.sprite.Sprite):
         :return: None
         """
         # If player falls below bottom of screen, screen scrolls down suddenly ...
-        if self.pos.y - self.rect.height > SCREEN_HEIGHT:
+        if self.has_fallen or self.pos.y - self.rect.height > self.game.camera.rect.bottom:
+            self.has_fallen = True  # Keep scrolling even if the camera catches up with the player
+            self.game.camera.scroll(max(self.vel.y, 10))
             for sprite in self.game.all_sprites:
-                sprite.rect.y -= max(self.vel.y, 10)
-                if sprite.rect.bottom < 0:
-                    # ... and dies
+                if sprite.rect.bottom < self.game.camera.rect.top:
+                    # ... and everything above the screen dies
                     sprite.kill()
         # Game over
         if len(self.game.plat_sprites) == 0 or self.health <= 0:
-            self.game.is_playing = False
-            self.game.gui.draw_game_over_menu()
+            self.game.is_playing = False  # Game.run() shows the game over menu
 
     def take_hit(self):
         """
         Interact with enemy projectiles and enemy hitboxes and update health
         :return: None
         """
-        for proj in self.game.boss_proj_sprites:
-            if self.hitbox.colliderect(proj.hitbox):
-                self.is_hurt = True
-                if isinstance(proj, IceShard):
-                    self.health -= 1
-                    pg.mixer.Sound(iceshard_hit_sound).play(0, 1750).set_volume(0.25)
-                    IceShardImpact(self.game, proj.pos.x, proj.pos.y)
-                elif isinstance(proj, FireBall):
-                    self.health -= 2
-                    pg.mixer.Sound(fireball_hit_sound).play()
-                    FireBallImpact(self.game, proj.pos.x, proj.pos.y)
-                proj.kill()
-                #self.sound_fx.hurt.play()
-
-                if self.vel.y < 0:
-                    # Player gets bumped down a bit if jumping
-                    self.vel.y = 5
-                    # Also can't doublejump
-                    self.can_doublejump = False
+        projectiles = self.game.projectiles
+        for proj in projectiles.hits(self.hitbox, LAYER_BOSS_PROJECTILES):
+            self.is_hurt = True
+            if projectiles.kind[proj] == ICESHARD:
+                self.health -= 1
+                self.game.sounds.play("iceshard_hit")
+                self.game.particles.emit("iceshard_impact", projectiles.x[proj], projectiles.y[proj])
+            elif projectiles.kind[proj] == FIREBALL:
+                self.health -= 2
+                self.game.sounds.play("fireball_hit")
+                self.game.particles.emit("fireball_impact", projectiles.x[proj], projectiles.y[proj])
+            projectiles.release(proj)
+            #self.game.sounds.play("hurt")
+
+            if self.vel.y < 0:
+                # Player gets bumped down a bit if jumping
+                self.vel.y = 5
+                # Also can't doublejump
+                self.can_doublejump = False
 
         # Take damage and gets bumped down if touching boss
         if self.hitbox.colliderect(self.game.boss.hitbox) and self.vel.y < 0 and self.game.boss.is_alive:
@@ -464,7 +317,7 @@ class Player(pygame.sprite.Sprite):
             self.vel.y = 5
             # Also can't doublejump
             self.can_doublejump = False
-            self.sound_fx.hurt.play()
+            self.game.sounds.play("hurt")
 
     def update_solo(self):
         """
@@ -474,7 +327,7 @@ class Player(pygame.sprite.Sprite):
         keys = pygame.key.get_pressed()
         self.acc = pygame.Vector2(0, GRAVITY_ACC)
         self.apply_platform_collisions()
-        current_time = pygame.time.get_ticks()
+        current_time = self.game.now
         self.animate()
         self.take_hit()
         self.scroll_with_screen()
@@ -494,8 +347,8 @@ class Player(pygame.sprite.Sprite):
                     self.is_jumping = True  # This does not become false until player lands
                     self.last_jump_time = current_time
                     # Trigger jump fx and jump sound fx
-                    PlayerJumpFX(self.game, self.pos.x, self.pos.y)
-                    self.sound_fx.jump.play()
+                    self.game.particles.emit("player_jump_fx", self.pos.x, self.pos.y)
+                    self.game.sounds.play("jump")
                     self.can_jump = False
             # Partial jump
             if event.type == pygame.KEYUP and self.is_jumping:
@@ -510,8 +363,8 @@ class Player(pygame.sprite.Sprite):
                     self.last_jump_time = current_time
                     self.can_doublejump = False
                     self.vel.y = self.JUMP_VEL
-                    PlayerJumpFX(self.game, self.pos.x, self.pos.y)
-                    self.sound_fx.jump.play()
+                    self.game.particles.emit("player_jump_fx", self.pos.x, self.pos.y)
+                    self.game.sounds.play("jump")
 
         # Descend controls
         if keys[pygame.K_s] and current_time - self.last_descend_time >= self.DESCEND_DELAY:
@@ -1,14 +1,15 @@
 # Name: powerups.py
 # Purpose: Controls the spawning and methods/attributes related to the powerups that spawn on platforms
-# Version: 1.2
+# Version: 1.3
 # Date: 5 June 2020
 # Author(s): Khoa Hoang
-# Dependencies: pygame, random, settings, and paths modules
+# Dependencies: pygame, random, settings, paths, and assets modules
 
 import pygame as pg
 from random import randint, choice
-from settings import SCREEN_WIDTH, SCREEN_HEIGHT
+from settings import SCREEN_WIDTH, LAYER_POWERUPS
 from paths import health_path, ammo_path
+from assets import asset_cache, AUTO
 
 
 class PowerSpawner:
@@ -34,7 +35,7 @@ class PowerSpawner:
                 pow_choice = Ammo(self.game)
             elif pow_choice_str == "health":
                 pow_choice = Health(self.game)
-            pow_choice.rect.center = (randint(0, SCREEN_WIDTH), -pow_choice.rect.h)
+            pow_choice.rect.center = (randint(0, SCREEN_WIDTH), self.game.camera.rect.top - pow_choice.rect.h)
             # Ensures powerups don't spawn inside platforms
             collision = pg.sprite.spritecollideany(pow_choice, self.game.plat_sprites)
             if collision:
@@ -44,15 +45,19 @@ class PowerSpawner:
 
 
 # This class is to be inherited by different powerup types
-class PowerUp(pg.sprite.Sprite):
+class PowerUp(pg.sprite.DirtySprite):
+    _layer = LAYER_POWERUPS
+
     def __init__(self, game):
         """
         PowerUp class to be inherited that update player statistics when player touches them
         :param game: reference to game instance
         """
         super().__init__()
+        self.dirty = 2
         self.game = game
         self.game.all_sprites.add(self)
+        self.game.render_sprites.add(self)
         self.game.pow_sprites.add(self)
 
         self.frames = []
@@ -85,7 +90,7 @@ class PowerUp(pg.sprite.Sprite):
         If platform is below screen, delete from memory
         :return: None
         """
-        if self.rect.top >= SCREEN_HEIGHT:
+        if self.rect.top >= self.game.camera.rect.bottom:
             self.kill()
 
     def give_player(self):
@@ -112,9 +117,7 @@ class Ammo(PowerUp):
         :param game: reference to game instance
         """
         super().__init__(game)
-        self.image = pg.image.load(ammo_path)
-        self.image = pg.transform.scale(self.image, (24, 24))
-        self.image.set_colorkey((255, 255, 255))
+        self.image = asset_cache.load(ammo_path, size=(24, 24), alpha=AUTO, colorkey=(255, 255, 255))
 
     def give_player(self):
         """
@@ -136,9 +139,7 @@ class Health(PowerUp):
         :param game: reference to game instance
         """
         super().__init__(game)
-        self.image = pg.image.load(health_path)
-        self.image = pg.transform.scale(self.image, (24, 24))
-        self.image.set_colorkey((255, 255, 255))
+        self.image = asset_cache.load(health_path, size=(24, 24), alpha=AUTO, colorkey=(255, 255, 255))
 
     def give_player(self):
         """
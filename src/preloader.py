@@ -0,0 +1,73 @@
+# Name: preloader.py
+# Purpose: Decodes and transforms the gameplay assets and sounds on worker threads while the start menu is shown
+# Version: 1.0
+# Date: 18 October 2026
+# Dependencies: concurrent.futures, settings, atlas, backgrounds, and sounds modules
+
+from concurrent.futures import ThreadPoolExecutor
+from settings import *
+from atlas import atlas, ANIMATIONS
+from backgrounds import GlacialBackground
+from sounds import CUES
+
+
+class Preloader:
+    def __init__(self, game):
+        """
+        Loads everything the game needs to start playing in the background; the menu stays responsive meanwhile
+        :param game: reference to game instance
+        """
+        self.game = game
+        self.executor = None
+        self.futures = []
+
+    def tasks(self):
+        """
+        Every asset to load, as (function, args) pairs; results end up in the atlas, asset cache and sound bank
+        :return: list of tasks
+        """
+        tasks = []
+        for i in range(len(GlacialBackground.LAYER_PATHS)):
+            tasks.append((GlacialBackground.load_layer, (i, self.game.render_scale)))
+        for name, anim in ANIMATIONS.items():
+            tasks.append((atlas.frames, (name,)))
+            if anim.get("mirror"):
+                tasks.append((atlas.frames, (name, True)))
+        for name in CUES:
+            tasks.append((self.game.sounds.load, (name,)))
+        return tasks
+
+    def start(self):
+        """
+        Start loading on the thread pool (display mode must be set first)
+        :return: None
+        """
+        self.executor = ThreadPoolExecutor(max_workers=PRELOAD_WORKERS, thread_name_prefix="preloader")
+        self.futures = [self.executor.submit(function, *args) for function, args in self.tasks()]
+
+    @property
+    def progress(self):
+        """
+        :return: fraction of assets loaded (0 to 1)
+        """
+        if not self.futures:
+            return 1
+        return sum(future.done() for future in self.futures) / len(self.futures)
+
+    @property
+    def is_ready(self):
+        """
+        :return: True once everything is loaded
+        """
+        return all(future.done() for future in self.futures)
+
+    def wait(self):
+        """
+        Block until the remaining assets are loaded; errors from the loader threads are raised here
+        :return: None
+        """
+        for future in self.futures:
+            future.result()
+        if self.executor:
+            self.executor.shutdown()
+            self.executor = None
@@ -1,287 +1,246 @@
 # Name: projectiles.py
-# Purpose: Handles all projectile (bullets, fireballs, iceshards) movement and their collisions
-# Version: 1.4
+# Purpose: Handles all projectile (bullets, fireballs, iceshards) movement and their collisions; every projectile is a
+#   row of arrays that are moved, bounced and culled a few array operations at a time
+# Version: 2.0
 # Date: 5 June 2020
 # Author(s): Khoa Hoang
-# Dependencies: pygame, settings, utils, paths, fx, and abc modules
+# Dependencies: numpy, settings, and animation modules
 
 
-import pygame as pg
+import numpy as np
 from settings import *
-from utils import *
-from paths import *
-from fx import *
-from abc import ABC, abstractmethod
-
-
-# To be inherited
-class Projectile(pg.sprite.Sprite, ABC):
-    # vel includes both magnitude and direction
-    def __init__(self, game, pos=(0, 0), vel=(0, 0)):
+from animation import clip
+
+# Projectile types; ProjectileEngine.kind holds the index of the type of each projectile
+BULLET, FIREBALL, ICESHARD = range(3)
+# clip: animation looped while flying (key of atlas.ANIMATIONS)
+# layer: LAYER_PLAYER_PROJECTILES for projectiles that hit the boss and slimes, LAYER_BOSS_PROJECTILES for ones that hit
+#   the player
+# hitbox: (w, h) added to the size of the frame to get the size of the hitbox
+# bounce: True to bounce off the sides of the screen
+# muzzle: effect emitted where the projectile is fired (key of atlas.ANIMATIONS); None for no effect
+PROJECTILE_TYPES = (
+    dict(name="bullet", clip="bullet", layer=LAYER_PLAYER_PROJECTILES, hitbox=(0, 0), bounce=True, muzzle=None),
+    dict(name="fireball", clip="fireball", layer=LAYER_BOSS_PROJECTILES, hitbox=(-55, -55), bounce=False,
+         muzzle="fireball_fx"),
+    dict(name="iceshard", clip="iceshard", layer=LAYER_BOSS_PROJECTILES, hitbox=(-100, -60), bounce=False,
+         muzzle="iceshard_fx"),
+)
+
+
+class ProjectileEngine:
+    def __init__(self, game, capacity=256):
         """
-        Abstract base class for different projectiles
+        Every projectile in flight, stored as arrays; projectiles in use are packed at the front in the order they were
+        fired, so a slot freed by a killed projectile is reused by a later shot without allocating anything
         :param game: reference to game instance
-        :param pos: initial spawn position
-        :param vel: initial spawn position
+        :param capacity: projectiles to make room for at first; doubled whenever it runs out
         """
-        super().__init__()
         self.game = game
-
-        self.game.all_sprites.add(self)
-
-        self.image = pg.Surface((8, 8))
-        self.image.fill((255, 255, 0))
-        self.rect = self.image.get_rect(center=pos)
-
-        self.pos = pg.Vector2(self.rect.center)
-        self.vel = pg.Vector2(vel)
-
-        # For animations and sprites images with child classes
-        self.frames = []
-        self.load_frames()
-        self.last_frame_update = 0
-        self.current_frame = -1
-
-        # Hitbox (Change these statements to adjust hitbox)
-        self.hitbox = None
-
-    def init_hitbox(self, w, h):  # Width and height of hitbox: CALL THIS METHOD IN CHILD CLASS
+        self.count = 0  # Slots in use (projectiles in flight and ones killed since the last update)
+        self.x = np.zeros(capacity, np.float64)  # World position of the center
+        self.y = np.zeros(capacity, np.float64)
+        self.vx = np.zeros(capacity, np.float64)
+        self.vy = np.zeros(capacity, np.float64)
+        self.w = np.zeros(capacity, np.float64)  # Hitbox size
+        self.h = np.zeros(capacity, np.float64)
+        self.kind = np.zeros(capacity, np.int32)  # Index of PROJECTILE_TYPES
+        self.start = np.zeros(capacity, np.int64)  # Game.now when fired; used for the animation
+        self.alive = np.zeros(capacity, bool)
+
+        # Per type arrays, indexed by kind (filled by load() once the atlas can be used)
+        self.frames = None  # Frames of every type, one type after the other
+        self.type_first = None  # Index of the first frame of the type in self.frames
+        self.type_length = None
+        self.type_delay = None
+        self.type_w = None  # Frame size
+        self.type_h = None
+        self.type_hitbox_w = None
+        self.type_hitbox_h = None
+        self.type_layer = None
+        self.type_bounce = None
+
+        # Stats
+        self.fired = [0] * len(PROJECTILE_TYPES)
+        self.high_water = [0] * len(PROJECTILE_TYPES)  # Most projectiles of each type in flight at once
+        self.grows = 0
+
+    def load(self):
         """
-        Initialize size of hitbox
-        :param w: width of hitbox
-        :param h: height of hitbox
+        Fill the per type arrays from the animation clips
         :return: None
         """
-        self.hitbox = pg.Rect((self.rect.centerx - w // 2, self.rect.centery - h // 2),
-                              (w, h))  # Center the hitbox on the projectile sprite
-
-    def load_frames(self):
+        frames, first, length, delay, size = [], [], [], [], []
+        for ptype in PROJECTILE_TYPES:
+            type_clip = clip(ptype["clip"])
+            first.append(len(frames))
+            length.append(len(type_clip.frames))
+            delay.append(type_clip.delay)
+            size.append(type_clip.frames[0].get_size())
+            frames.extend(type_clip.frames)
+        self.frames = frames
+        self.type_first = np.array(first, np.int32)
+        self.type_length = np.array(length, np.int32)
+        self.type_delay = np.array(delay, np.float64)
+        self.type_w = np.array([w for w, h in size], np.float64)
+        self.type_h = np.array([h for w, h in size], np.float64)
+        self.type_hitbox_w = self.type_w + [ptype["hitbox"][0] for ptype in PROJECTILE_TYPES]
+        self.type_hitbox_h = self.type_h + [ptype["hitbox"][1] for ptype in PROJECTILE_TYPES]
+        self.type_layer = np.array([ptype["layer"] for ptype in PROJECTILE_TYPES], np.int32)
+        self.type_bounce = np.array([ptype["bounce"] for ptype in PROJECTILE_TYPES], bool)
+
+    def grow(self):
         """
-        Load images into frame lists
+        Double the room for projectiles
         :return: None
         """
-        pass
+        for name in ("x", "y", "vx", "vy", "w", "h", "kind", "start", "alive"):
+            array = getattr(self, name)
+            setattr(self, name, np.concatenate((array, np.zeros_like(array))))
+        self.grows += 1
 
-    def cleanup(self):
+    def acquire(self, kind, pos, vel):
         """
-        Remove bullet from memory if it is above or below the top or bottom of screen, respectively
-        :return: None
+        Fire a projectile
+        :param kind: BULLET, FIREBALL or ICESHARD
+        :param pos: spawn position (center)
+        :param vel: velocity (magnitude and direction)
+        :return: index of the projectile (valid until the next update())
         """
-        if self.pos.y < -self.rect.h/2 or self.pos.y > SCREEN_HEIGHT + self.rect.h/2:
-            self.kill()
-
-    def move(self):
+        if self.frames is None:
+            self.load()
+        if self.count == len(self.x):
+            self.grow()
+        i = self.count
+        self.x[i], self.y[i] = pos[0], pos[1]
+        self.vx[i], self.vy[i] = vel[0], vel[1]
+        self.w[i] = self.type_hitbox_w[kind]
+        self.h[i] = self.type_hitbox_h[kind]
+        self.kind[i] = kind
+        self.start[i] = self.game.now
+        self.alive[i] = True
+        self.count += 1
+        self.fired[kind] += 1
+
+        muzzle = PROJECTILE_TYPES[kind]["muzzle"]
+        if muzzle:
+            self.game.particles.emit(muzzle, pos[0], pos[1])
+        return i
+
+    def release(self, i):
         """
-        Move projectile
+        Kill a projectile; its slot is reused after the next update()
+        :param i: index of the projectile
         :return: None
         """
-        self.pos += self.vel
-        self.rect.center = self.pos
-        self.hitbox.center = self.pos
+        self.alive[i] = False
 
-    def animate(self):
+    def update(self):
         """
-        Animate Projectile
+        Pack out killed projectiles, then move every projectile, bounce bullets off the sides of the screen and kill
+        projectiles that left the top or bottom of the screen
         :return: None
         """
-        pass
-
-    def update(self):
+        n = self.count
+        if not n:
+            return
+        alive = self.alive[:n]
+        if not alive.all():
+            keep = np.flatnonzero(alive)
+            n = len(keep)
+            for array in (self.x, self.y, self.vx, self.vy, self.w, self.h, self.kind, self.start, self.alive):
+                array[:n] = array[keep]
+            self.count = n
+        x, y, vx, vy, kind = self.x[:n], self.y[:n], self.vx[:n], self.vy[:n], self.kind[:n]
+
+        # Move
+        x += vx
+        y += vy
+
+        # Bounce on sides of screen
+        half_w = self.type_w[kind] / 2
+        bounces = self.type_bounce[kind]
+        left = bounces & (x <= half_w)
+        right = bounces & (x >= SCREEN_WIDTH - half_w)
+        if left.any() or right.any():
+            vx[left | right] *= -1
+            for i in np.flatnonzero(left):
+                self.game.particles.emit("bullet_bounce", x[i], y[i], flip=True)
+                self.game.sounds.play("bullet_bounce")
+            for i in np.flatnonzero(right):
+                self.game.particles.emit("bullet_bounce", x[i], y[i])
+                self.game.sounds.play("bullet_bounce")
+
+        # Remove projectiles above or below the screen
+        camera_rect = self.game.camera.rect
+        half_h = self.type_h[kind] / 2
+        alive = self.alive[:n]
+        alive &= (y >= camera_rect.top - half_h) & (y <= camera_rect.bottom + half_h)
+
+        in_flight = np.bincount(kind[alive], minlength=len(PROJECTILE_TYPES))
+        self.high_water = [max(high, int(live)) for high, live in zip(self.high_water, in_flight)]
+
+    def hits(self, rect, layer):
+        """
+        Find the projectiles whose hitbox overlaps a rect
+        :param rect: hitbox of a character
+        :param layer: LAYER_PLAYER_PROJECTILES or LAYER_BOSS_PROJECTILES
+        :return: list of indices of projectiles
+        """
+        n = self.count
+        if not n:
+            return []
+        x, y, half_w, half_h = self.x[:n], self.y[:n], self.w[:n] / 2, self.h[:n] / 2
+        overlaps = self.alive[:n] & (self.type_layer[self.kind[:n]] == layer) & \
+            (x - half_w < rect.right) & (x + half_w > rect.left) & (y - half_h < rect.bottom) & (y + half_h > rect.top)
+        return np.flatnonzero(overlaps).tolist()
+
+    def sequence(self, layer, view, top, scale=1, scale_image=None):
+        """
+        (image, position) pairs of the projectiles of a layer inside a rect of the world, for a blits() call
+        :param layer: LAYER_PLAYER_PROJECTILES or LAYER_BOSS_PROJECTILES
+        :param view: rect of the world to draw projectiles in
+        :param top: y of the world at the top of the surface drawn on
+        :param scale: size of the surface drawn on relative to the screen
+        :param scale_image: function(image, scale) returning a scaled image, used when scale isn't 1
+        :return: list of (image, position) pairs, in the order the projectiles were fired
+        """
+        n = self.count
+        if not n:
+            return []
+        kind = self.kind[:n]
+        in_layer = self.alive[:n] & (self.type_layer[kind] == layer)
+        w, h = self.type_w[kind], self.type_h[kind]
+        left = self.x[:n] - w / 2
+        top_edge = self.y[:n] - h / 2
+        visible = in_layer & (left < view.right) & (left + w > view.left) & \
+            (top_edge < view.bottom) & (top_edge + h > view.top)
+        drawn = int(np.count_nonzero(visible))
+        self.game.frame_stats.drawn[layer] += drawn
+        self.game.frame_stats.culled[layer] += int(np.count_nonzero(in_layer)) - drawn
+
+        kind = kind[visible]
+        delay = self.type_delay[kind] * self.game.animation_scale
+        frame = (self.game.now - self.start[:n][visible]) // delay % self.type_length[kind]
+        images = (self.type_first[kind] + frame.astype(np.int32)).tolist()
+        xs = (left[visible] * scale).astype(int).tolist()
+        ys = ((top_edge[visible] - top) * scale).astype(int).tolist()
+        frames = self.frames
+        if scale == 1:
+            return [(frames[i], (px, py)) for i, px, py in zip(images, xs, ys)]
+        return [(scale_image(frames[i], scale), (px, py)) for i, px, py in zip(images, xs, ys)]
+
+    def clear(self):
         """
-        Update projectile using initalized functions
+        Remove every projectile
         :return: None
         """
-        self.cleanup()
-        self.move()
-        self.animate()
-
-
-class BulletImpact(FX):
-    def __init__(self, game, x, y):
-        super().__init__(game, x, y)
-
-        self.image = self.frames[0]
-        self.rect = self.image.get_rect(center=(x, y))
-
-        self.frame_delay = 50
-
-    def load_frames(self):
-        sheet = SpriteSheet(bulletimpact)
-        for i in range(0, 8):
-            self.frames.append(sheet.get_sprite(i * 48, 0, 48, 48))
-            self.frames[i] = pg.transform.scale(self.frames[i], (40, 40))
-
-
-class BulletBounceFX(FX):
-    # bounce_off is a string that determines whether the left or right sprite will be loaded
-    def __init__(self, game, x, y, bounce_off):
-        self.bounce_off = bounce_off
-        super().__init__(game, x, y)
-
-        self.image = self.frames[0]
-        self.rect = self.image.get_rect(center=(x, y))
-
-    def load_frames(self):
-        if self.bounce_off == "left":
-            for filepath in bulletbounce:
-                img = pg.image.load(filepath).convert_alpha()
-                img = pg.transform.scale(img, (40, 40))
-                img = pg.transform.flip(img, True, False)
-                self.frames.append(img)
-        elif self.bounce_off == "right":
-            for filepath in bulletbounce:
-                img = pg.image.load(filepath).convert_alpha()
-                img = pg.transform.scale(img, (40, 40))
-                self.frames.append(img)
-
-
-class Bullet(Projectile):
-    def __init__(self, game, pos=(0, 0), vel=(0, 0)):
-        super().__init__(game, pos, vel)
-
-        self.game.player_proj_sprites.add(self)
-
-        self.image = self.frames[0]
-        self.rect = self.image.get_rect(center=pos)
-
-        self.init_hitbox(self.rect.w, self.rect.h)
-
-    def load_frames(self):
-        for filepath in bullet_path:
-            img = pg.image.load(filepath).convert_alpha()
-            img = pg.transform.scale(img, (20, 20))
-            self.frames.append(img)
-
-    def animate(self):
-        current_time = pg.time.get_ticks()
-        if current_time - self.last_frame_update > 100:
-            self.last_frame_update = current_time
-            self.current_frame = (self.current_frame + 1) % len(self.frames)
-            self.image = self.frames[self.current_frame]
-
-    def bounce(self):
-        """ Bounce on sides of screen """
-        if self.pos.x <= self.rect.w / 2:
-            self.vel.x = -self.vel.x
-            BulletBounceFX(self.game, self.pos.x, self.pos.y, "left")
-            pg.mixer.Sound(fireball_hit_sound).play()
-        if self.pos.x >= SCREEN_WIDTH - self.rect.w / 2:
-            self.vel.x = -self.vel.x
-            BulletBounceFX(self.game, self.pos.x, self.pos.y, "right")
-            pg.mixer.Sound(fireball_hit_sound).play()
-
-    def update(self):
-        super().update()
-        self.bounce()
-
-
-class FireBallFX(FX):
-    def __init__(self, game, x, y):
-        super().__init__(game, x, y)
-
-        self.image = self.frames[0]
-        self.rect = self.image.get_rect(midtop=(x, y))
-
-        self.frame_delay = 50
-
-    def load_frames(self):
-        sheet = SpriteSheet(fireballfx)
-        for i in range(0, 12):
-            self.frames.append(sheet.get_sprite(i * 128, 0, 128, 128))
-            self.frames[i] = pg.transform.scale(self.frames[i], (80, 80))
-            self.frames[i] = pg.transform.flip(self.frames[i], False, True)
-
-
-class FireBallImpact(FX):
-    def __init__(self, game, x, y):
-        super().__init__(game, x, y)
-
-        self.image = self.frames[0]
-        self.rect = self.image.get_rect(center=(x, y))
-
-    def load_frames(self):
-        sheet = SpriteSheet(fireballimpact)
-        for i in range(0, 8):
-            self.frames.append(sheet.get_sprite(i * 64, 0, 64, 64))
-            self.frames[i] = pg.transform.scale(self.frames[i], (80, 80))
-
-
-class FireBall(Projectile):
-    def __init__(self, game, pos=(0, 0), vel=(0, 0)):
-        super().__init__(game, pos, vel)
-
-        self.game.boss_proj_sprites.add(self)
-
-        FireBallFX(game, pos[0], pos[1])
-
-        self.image = self.frames[0]
-        self.rect = self.image.get_rect(midtop=pos)
-
-        self.init_hitbox(self.rect.w - 55, self.rect.h - 55)
-
-    def load_frames(self):
-        for filepath in fireball:
-            img = pg.image.load(filepath).convert()
-            img = pg.transform.scale2x(img)
-            img = pg.transform.rotate(img, -90)
-            self.frames.append(img)
-
-    def animate(self):
-        current_time = pg.time.get_ticks()
-        if current_time - self.last_frame_update > 100:
-            self.last_frame_update = current_time
-            self.current_frame = (self.current_frame + 1) % len(self.frames)
-            self.image = self.frames[self.current_frame]
-
-
-class IceShardFX(FX):
-    def __init__(self, game, x, y):
-        super().__init__(game, x, y)
-
-        self.image = self.frames[0]
-        self.rect = self.image.get_rect(center=(x, y))
-
-    def load_frames(self):
-        for filepath in iceshardfx:
-            img = pg.image.load(filepath).convert_alpha()
-            img = pg.transform.scale(img, (96, 96))
-            img = pg.transform.rotate(img, -90)
-            self.frames.append(img)
-
-
-class IceShardImpact(FX):
-    def __init__(self, game, x, y):
-        super().__init__(game, x, y)
-
-        self.image = self.frames[0]
-        self.rect = self.image.get_rect(center=(x, y))
-
-        self.frame_delay = 200
-
-    def load_frames(self):
-        for filepath in iceshardimpact:
-            img = pg.image.load(filepath).convert_alpha()
-            img = pg.transform.scale(img, (96, 96))
-            img = pg.transform.rotate(img, -90)
-            self.frames.append(img)
-
-
-class IceShard(Projectile):
-    def __init__(self, game, pos=(0, 0), vel=(0, 0)):
-        super().__init__(game, pos, vel)
-
-        self.game.boss_proj_sprites.add(self)
-
-        IceShardFX(game, pos[0], pos[1])
-
-        self.image = self.frames[0]
-        self.rect = self.image.get_rect(center=pos)
-
-        self.init_hitbox(self.rect.w - 100, self.rect.h - 60)
-
-    def load_frames(self):
-        img = pg.image.load(iceshard).convert_alpha()
-        img = pg.transform.scale(img, (96, 96))
-        img = pg.transform.rotate(img, -90)
-        self.frames.append(img)
+        self.count = 0
 
+    def report(self):
+        """
+        :return: string with projectile stats for each type
+        """
+        counts = ", ".join("{} {} fired/{} in flight at most".format(ptype["name"], fired, high)
+                           for ptype, fired, high in zip(PROJECTILE_TYPES, self.fired, self.high_water))
+        return "ProjectileEngine: {}; room for {} ({} grows)".format(counts, len(self.x), self.grows)
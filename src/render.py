@@ -0,0 +1,219 @@
+# Name: render.py
+# Purpose: Renderers for the gameplay loop; a render queue that culls sprites outside the screen and draws the rest in
+#   layer order with one blits() call, and a dirty rectangle renderer that only redraws and pushes the parts of the
+#   screen that changed
+# Version: 1.5
+# Date: 18 October 2026
+# Dependencies: pygame, collections, weakref, and settings modules
+
+import pygame as pg
+from collections import defaultdict
+from weakref import WeakKeyDictionary
+from settings import *
+
+# Names of the sprite layers in reports
+LAYER_NAMES = {
+    LAYER_PLATFORMS: "platforms",
+    LAYER_CHARACTERS: "characters",
+    LAYER_GUNS: "guns",
+    LAYER_POWERUPS: "powerups",
+    LAYER_FX: "fx",
+    LAYER_PLAYER_PROJECTILES: "player projectiles",
+    LAYER_BOSS_PROJECTILES: "boss projectiles",
+}
+
+# Layers drawn from arrays instead of sprites: effects (particles.py) and projectiles (projectiles.py), bottom first
+BATCH_LAYERS = (LAYER_FX, LAYER_PLAYER_PROJECTILES, LAYER_BOSS_PROJECTILES)
+
+
+class FrameStats:
+    def __init__(self):
+        """
+        Counters collected while drawing frames, reported when the game exits
+        """
+        self.frames = 0
+        self.drawn = defaultdict(int)   # Layer -> sprites drawn over all frames
+        self.culled = defaultdict(int)  # Layer -> sprites skipped for being outside the screen
+        self.fx_dropped = 0  # FX not shown because of the quality governor's limit
+
+    def new_frame(self):
+        """
+        Count a frame
+        :return: None
+        """
+        self.frames += 1
+
+    def report(self):
+        """
+        :return: string with the average number of sprites drawn and culled per frame for each layer
+        """
+        if not self.frames:
+            return "FrameStats: no frames drawn"
+        layers = sorted(set(self.drawn) | set(self.culled))
+        counts = ", ".join("{} {:.1f}/{:.1f}".format(LAYER_NAMES.get(layer, layer), self.drawn[layer] / self.frames,
+                                                     self.culled[layer] / self.frames) for layer in layers)
+        return "FrameStats: {} frames; drawn/culled sprites per frame: {}; {} FX dropped".format(
+            self.frames, counts, self.fx_dropped)
+
+
+class RenderQueue:
+    def __init__(self, game):
+        """
+        Draws every sprite in game.render_sprites in layer order; the layer of a sprite is declared by its class
+        (_layer attribute, see the LAYER_* constants in settings); sprites are in world coordinates and are moved by
+        the camera's offset as they are drawn
+        :param game: reference to game instance
+        """
+        self.game = game
+        self.sequence = []  # (image, position) pairs of the frame being drawn, reused so it isn't allocated every frame
+        self.scaled_images = WeakKeyDictionary()  # Sprite image -> image scaled by scaled_images_scale
+        self.scaled_images_scale = 1
+
+    def cull(self):
+        """
+        Hide the sprites that are outside the screen (plus CULL_MARGIN) and show the rest; both renderers skip hidden
+        sprites
+        :return: None
+        """
+        view = self.game.camera.rect.inflate(CULL_MARGIN * 2, CULL_MARGIN * 2)
+        drawn = self.game.frame_stats.drawn
+        culled = self.game.frame_stats.culled
+        for sprite in self.game.render_sprites.sprites():
+            if view.colliderect(sprite.rect):
+                sprite.visible = 1
+                drawn[sprite.layer] += 1
+            else:
+                sprite.visible = 0
+                culled[sprite.layer] += 1
+
+    def scaled_image(self, image, scale):
+        """
+        Get a sprite image scaled for a smaller surface than the screen; scaled once per image
+        :param image: sprite image
+        :param scale: size of the surface drawn on relative to the screen
+        :return: pygame Surface
+        """
+        if scale != self.scaled_images_scale:
+            self.scaled_images.clear()
+            self.scaled_images_scale = scale
+        scaled = self.scaled_images.get(image)
+        if scaled is None:
+            w, h = image.get_size()
+            scaled = pg.transform.scale(image, (max(1, round(w * scale)), max(1, round(h * scale))))
+            if scaled.get_colorkey():
+                scaled.set_colorkey(scaled.get_colorkey(), pg.RLEACCEL)
+            self.scaled_images[image] = scaled
+        return scaled
+
+    def batch(self, layer, view, top, scale):
+        """
+        Images and positions of the things drawn as one of BATCH_LAYERS without being sprites
+        :param layer: one of BATCH_LAYERS
+        :param view: rect of the world to draw in
+        :param top: y of the world at the top of the surface drawn on
+        :param scale: size of the surface drawn on relative to the screen
+        :return: list of (image, position) pairs
+        """
+        if layer == LAYER_FX:
+            return self.game.particles.sequence(view, top, scale, self.scaled_image)
+        return self.game.projectiles.sequence(layer, view, top, scale, self.scaled_image)
+
+    def draw(self, surface, return_rects=False):
+        """
+        Collect the image and screen position of every visible sprite, bottom layer first, and blit them all in one call;
+        effects and projectiles are added to the sequence as their layers (see BATCH_LAYERS)
+        :param surface: screen, or the smaller surface the world is drawn on (see Game.set_resolution())
+        :param return_rects: True to return the rects that were drawn on
+        :return: list of rects of surface that were drawn on if return_rects else None
+        """
+        sequence = self.sequence
+        sequence.clear()
+        scale = self.game.render_scale
+        top = self.game.camera.rect.top
+        starts = []  # Where the sprites above each batch layer start
+        # LayeredDirty keeps its sprites sorted by layer, then by when they were added
+        if scale == 1:
+            for sprite in self.game.render_sprites.sprites():
+                if sprite.visible:
+                    while len(starts) < len(BATCH_LAYERS) and sprite.layer > BATCH_LAYERS[len(starts)]:
+                        starts.append(len(sequence))
+                    sequence.append((sprite.image, (sprite.rect.x, sprite.rect.y - top)))
+        else:
+            for sprite in self.game.render_sprites.sprites():
+                if sprite.visible:
+                    while len(starts) < len(BATCH_LAYERS) and sprite.layer > BATCH_LAYERS[len(starts)]:
+                        starts.append(len(sequence))
+                    sequence.append((self.scaled_image(sprite.image, scale),
+                                     (int(sprite.rect.x * scale), int((sprite.rect.y - top) * scale))))
+        starts += [len(sequence)] * (len(BATCH_LAYERS) - len(starts))
+        view = self.game.camera.rect.inflate(CULL_MARGIN * 2, CULL_MARGIN * 2)
+        # Top layer first so that the starts of the layers below stay right
+        for layer, start in reversed(list(zip(BATCH_LAYERS, starts))):
+            sequence[start:start] = self.batch(layer, view, top, scale)
+        if return_rects:
+            return surface.blits(sequence)
+        surface.blits(sequence, doreturn=False)
+
+
+class DirtyRenderer:
+    def __init__(self, game):
+        """
+        Draws the sprites (with game.render_queue) and the HUD over a copy of the background kept in self.canvas, which
+        is used to erase them where they were drawn last frame; falls back to a full update when the parallax scrolls
+        :param game: reference to game instance
+        """
+        self.game = game
+        self.canvas = pg.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()  # Background without sprites or HUD
+        self.sprite_rects = []  # Screen rects drawn on last frame; erased and redrawn every frame
+        self.hud_rects = []
+        self.needs_full_update = True
+        # Stats
+        self.frames = 0
+        self.full_updates = 0
+        self.pixels = 0  # Pixels pushed to the display
+
+    def invalidate(self):
+        """
+        Redraw the whole screen next frame (ex: after a menu has been drawn over it)
+        :return: None
+        """
+        self.needs_full_update = True
+        self.game.background.drawn_pos = None
+
+    def draw(self):
+        """
+        Draw the frame and update the changed parts of the display
+        :return: None
+        """
+        screen = self.game.screen
+        screen_rect = screen.get_rect()
+        background_rects = self.game.background.draw_dirty(self.canvas)
+        is_full = self.needs_full_update or background_rects == [screen_rect]
+        # Restore the background where it changed and where sprites and HUD were drawn last frame ...
+        erased = [screen_rect] if is_full else background_rects + self.sprite_rects + self.hud_rects
+        screen.blits([(self.canvas, rect, rect) for rect in erased], doreturn=False)
+        # ... then draw all of them again at their new positions
+        self.sprite_rects = self.game.render_queue.draw(screen, True)
+        self.hud_rects = self.game.draw_hud()
+
+        if is_full:
+            pg.display.update()
+            self.full_updates += 1
+            self.pixels += screen_rect.w * screen_rect.h
+        else:
+            rects = erased + self.sprite_rects + self.hud_rects
+            pg.display.update(rects)
+            self.pixels += sum(rect.w * rect.h for rect in rects)
+        self.needs_full_update = False
+        self.frames += 1
+
+    def report(self):
+        """
+        :return: string with how much of the screen was pushed to the display
+        """
+        if not self.frames:
+            return "DirtyRenderer: no frames drawn"
+        screen_pixels = SCREEN_WIDTH * SCREEN_HEIGHT
+        return "DirtyRenderer: {} frames, {} full updates ({:.1f}%), {:.1f}% of screen pushed per frame".format(
+            self.frames, self.full_updates, self.full_updates / self.frames * 100,
+            self.pixels / self.frames / screen_pixels * 100)
@@ -10,9 +10,72 @@ SCREEN_TITLE = "ROGUE ROBOT RAMBO"
 SCREEN_WIDTH, SCREEN_HEIGHT = 1280, 720
 MAX_FPS = 60
 
+# Rendering
+DIRTY_RENDERING = True  # Only redraw and push the parts of the screen that changed (see render.py)
+INTERNAL_RESOLUTION = None  # (w, h) to draw the world at before scaling it to the screen (ex: (640, 360)); None for native
+FULL_REDRAW_FRACTION = 0.5  # Redraw and push the whole screen when the changed parts cover more than this
+BACKGROUND_STABLE_FRAMES = 10  # Frames a background layer has to stay still before it is cached
+BACKGROUND_REGION_FRACTION = 0.25  # Cached layers moving over more of the screen than this are taken out of the cache
+CULL_MARGIN = 32  # Sprites further than this outside the screen are not drawn
+# Draw order of sprites (higher is drawn on top)
+LAYER_PLATFORMS = 0
+LAYER_CHARACTERS = 1
+LAYER_GUNS = 2
+LAYER_POWERUPS = 3
+LAYER_FX = 4
+LAYER_PLAYER_PROJECTILES = 5
+LAYER_BOSS_PROJECTILES = 6
+
+# Quality governor (see governor.py)
+QUALITY_GOVERNOR = True  # Lower the quality when frames take longer than 1 / MAX_FPS
+GOVERNOR_WINDOW = 60  # Number of recent frame times looked at
+GOVERNOR_DOWN_LOAD = 1.0  # Step down when the median frame time is above this fraction of the frame budget
+GOVERNOR_UP_LOAD = 0.6  # Step up when the median frame time stays below this fraction of the frame budget ...
+GOVERNOR_UP_FRAMES = 300  # ... for this many frames
+# Quality levels stepped through in order, full quality first; keys left out keep their full quality value
+#   layers: number of background layers drawn (from the bottom); None for all
+#   max_fx: most FX alive at once; None for no limit
+#   animation_scale: multiplies the delay between animation frames
+#   resolution: internal resolution (see INTERNAL_RESOLUTION); never higher than the one the game was started with
+QUALITY_LEVELS = (
+    {},
+    {"layers": 6},
+    {"layers": 5},
+    {"layers": 5, "max_fx": 8},
+    {"layers": 5, "max_fx": 8, "animation_scale": 2},
+    {"layers": 5, "max_fx": 8, "animation_scale": 2, "resolution": (960, 540)},
+    {"layers": 5, "max_fx": 8, "animation_scale": 2, "resolution": (640, 360)},
+)
+
+# Platforms
+PLATFORM_WIDTH_STEP = 32  # Random platform widths are multiples of this
+
+# Assets
+ASSET_DISK_CACHE = True  # Keep decoded and transformed images in bin/cache to speed up the next launch
+PRELOAD_WORKERS = 4      # Threads that load gameplay assets while the start menu is shown
+BLIT_COST_REPEAT = 10    # Blits timed per image when choosing its format
+
+# Sound
+MIXER_FREQUENCY = 44100
+MIXER_SIZE = -16         # Signed 16-bit samples
+MIXER_CHANNELS = 2       # Stereo
+MIXER_BUFFER = 512       # Samples per mixer buffer; lower means less latency but more risk of crackling
+MIXER_NUM_CHANNELS = 16  # Fixed number of voices that can play at once
+LATENCY_SAMPLES = 200    # Number of recent sound triggers used for the latency report
+
+# Logging
+LOG_LEVEL = "INFO"
+
+# Text
+TEXT_CACHE_ENTRIES = 256        # Rendered text surfaces kept by gui.text_cache
+TEXT_CACHE_BYTES = 4 * 2 ** 20  # Bytes of rendered text kept by gui.text_cache
+
 # Fonts
 FONT_NAME = "arial"
 
+# Menus
+MENU_REFRESH_MS = 100  # Longest a menu waits for input before redrawing (keeps the loading bar moving)
+
 # Environmental properties
 GRAVITY_ACC = 0.8  # Try to keep close to 1 else the player twitches up and down on platforms
 WIND_VEL = 0  # Not used yet
@@ -0,0 +1,178 @@
+# Name: sounds.py
+# Purpose: Sound bank that decodes every sound effect once and plays named cues on reserved channel groups with
+#   limits on how many voices play at once
+# Version: 1.0
+# Date: 18 October 2026
+# Dependencies: pygame, logging, time, paths, and settings modules
+
+import logging
+import time
+import pygame as pg
+from paths import *
+from settings import *
+
+log = logging.getLogger(__name__)
+
+# Named sound cues
+# "path" of sound file, "group" of channels to play on, optional "volume" (0 to 1), "maxtime" (ms),
+# "priority" (higher cuts off lower when a group is full) and "max_voices" (instances of cue playing at once)
+CUES = {
+    # Player
+    "jump": dict(path=jump_sound_path, group="player", priority=2),
+    "hurt": dict(path=pain_sound_path, group="player", priority=3),
+    # Boss attacks
+    "fireball": dict(path=fireball_sound, group="boss", volume=0.5, priority=2),
+    "iceshard": dict(path=iceshard_sound, group="boss", volume=0.75, priority=2),
+    # Impacts
+    "fireball_hit": dict(path=fireball_hit_sound, group="impacts", priority=3, max_voices=2),
+    "iceshard_hit": dict(path=iceshard_hit_sound, group="impacts", volume=0.25, maxtime=1750, priority=3,
+                         max_voices=2),
+    "boss_hit": dict(path=fireball_hit_sound, group="impacts", priority=2, max_voices=2),
+    "bullet_bounce": dict(path=fireball_hit_sound, group="impacts", priority=1, max_voices=1),
+}
+DEFAULT_PRIORITY = 1
+DEFAULT_MAX_VOICES = 2
+
+# Number of reserved channels in each group; cues of one group never cut off sounds of another group
+CHANNEL_GROUPS = {"player": 2, "boss": 2, "impacts": 4}
+
+
+class SoundBank:
+    @staticmethod
+    def pre_init():
+        """
+        Set mixer format and buffer size; call before pg.init() (smaller buffer = lower latency but more CPU)
+        :return: None
+        """
+        pg.mixer.pre_init(MIXER_FREQUENCY, MIXER_SIZE, MIXER_CHANNELS, MIXER_BUFFER)
+
+    def __init__(self):
+        """
+        Holds one decoded Sound per sound file; pygame converts samples to the mixer's format when decoding,
+        so nothing is decoded or resampled while playing
+        Also works as a voice manager: cues triggered during a frame are queued, merged and played by update()
+        """
+        self.sounds = {}    # path -> pg.mixer.Sound
+        self.groups = {}    # group name -> list of pg.mixer.Channel
+        self.voices = {}    # channel -> (cue name, priority, time started) of what it is playing
+        self.queued = {}    # cue name -> time of first trigger this frame
+        # Stats
+        self.merged = 0
+        self.dropped = 0
+        self.stolen = 0
+        self.latencies = []  # ms from trigger to sound reaching the mixer buffer, for the last triggers
+        self.buffer_latency = 0  # ms of sound the mixer buffer holds
+        self.is_enabled = pg.mixer.get_init() is not None  # No audio device means no sounds
+        if self.is_enabled:
+            self.reserve_channels()
+            frequency = pg.mixer.get_init()[0]
+            self.buffer_latency = MIXER_BUFFER / frequency * 1000
+
+    def reserve_channels(self):
+        """
+        Use a fixed number of mixer channels and reserve the first ones for the channel groups
+        :return: None
+        """
+        total = sum(CHANNEL_GROUPS.values())
+        pg.mixer.set_num_channels(max(MIXER_NUM_CHANNELS, total))
+        pg.mixer.set_reserved(total)
+        index = 0
+        for group, count in CHANNEL_GROUPS.items():
+            self.groups[group] = [pg.mixer.Channel(i) for i in range(index, index + count)]
+            index += count
+
+    def load(self, name):
+        """
+        Decode the sound of a cue (if it isn't already); safe to call from the preloader threads
+        :param name: key of CUES
+        :return: pg.mixer.Sound; None if sound is disabled
+        """
+        if not self.is_enabled:
+            return None
+        path = CUES[name]["path"]
+        sound = self.sounds.get(path)
+        if sound is None:
+            sound = pg.mixer.Sound(path)
+            self.sounds[path] = sound
+        return sound
+
+    def load_all(self):
+        """
+        Decode the sounds of every cue
+        :return: None
+        """
+        for name in CUES:
+            self.load(name)
+
+    def play(self, name):
+        """
+        Trigger a cue; it starts playing on the next update() and triggers of the same cue in one frame are merged
+        :param name: key of CUES
+        :return: None
+        """
+        if not self.is_enabled:
+            return
+        if name in self.queued:
+            self.merged += 1
+        else:
+            self.queued[name] = time.perf_counter()
+
+    def find_channel(self, name):
+        """
+        Pick the channel to play a cue on: steals the oldest voice of the cue if it is at its voice limit,
+        else a free channel of its group, else the lowest priority (then oldest) voice of the group if its
+        priority isn't higher than the cue's
+        :param name: key of CUES
+        :return: pg.mixer.Channel; None if the cue should be dropped
+        """
+        cue = CUES[name]
+        priority = cue.get("priority", DEFAULT_PRIORITY)
+        channels = self.groups[cue["group"]]
+        busy = [channel for channel in channels if channel.get_busy() and channel in self.voices]
+        same_cue = [channel for channel in busy if self.voices[channel][0] == name]
+        if len(same_cue) >= cue.get("max_voices", DEFAULT_MAX_VOICES):
+            return min(same_cue, key=lambda channel: self.voices[channel][2])
+        for channel in channels:
+            if not channel.get_busy():
+                return channel
+        lowest = min(busy, key=lambda channel: self.voices[channel][1:]) if busy else None
+        if lowest is not None and self.voices[lowest][1] <= priority:
+            return lowest
+        return None
+
+    def update(self):
+        """
+        Play the cues triggered since the last update, highest priority first; call once per frame
+        :return: None
+        """
+        if not self.queued:
+            return
+        queued = sorted(self.queued.items(), key=lambda item: -CUES[item[0]].get("priority", DEFAULT_PRIORITY))
+        self.queued = {}
+        for name, triggered in queued:
+            cue = CUES[name]
+            channel = self.find_channel(name)
+            if channel is None:
+                self.dropped += 1
+                continue
+            if channel.get_busy():
+                self.stolen += 1
+            channel.play(self.load(name), maxtime=cue.get("maxtime", 0))
+            channel.set_volume(cue.get("volume", 1))
+            now = time.perf_counter()
+            self.voices[channel] = (name, cue.get("priority", DEFAULT_PRIORITY), now)
+            self.latencies.append((now - triggered) * 1000)
+        del self.latencies[:-LATENCY_SAMPLES]
+
+    def latency_report(self):
+        """
+        Trigger-to-audible latency = measured time until the sound reaches the mixer + length of mixer buffer
+        :return: string with latency and voice stats
+        """
+        if not self.latencies:
+            return "SoundBank: no sounds played"
+        average = sum(self.latencies) / len(self.latencies)
+        return "SoundBank: trigger-to-audible latency avg {:.1f} ms, max {:.1f} ms (buffer {} samples = {:.1f} ms); " \
+               "{} merged, {} dropped, {} stolen".format(average + self.buffer_latency,
+                                                         max(self.latencies) + self.buffer_latency, MIXER_BUFFER,
+                                                         self.buffer_latency, self.merged, self.dropped, self.stolen)
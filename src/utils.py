@@ -1,30 +1,81 @@
 # Name: utils.py
 # Purpose: Stores the general tools needed for game functions
-# Version: 1.1
+# Version: 1.2
 # Date: 5 June 2020
 # Author(s): Khoa Hoang, Adrienne Lhuc Estrella, Pratham Kwatra, Matt Innaurato
-# Dependencies: pygame module
+# Dependencies: assets module
 
-import pygame as pg
+from assets import *
 
 # NOTE: For .gif files, use an gif to sprite sheet converter (ex: ezgif.com)
 class SpriteSheet:
     def __init__(self, image_name):
         """ Takes string argument of file path to sprite sheet"""
-        self.image = pg.image.load(image_name).convert_alpha()
+        self.path = image_name
+        self.strips = {}  # get_strip() arguments -> list of frames
 
-    def get_sprite(self, x, y, width, height):
+    @property
+    def image(self):
+        """ Whole sprite sheet image; only decoded when needed (frames usually come straight from the cache) """
+        return asset_cache.load(self.path)
+
+    def get_sprite(self, x, y, width, height, size=None, flip=(False, False)):
         """
-        Get sprite image out of spritesheet image
+        Get sprite image out of spritesheet image (shared through the asset cache, so don't draw onto it)
         :param x: topleft x of image
         :param y: topleft y of image
         :param width: width of image
         :param height: height of image
-        :return: None
+        :param size: (w, h) to scale sprite to after scale2x; None to keep size
+        :param flip: (flip x, flip y)
+        :return: pygame Surface
         """
         # Grab a sprite out of a larger sprite sheet
-        sprite = pg.Surface((width, height))
-        sprite.blit(self.image, (0, 0), (x, y, width, height))
-        sprite = pg.transform.scale2x(sprite)
-        sprite.set_colorkey((0, 0, 0))
-        return sprite
+        return asset_cache.load(self.path, (x, y, width, height), size, True, flip, alpha=COLORKEY)
+
+    def get_strip(self, count, width, height, x=0, y=0, scale=2, size=None, flip=(False, False)):
+        """
+        Get a row of equally sized frames in one call; results are memoized per sheet (use get_sheet() to share them)
+        Untransformed frames are subsurface views of the sheet (per-pixel alpha, no copying); transformed frames are
+        copied like get_sprite() and their black colorkey is set once with RLE acceleration
+        :param count: number of frames in the row
+        :param width: width of a frame on the sheet
+        :param height: height of a frame on the sheet
+        :param x: topleft x of first frame
+        :param y: topleft y of row
+        :param scale: 2 to use scale2x (same as get_sprite), 1 to keep size, any other number to scale by it
+        :param size: (w, h) to scale frames to (after scale2x if scale is 2); needs scale 1 or 2; None to keep size
+        :param flip: (flip x, flip y)
+        :return: list of pygame Surfaces (shared, so don't draw onto them)
+        """
+        if size and scale not in (1, 2):
+            raise ValueError("get_strip() takes either a size or a scale other than 1 and 2, not both")
+        key = (count, width, height, x, y, scale, tuple(size) if size else None, tuple(flip))
+        frames = self.strips.get(key)
+        if frames is None:
+            areas = [(x + i * width, y, width, height) for i in range(count)]
+            if scale == 1 and not size and not any(flip):
+                sheet = self.image
+                frames = [sheet.subsurface(area) for area in areas]
+            else:
+                if scale not in (1, 2):
+                    size = (round(width * scale), round(height * scale))
+                frames = [asset_cache.load(self.path, area, size, scale == 2, flip, alpha=COLORKEY)
+                          for area in areas]
+            self.strips[key] = frames
+        return list(frames)
+
+
+sheets = {}  # path -> SpriteSheet shared by get_sheet()
+
+
+def get_sheet(image_name):
+    """
+    Get the shared SpriteSheet of a file so that strips are memoized across every caller
+    :param image_name: file path to sprite sheet
+    :return: SpriteSheet
+    """
+    sheet = sheets.get(image_name)
+    if sheet is None:
+        sheet = sheets.setdefault(image_name, SpriteSheet(image_name))
+    return sheet